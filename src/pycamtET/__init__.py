@@ -1,14 +1,22 @@
-__all__ = ['dataFunctions','plotFunctions','mapFunctions']
+__all__ = ['dataFunctions','plotFunctions','mapFunctions','stationCube','climatology','adminIndex']
 
 from .pckgSettings import initSettings as _initSettings
 _setDict = _initSettings(str(__file__))
 
 from . import dataFunctions
-from . import plotFunctions
+from . import stationCube
+from . import climatology
 
 import importlib as _importlib
 import pathlib as _pathlib
 
+# plotFunctions, mapFunctions and adminIndex (matplotlib, geopandas and the admin layers) are imported on first use
+_lazyModules = ['plotFunctions','mapFunctions','adminIndex']
+def __getattr__(name):
+    if name in _lazyModules:
+        return _importlib.import_module('.'+name,__name__)
+    raise AttributeError('module '+repr(__name__)+' has no attribute '+repr(name))
+
 _gpd_spec = _importlib.util.find_spec("geopandas")
 if _gpd_spec is None:
     print('Package geopandas is not installed. example_package.mapFunctions cannot be used.')
@@ -27,8 +35,4 @@ else:
             else:
                 if _pathlib.Path(_setDict['adm0Path']).exists()==False:
                     print('File location of adm0 (full Ethiopia) shape file not found at '+_setDict['adm0Path']+'. Map abilities cannot be used.\n',
-                          'If you have the shape file, put it at that location, or set the full path by using pckgSettings.setSettings(adm0Path="path/to/adm0shapefiles")')
-                else:
-                    from .supportMap import geodata as _geodata
-                    if _geodata==True:
-                        from . import mapFunctions
\ No newline at end of file
+                          'If you have the shape file, put it at that location, or set the full path by using pckgSettings.setSettings(adm0Path="path/to/adm0shapefiles")')
\ No newline at end of file
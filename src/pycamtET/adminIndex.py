@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Name and spatial indexes for the admin units (adm1 regions, adm2 zones, adm3 districts) and the stations of stationInfo.csv.
+The indexes are built on first use and kept in memory; lookups by name do not scan or filter the admin layers.
+
+@author: jandirk
+"""
+import numpy as _np
+import pandas as _pd
+import os as _os
+from os import path as _path
+
+from pycamtET.supportMap import admLayer as _admLayer
+from pycamtET.pckgSettings import getSettings as _getSettings
+_siPath = _getSettings()['pckgsdataPath']+'/stationInfo.csv'
+
+_levelNames = {1:'admin1Name',2:'admin2Name',3:'admin3Name'}
+_nameIndexes = {}
+_geometries = {}
+_stationIndex = {}
+
+def nameIndex(level,byLevel=None):
+    """
+    Returns a dictionary from unit name to the row numbers of admLayer(level) that belong to that unit.
+
+    Parameters
+    ----------
+    level : INT
+        The admin layer (1, 2 or 3) of which row numbers are returned.
+    byLevel : None or INT, optional
+        The level of the names (1, 2 or 3, not higher than level). For example nameIndex(3,1) gives per region the
+        districts in it. The default is None: the same as level.
+    """
+    byLevel = level if byLevel is None else byLevel
+    key = (level,byLevel)
+    if key not in _nameIndexes:
+        layer = _admLayer(level)
+        if layer is None:
+            return
+        _nameIndexes[key] = {name:rows for name,rows in layer.groupby(_levelNames[byLevel],sort=False).indices.items()}
+    return _nameIndexes[key]
+
+def admUnits(name,level,layerLevel=None):
+    """
+    Returns the rows of admLayer(layerLevel) within the unit name of level (1 region, 2 zone, 3 district), or None
+    if the name is not available. layerLevel defaults to level; for example admUnits('Oromia',1,3) gives the districts of Oromia.
+    """
+    layerLevel = level if layerLevel is None else layerLevel
+    index = nameIndex(layerLevel,level)
+    if index is None:
+        return
+    if name not in index:
+        print('The selected adm'+str(level)+' name is not available. Please select another name.')
+        return
+    return _admLayer(layerLevel).iloc[index[name]]
+
+def admGeometry(name,level):
+    """
+    Returns the geometry (shapely, the union of its polygons) of the unit name of level (1 region, 2 zone, 3 district),
+    or None if the name is not available.
+    """
+    key = (level,name)
+    if key not in _geometries:
+        units = admUnits(name,level)
+        if units is None:
+            return
+        from shapely.ops import unary_union
+        _geometries[key] = unary_union(units.geometry.values)
+    return _geometries[key]
+
+def stationAdmin(update=False):
+    """
+    Returns per station of stationInfo.csv the region (admin1Name), zone (admin2Name) and district (admin3Name) in which
+    it is located, as DataFrame indexed by STN_Name. Stations are assigned with a spatial index (STRtree) on the
+    districts; stations outside all districts get NaN. The result is kept in memory until stationInfo.csv changes,
+    or update is True.
+    """
+    if _path.isfile(_siPath)==False:
+        print('No stationInfo.csv found at '+_siPath+'. Create it with support.stationInfo().')
+        return
+    stat = _os.stat(_siPath)
+    key = (stat.st_size,stat.st_mtime)
+    if (update==False) and (_stationIndex.get('key')==key):
+        return _stationIndex['table']
+    layer = _admLayer(3)
+    if layer is None:
+        return
+
+    import shapely
+    stationInfo = _pd.read_csv(_siPath).drop_duplicates(subset=['STN_Name']).set_index('STN_Name')
+    points = shapely.points(stationInfo.GEOGR1.values,stationInfo.GEOGR2.values)
+    tree = shapely.STRtree(layer.geometry.values)
+    pointNr,unitNr = tree.query(points,predicate='intersects')
+    # a station on a border gets the first district
+    first = _np.unique(pointNr,return_index=True)[1]
+    unit = _np.full(len(points),-1)
+    unit[pointNr[first]] = unitNr[first]
+
+    table = _pd.DataFrame(index=stationInfo.index)
+    for level,column in _levelNames.items():
+        names = layer[column].values.astype(object)
+        table[column] = _np.where(unit>=0,names[unit],_np.nan)
+    _stationIndex.clear()
+    _stationIndex.update({'key':key,'table':table,
+                          'names':{level:table.groupby(column).groups for level,column in _levelNames.items()}})
+    return table
+
+def stationsIn(region=None,adm2=None,adm3=None):
+    """
+    Returns the names of the stations in stationInfo.csv located in the district adm3, the zone adm2 or the region
+    (only the most detailed of the provided names is used), as list.
+    """
+    if stationAdmin() is None:
+        return
+    for level,name in ((3,adm3),(2,adm2),(1,region)):
+        if name is not None:
+            return list(_stationIndex['names'][level].get(name,[]))
+    print('Provide a region, adm2 or adm3 name.')
+    return
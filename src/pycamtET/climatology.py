@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Climatology of the long-format data of dataFunctions.dataLoad(): per station, element and period the yearly values,
+and their average, standard deviation and number of years.
+
+@author: jandirk
+"""
+import numpy as _np
+import pandas as _pd
+
+from pycamtET.support import _long_names
+from pycamtET.supportCalendar import _seasons,_monthSeason,_monthSeasonyear
+
+_periodCols = {'year':[],'season':['season'],'month':['MONTH'],'dekadal':['MONTH','dk']}
+
+class Climatology:
+    """
+    Yearly values and their statistics per station, element and period, for timeperiods year, season, month and dekadal.
+
+    Attributes
+    ----------
+    values : dictionary
+        Per element and timeperiod a DataFrame with the yearly values, indexed by STN_Name, YEAR and the period columns
+        (season, MONTH or MONTH and dk), with columns element (sum for PRECIP and RD, average for temperatures) and 'count'
+        (the number of observations), as dataFunctions.periodAggregate() returns. For season, YEAR holds the seasonyear.
+    stats : dictionary
+        Per element and timeperiod a DataFrame indexed by STN_Name and the period columns, with columns element+'avg',
+        element+'std' and 'nYears': the average, standard deviation and number of the yearly values in the normal period.
+    elements : list of STR
+        The elements; RD (rainy days: more than 1 mm) is added if PRECIP is present.
+    normal : None or tuple of INT
+        The first and last year of the normal period, or None if all years are used.
+
+    Create a Climatology with Climatology(data), and pass it to dataFunctions.locData(climatology=...).
+    """
+    def __init__(self,data,normal=None):
+        """
+        Parameters
+        ----------
+        data : pandas DataFrame or iterable of pandas DataFrames
+            Data from dataFunctions.dataLoad() or chunks from dataFunctions.dataIter().
+        normal : None or tuple of INT, optional
+            The first and last year (inclusive) of the normal period over which the statistics are calculated, for example (1991,2020).
+            The default is None: all years.
+        """
+        if isinstance(data,_pd.DataFrame):
+            data = [data]
+        self.normal = None if normal is None else (int(normal[0]),int(normal[1]))
+
+        # one grouped pass over the data: sums and counts per station, element, year, month and dekad
+        keys = ['STN_Name','EG_EL','YEAR','MONTH','dk']
+        partials = []
+        for chunk in data:
+            value = chunk.value.values.astype(float)
+            dk = chunk.dk.cat.codes.values+1 if isinstance(chunk.dk.dtype,_pd.CategoricalDtype) else chunk.dk.values
+            sub = _pd.DataFrame({'STN_Name':_np.asarray(chunk.STN_Name,dtype=object),'EG_EL':_np.asarray(chunk.EG_EL,dtype=object),
+                                 'YEAR':chunk.YEAR.values.astype('int64'),'MONTH':chunk.MONTH.values.astype('int64'),
+                                 'dk':dk.astype('int64'),'value':value,
+                                 # rainy day: more than 1 mm
+                                 'rd':_np.where((chunk.EG_EL=='PRECIP').values,_np.where(value>1,1.,_np.where(value>-1,0.,_np.nan)),_np.nan)})
+            partials.append(sub.groupby(by=keys).agg(sum=('value','sum'),count=('value','count'),rdsum=('rd','sum'),rdcount=('rd','count')))
+        self.elements = []
+        self.values = {}
+        self.stats = {}
+        if len(partials) == 0:
+            print('No data provided. The Climatology is empty.')
+            return
+        dekads = _pd.concat(partials).groupby(level=keys).sum()
+        if 'PRECIP' in dekads.index.get_level_values('EG_EL'):
+            rd = dekads.xs('PRECIP',level='EG_EL',drop_level=False).get(['rdsum','rdcount'])
+            rd = rd.rename(columns={'rdsum':'sum','rdcount':'count'}).rename(index={'PRECIP':'RD'},level='EG_EL')
+            dekads = _pd.concat([dekads.get(['sum','count']),rd]).sort_index()
+        else:
+            dekads = dekads.get(['sum','count'])
+
+        # higher levels from the dekad sums; season and year from the month sums
+        months = dekads.groupby(level=keys[:4]).sum()
+        seasons = months.reset_index()
+        monthNr = seasons.MONTH.values
+        seasons['YEAR'] = seasons.YEAR.values+_monthSeasonyear[monthNr]
+        seasons['season'] = _pd.Categorical.from_codes(_monthSeason[monthNr],categories=_seasons,ordered=True)
+        seasons = seasons.groupby(by=keys[:3]+['season'],observed=True)[['sum','count']].sum()
+        years = months.groupby(level=keys[:3]).sum()
+        tables = {'year':years,'season':seasons,'month':months,'dekadal':dekads}
+
+        self.elements = dekads.index.get_level_values('EG_EL').unique().to_list()
+        for element in self.elements:
+            self.values[element] = {}
+            self.stats[element] = {}
+            for timeperiod,table in tables.items():
+                periodEL = table.xs(element,level='EG_EL')
+                if (element=='PRECIP') or (element=='RD'):
+                    periodEL = periodEL.assign(**{element:periodEL['sum']})
+                else:
+                    periodEL = periodEL.assign(**{element:periodEL['sum']/periodEL['count'].where(periodEL['count']>0)})
+                periodEL = periodEL.get([element,'count'])
+                self.values[element][timeperiod] = periodEL
+
+                inNormal = periodEL[element]
+                if self.normal is not None:
+                    yearNr = inNormal.index.get_level_values('YEAR')
+                    inNormal = inNormal[(yearNr>=self.normal[0])&(yearNr<=self.normal[1])]
+                grouper = inNormal.groupby(level=['STN_Name']+_periodCols[timeperiod],observed=True)
+                self.stats[element][timeperiod] = _pd.DataFrame({element+'avg':grouper.mean(),element+'std':grouper.std(),'nYears':grouper.count()})
+
+    def __repr__(self):
+        normal = 'all years' if self.normal is None else 'normal period '+str(self.normal[0])+'-'+str(self.normal[1])
+        nStations = len(self.values[self.elements[0]]['year'].index.get_level_values('STN_Name').unique()) if len(self.elements)>0 else 0
+        return 'Climatology: '+str(nStations)+' stations, elements '+', '.join(self.elements)+', '+normal
+
+    def stat(self,element,season=None,month=None,dekadal=None):
+        """
+        Returns per station the average (element+'avg'), standard deviation (element+'std') and number of years ('nYears')
+        of one period: the year (no season, month or dekadal), a season, a month or a month-dekadal, as in dataFunctions.locData().
+        """
+        if element not in self.elements:
+            print('The provided element is not in the Climatology. Available elements are: '+str(self.elements))
+            return
+        if dekadal != None:
+            timeperiod,key = 'dekadal',(month,dekadal)
+        elif month != None:
+            timeperiod,key = 'month',(month,)
+        elif season != None:
+            timeperiod,key = 'season',(season,)
+        else:
+            return self.stats[element]['year']
+        stats = self.stats[element][timeperiod]
+        levels = _periodCols[timeperiod]
+        inPeriod = _np.ones(len(stats),dtype=bool)
+        for level,value in zip(levels,key):
+            inPeriod &= (stats.index.get_level_values(level)==value)
+        return stats[inPeriod].droplevel(levels)
+
+    def toFrame(self,element,timeperiod):
+        """
+        Returns the yearly values of one element and timeperiod ('year','season','month' or 'dekadal') with metadata, as
+        dataFunctions.periodAggregate() returns them.
+        """
+        if element not in self.elements:
+            print('The provided element is not in the Climatology. Available elements are: '+str(self.elements))
+            return
+        if timeperiod not in _periodCols:
+            print('The provided timeperiod \''+str(timeperiod)+'\' is not one of the options.\n',
+                  'Please select one of the following '+str(list(_periodCols)))
+            return
+        periodEL = self.values[element][timeperiod].copy()
+        periodEL.element = element
+        periodEL.long_name = _long_names[element]
+        periodEL.timeperiod = timeperiod
+        return periodEL
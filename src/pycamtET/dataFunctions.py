@@ -15,10 +15,16 @@ Remarks:
 """
 import pandas as _pd
 import numpy as _np
+from importlib.util import find_spec as _find_spec
 
 from pycamtET.support import _colnames,_long_names,_units
+from pycamtET.support import fileFingerprint as _fileFingerprint,cacheSave as _cacheSave,cacheLoad as _cacheLoad,cacheMeta as _cacheMeta
+from pycamtET.support import memoize as _memoize,memoSettings,memoStats,memoClear
+from pycamtET.climatology import Climatology as _Climatology,_periodCols
+from pycamtET.supportCalendar import dayCalendar as _dayCalendar,dayNumbers as _dayNumbers,periodDays as _calPeriodDays,isLeap as _isLeap
+from pycamtET.supportCalendar import _seasons,_monthSeason,_monthSeasonNr,_monthSeasonyear,_monthDays,_dayDk
 
-def dataLoad(filePath,dataChoice='values'):
+def dataLoad(filePath,dataChoice='values',cache=False,engine='default',stations=None,elements=None,years=None,compact=False):
     """   
     Parameters
     ----------
@@ -28,7 +34,31 @@ def dataLoad(filePath,dataChoice='values'):
     dataChoice : STR, 'values' or 'metadata'
         If values: returns the values with relevant identifier columns
         If metadata: returns stations with relevant metadata
+    cache : BOOL, optional
+        Only used for dataChoice='values'. If True, the processed data is stored in a binary
+        cache under pckgsdataPath/datacache, and a next load of the same, unchanged file is read
+        from that cache. The cache is keyed on the path, size, modification time and content hash
+        of the file, so it is renewed automatically when the file changes. The default is False.
+    engine : STR, 'default' or 'fast', optional
+        If default: the data is processed with pandas string and datetime parsing.
+        If fast: the same DataFrame is created with integer arithmetic on numpy arrays. Station names
+        and TIME values are repaired once per unique value, and if the package pyarrow is installed,
+        it is used to read the file. Recommended for large files. The default is 'default'.
+    stations : None, STR or list of STR, optional
+        If provided, only data of these stations is processed. The default is None (all stations).
+    elements : None, STR or list of STR, optional
+        If provided, only data of these elements (for example 'PRECIP') is processed. The default is None (all elements).
+    years : None or tuple of INT, optional
+        If provided as (firstYear,lastYear), only data of these years (including firstYear and lastYear) is processed.
+        The default is None (all years).
+    compact : BOOL, optional
+        If True, the data is returned with compact dtypes (about 3x to 5x less memory, and faster grouping): STN_Name and EG_EL
+        as categorical, YEAR and seasonyear as int16, MONTH, TIME, day and dk as int8, value as float32, without the column
+        date (it equals dateTime without hour), and with extra columns dkYear (dekad of the year, 1-36) and seasonCode
+        (1 Belg, 2 Kiremt, 3 Bega). The default is False.
     
+    The filters stations, elements and years are applied to the rows of the file before any processing, so loading a subset
+    only costs the processing of that subset. If cache=True, the full file is cached and the filters are applied afterwards.
     For values, any non-numeric value is turned into NaN.
 
     Returns
@@ -40,34 +70,45 @@ def dataLoad(filePath,dataChoice='values'):
                                    if dataChoice = 'metadata':
 
     """
-    df = _pd.read_csv(filePath,dtype='object').iloc[:,:40]
-    df = df.set_axis(labels=_colnames,axis=1)
-    df.loc[:,'STN_Name'] = df.STN_Name.str.title().str.strip()
+    if (dataChoice == 'values') and cache:
+        fingerprint = _fileFingerprint(filePath)
+        cacheName = 'dataLoad:'+fingerprint['path']
+        if _cacheMeta(cacheName) == fingerprint:
+            from pycamtET.support import stationInfo
+            stationInfo(filePath)
+            df = _filterRows(_cacheLoad(cacheName,categorical=compact),stations,elements,years)
+            if len(df) == 0:
+                print('No data found for stations '+str(stations)+', elements '+str(elements)+' and years '+str(years)+'.')
+                return
+            if compact:
+                df = _compact(df)
+            print('Data of '+str(filePath)+' read from cache.')
+            df.filePath = filePath
+            return df
+
+    if engine not in ['default','fast']:
+        print('engine not clear. Please select \'default\' or \'fast\'')
+        return
+
+    df = _readWide(filePath,engine)
+    if ((dataChoice == 'values') and cache) == False:
+        df = _filterRows(df,stations,elements,years)
+        if len(df) == 0:
+            print('No data found for stations '+str(stations)+', elements '+str(elements)+' and years '+str(years)+'.')
+            return
     from pycamtET.support import stationInfo
     stationInfo(filePath)
     if dataChoice == 'values':
-        df = df.drop(columns=df.columns[1:5])
-        # repair some time values without ':'
-        df.loc[~df.TIME.str.contains(':'),'TIME']=df[~df.TIME.str.contains(':')].TIME.str.slice_replace(-2,-2,':')
-        # turn all remaining na TIMES into 9:00
-        df.loc[:,'TIME'] = _pd.to_datetime(df.TIME,format='%H:%M',errors='coerce').fillna(_pd.to_datetime('9:00')).dt.hour
-        df = df.melt(id_vars=df.columns[:5],var_name='day')
-        df.loc[:,'YEAR'] = _pd.to_numeric(df.YEAR)
-        df.loc[:,'MONTH'] = _pd.to_numeric(df.MONTH)
-        dftime = df.get(['YEAR','MONTH','day','TIME']).rename(columns={'TIME':'hour'})
-        df['dateTime']=_pd.to_datetime(dftime,errors='coerce')
-        df.dropna(subset=['dateTime'],inplace=True)
-        df['date'] = _pd.to_datetime(df.dateTime.dt.date)
-
-        df['value'] = _pd.to_numeric(df.value,errors='coerce')
-        df.sort_values(by=['STN_Name','EG_EL','dateTime'],inplace=True,ignore_index=True)
-
-        # Add season and Dk
-        df['season']=_pd.cut(df.MONTH,[0,1,5,9,12],labels=['Bega','Belg','Kiremt','Bega1']).replace('Bega1','Bega')
-        df['seasonyear'] = df.YEAR
-        df.loc[df.MONTH==1,'seasonyear'] = df.YEAR[df.MONTH==1]-1
-        df['dk'] = _pd.cut(df.day,[0,10,20,31],labels=[1,2,3])
-        
+        if engine == 'fast':
+            df = _valuesFast(df)
+        else:
+            df = _valuesDefault(df)
+        if cache:
+            _cacheSave(df,cacheName,fingerprint)
+            print('Data of '+str(filePath)+' saved to cache for faster loading next time.')
+            df = _filterRows(df,stations,elements,years)
+        if compact:
+            df = _compact(df)
         df.filePath = filePath
         return df
     elif dataChoice == 'metadata':
@@ -79,6 +120,438 @@ def dataLoad(filePath,dataChoice='values'):
     else:
         print('dataChoice not clear. Please select \'values\' or \'metadata\'')
 
+def dataIter(filePath,chunksize=100000,engine='fast',stations=None,elements=None,years=None,compact=False):
+    """
+    Reads a datafile in chunks of rows, and yields every chunk processed to the same format as dataLoad(filePath).
+    Use this for files that do not fit in memory: peak memory is set by chunksize, not by the size of the file.
+    The chunks can be aggregated incrementally with periodAggregate().
+
+    Parameters
+    ----------
+    filePath : STR
+        filePath including filename of the data to load. A normal EMI data-format
+        is assumed.
+    chunksize : INT, optional
+        The number of rows of the datafile (station-element-months) per chunk. Every row results
+        in up to 31 rows in the processed chunk. The default is 100000.
+    engine : STR, 'default' or 'fast', optional
+        The processing engine, see dataLoad(). The default is 'fast'.
+    stations : None, STR or list of STR, optional
+        If provided, only data of these stations is processed. The default is None (all stations).
+    elements : None, STR or list of STR, optional
+        If provided, only data of these elements (for example 'PRECIP') is processed. The default is None (all elements).
+    years : None or tuple of INT, optional
+        If provided as (firstYear,lastYear), only data of these years (including firstYear and lastYear) is processed.
+        The default is None (all years).
+    compact : BOOL, optional
+        If True, the chunks have compact dtypes, see dataLoad(). The default is False.
+
+    Yields
+    ------
+    Pandas DataFrame with the same columns as dataLoad(filePath), sorted by station, element and dateTime within the chunk.
+
+    """
+    if engine not in ['default','fast']:
+        print('engine not clear. Please select \'default\' or \'fast\'')
+        return
+    from pycamtET.support import stationInfo
+    stationInfo(filePath)
+    for chunk in _pd.read_csv(filePath,dtype='object',chunksize=chunksize):
+        df = _filterRows(_normalizeWide(chunk,engine),stations,elements,years)
+        if len(df) == 0:
+            continue
+        if engine == 'fast':
+            df = _valuesFast(df)
+        else:
+            df = _valuesDefault(df)
+        if compact:
+            df = _compact(df)
+        df.filePath = filePath
+        yield df
+
+def dataLoadMany(filePaths,workers=None,engine='fast',stations=None,elements=None,years=None,compact=False):
+    """
+    Loads multiple datafiles (for example exports per region, element or period) in parallel, and merges them into one DataFrame.
+    Observations that are in more than one file (same station, element and dateTime) are kept once; the value from the
+    file that comes last in filePaths is used. The station info of all files is updated once, at the end.
+
+    Parameters
+    ----------
+    filePaths : list of STR
+        filePaths including filenames of the data to load. A normal EMI data-format is assumed.
+    workers : INT or None, optional
+        The number of processes used to parse the files. If None, the number of processors of the computer is used.
+        With workers=1, files are parsed one after the other. The default is None.
+    engine : STR, 'default' or 'fast', optional
+        The processing engine, see dataLoad(). The default is 'fast'.
+    stations : None, STR or list of STR, optional
+        If provided, only data of these stations is processed. The default is None (all stations).
+    elements : None, STR or list of STR, optional
+        If provided, only data of these elements (for example 'PRECIP') is processed. The default is None (all elements).
+    years : None or tuple of INT, optional
+        If provided as (firstYear,lastYear), only data of these years (including firstYear and lastYear) is processed.
+        The default is None (all years).
+
+    compact : BOOL, optional
+        If True, the data is returned with compact dtypes, see dataLoad(). The default is False.
+    Returns
+    -------
+    Pandas DataFrame with the same columns as dataLoad(), sorted by STN_Name, EG_EL and dateTime.
+
+    """
+    from pathlib import Path
+    if engine not in ['default','fast']:
+        print('engine not clear. Please select \'default\' or \'fast\'')
+        return
+    filePaths = list(filePaths)
+    filters = (stations,elements,years)
+    for filePath in filePaths:
+        if Path(filePath).exists()==False:
+            print('File '+str(filePath)+' not found. Please provide valid filepaths.')
+            return
+    
+    if (workers == 1) or (len(filePaths) == 1):
+        dfs = [_loadValues(filePath,engine,filters) for filePath in filePaths]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            dfs = list(executor.map(_loadValues,filePaths,[engine]*len(filePaths),[filters]*len(filePaths)))
+    
+    df = _pd.concat(dfs,ignore_index=True)
+    if len(df) == 0:
+        print('No data found for stations '+str(stations)+', elements '+str(elements)+' and years '+str(years)+'.')
+        return
+    nAll = len(df)
+    df = df.drop_duplicates(subset=['STN_Name','EG_EL','dateTime'],keep='last')
+    df = df.sort_values(by=['STN_Name','EG_EL','dateTime'],ignore_index=True)
+    if compact:
+        df = _compact(df)
+    print(str(len(filePaths))+' files loaded. '+str(nAll-len(df))+' duplicate observations removed.')
+    
+    from pycamtET.support import stationInfo
+    stationInfo(filePaths)
+    df.filePath = filePaths
+    return df
+
+def _loadValues(filePath,engine='fast',filters=(None,None,None)):
+    """
+    Reads and processes the values of one datafile, without updating the station info. Used by dataLoadMany.
+    """
+    df = _filterRows(_readWide(filePath,engine),*filters)
+    if engine == 'fast':
+        return _valuesFast(df)
+    else:
+        return _valuesDefault(df)
+
+def appendData(existing,newFilePath,storeName=None,engine='fast'):
+    """
+    Adds the data of a new datafile (for example the latest month) to data that is already processed, without reprocessing
+    the existing data. Observations of the same station, element and dateTime are replaced by those of the new file, as
+    dataLoadMany() keeps the value of the last file. Only station info of new stations is added to the station info.
+
+    Only the new file is read and processed, and its rows are placed with binary search per station-element. The combined
+    DataFrame (and the data store, if used) is still written as a whole, so that step copies all existing rows: it takes
+    about the time of reading the data store, much less than processing the existing data again.
+
+    Parameters
+    ----------
+    existing : pandas DataFrame or STR
+        Processed data from dataLoad(), dataLoadMany() or appendData(), sorted by STN_Name, EG_EL and dateTime,
+        or the name of a data store that was saved before with appendData(storeName=...).
+    newFilePath : STR
+        filePath including filename of the new data. A normal EMI data-format is assumed.
+    storeName : None or STR, optional
+        If provided, the combined data is saved on the computer as a data store with this name, which can be used as
+        existing next time, or loaded with storeLoad(). If existing is a store name and storeName is None, that store
+        is updated. The default is None.
+    engine : STR, 'default' or 'fast', optional
+        The processing engine for the new file, see dataLoad(). The default is 'fast'.
+
+    Returns
+    -------
+    Pandas DataFrame with the same columns as dataLoad(), sorted by STN_Name, EG_EL and dateTime.
+
+    """
+    from pathlib import Path
+    if Path(newFilePath).exists()==False:
+        print('File '+str(newFilePath)+' not found. Please provide a valid filepath.')
+        return
+    fingerprint = _fileFingerprint(newFilePath)
+    appended = []
+    if isinstance(existing,str):
+        if storeName is None:
+            storeName = existing
+        meta = _cacheMeta('store:'+existing)
+        if meta is None:
+            print('Data store '+existing+' not found.')
+            return
+        appended = meta['files']
+        existing = storeLoad(existing)
+        if fingerprint['hash'] in [f['hash'] for f in appended]:
+            print('The data of '+str(newFilePath)+' is already in data store '+storeName+'. Nothing is added.')
+            return existing
+    
+    new = _loadValues(newFilePath,engine)
+    new = new.drop_duplicates(subset=['STN_Name','EG_EL','dateTime'],keep='last',ignore_index=True)
+    compact = 'date' not in existing.columns
+    if compact:
+        new = _compact(new)
+    
+    # per station-element group of the new data: rows of the same dateTimes to replace, and positions to insert
+    nEx = len(existing)
+    drop = [_np.empty(0,dtype='int64')]
+    pos = _np.empty(len(new),dtype='int64')
+    dateTimeEx = existing.dateTime.values
+    dateTimeNew = new.dateTime.values
+    for (stationName,element),idx in new.groupby(by=['STN_Name','EG_EL'],observed=True).indices.items():
+        lo,hi = _rowRange(existing,stationName,element)
+        dateTimes = dateTimeNew[idx]
+        first = lo+_np.searchsorted(dateTimeEx[lo:hi],dateTimes.min(),'left')
+        last = lo+_np.searchsorted(dateTimeEx[lo:hi],dateTimes.max(),'right')
+        drop.append(first+_np.flatnonzero(_np.isin(dateTimeEx[first:last],dateTimes)))
+        pos[idx] = lo+_np.searchsorted(dateTimeEx[lo:hi],dateTimes,'left')
+    drop = _np.concatenate(drop)
+    
+    keep = _np.ones(nEx+len(new),dtype=bool)
+    keep[drop] = False
+    order = _np.insert(_np.arange(nEx),pos,nEx+_np.arange(len(new)))
+    order = order[keep[order]]
+    df = _concatLong([existing,new]).take(order).reset_index(drop=True)
+    print(str(len(new))+' observations of '+str(newFilePath)+' added; '+str(len(drop))+' existing observations replaced.')
+    
+    from pycamtET.support import stationInfo
+    stationInfo(newFilePath)
+    
+    if storeName is not None:
+        _cacheSave(df,'store:'+storeName,{'files':appended+[fingerprint]},compress=False)
+        print('Data saved to data store '+storeName+'.')
+    df.filePath = getattr(existing,'filePath',None)
+    return df
+
+def storeLoad(storeName):
+    """
+    Loads a data store that was saved with appendData(storeName=...).
+
+    Returns
+    -------
+    Pandas DataFrame with the same columns as dataLoad().
+
+    """
+    df = _cacheLoad('store:'+storeName)
+    if df is None:
+        print('Data store '+storeName+' not found.')
+        return
+    df.filePath = [f['path'] for f in _cacheMeta('store:'+storeName)['files']]
+    return df
+
+def _rowRange(df,stationName,element=None):
+    """
+    Returns the first and last+1 row number of a station (and element) in a DataFrame sorted by STN_Name and EG_EL,
+    as returned by dataLoad(), using binary search instead of comparing every row.
+    """
+    lo,hi = _searchRange(df.STN_Name,stationName,0,len(df))
+    if element is not None:
+        lo,hi = _searchRange(df.EG_EL,element,lo,hi)
+    return lo,hi
+
+def _searchRange(column,value,lo,hi):
+    # categorical columns (compact data) have sorted categories, so their codes are sorted as well
+    if isinstance(column.dtype,_pd.CategoricalDtype):
+        values = column.cat.codes.values[lo:hi]
+        if value not in column.cat.categories:
+            # empty range at the position where value would be
+            pos = lo+_np.searchsorted(values,column.cat.categories.searchsorted(value),'left')
+            return pos,pos
+        value = column.cat.categories.get_loc(value)
+    else:
+        values = column.values[lo:hi]
+    return lo+_np.searchsorted(values,value,'left'),lo+_np.searchsorted(values,value,'right')
+
+def _dates(df):
+    """
+    Returns the dates of long-format data as datetime64[ns] array; compact data has no date column.
+    """
+    if 'date' in df.columns:
+        return df.date.values
+    return df.dateTime.values.astype('datetime64[D]').astype('datetime64[ns]')
+
+def _compact(df):
+    """
+    Returns long-format data with compact dtypes, see dataLoad(compact=True).
+    """
+    if 'date' not in df.columns:
+        return df
+    dk = df.dk.cat.codes.values+1 if isinstance(df.dk.dtype,_pd.CategoricalDtype) else df.dk.values
+    month = df.MONTH.values.astype('int8')
+    dfCompact = _pd.DataFrame({
+        'STN_Name':_sortedCategorical(df.STN_Name),
+        'EG_EL':_sortedCategorical(df.EG_EL),
+        'YEAR':df.YEAR.values.astype('int16'),
+        'MONTH':month,
+        'TIME':df.TIME.values.astype('int8'),
+        'day':df.day.values.astype('int8'),
+        'value':df.value.values.astype('float32'),
+        'dateTime':df.dateTime.values,
+        'season':df.season.values,
+        'seasonyear':df.seasonyear.values.astype('int16'),
+        'dk':dk.astype('int8'),
+        'dkYear':((month-1)*3+dk).astype('int8'),
+        'seasonCode':_monthSeasonNr[month]
+        })
+    return dfCompact
+
+def _sortedCategorical(column):
+    if isinstance(column.dtype,_pd.CategoricalDtype):
+        return column.values.set_categories(sorted(column.cat.categories))
+    return _pd.Categorical(column.values)
+
+def _concatLong(dfs):
+    """
+    Concatenates long-format DataFrames; categorical station and element columns (compact data) stay categorical.
+    """
+    df = _pd.concat(dfs,ignore_index=True)
+    for col in ['STN_Name','EG_EL']:
+        if all(isinstance(d[col].dtype,_pd.CategoricalDtype) for d in dfs):
+            df[col] = _pd.api.types.union_categoricals([d[col].values for d in dfs],sort_categories=True)
+    return df
+
+def _filterRows(df,stations=None,elements=None,years=None):
+    """
+    Selects rows of a raw (wide) or processed (long) DataFrame on station names, elements and a (firstYear,lastYear) range.
+    """
+    if stations is not None:
+        stations = [stations] if isinstance(stations,str) else list(stations)
+        df = df[df.STN_Name.isin([stationName.title().strip() for stationName in stations])]
+    if elements is not None:
+        elements = [elements] if isinstance(elements,str) else list(elements)
+        df = df[df.EG_EL.isin(elements)]
+    if years is not None:
+        yearNr = _pd.to_numeric(df.YEAR,errors='coerce')
+        df = df[(yearNr>=years[0])&(yearNr<=years[1])]
+    if (stations is None) and (elements is None) and (years is None):
+        return df
+    return df.reset_index(drop=True)
+
+def _readWide(filePath,engine='default'):
+    """
+    Reads the first 40 columns of an EMI datafile as strings, with normalized station names.
+    """
+    if (engine == 'fast') and (_find_spec('pyarrow') is not None):
+        from pyarrow import csv as _pacsv, string as _pastring
+        header = _pd.read_csv(filePath,header=None,nrows=1,dtype='object').iloc[0]
+        convert = _pacsv.ConvertOptions(column_types={name:_pastring() for name in header},strings_can_be_null=True)
+        df = _pacsv.read_csv(filePath,convert_options=convert).to_pandas()
+    else:
+        df = _pd.read_csv(filePath,dtype='object')
+    return _normalizeWide(df,engine)
+
+def _normalizeWide(df,engine='default'):
+    """
+    Keeps the first 40 columns of a raw EMI DataFrame, with standard column names and normalized station names.
+    """
+    df = df.iloc[:,:40].set_axis(labels=_colnames,axis=1)
+    if engine == 'fast':
+        # normalize every station name only once
+        codes,uniques = _pd.factorize(df.STN_Name)
+        names = _np.full(len(df),_np.nan,dtype=object)
+        names[codes>=0] = uniques.str.title().str.strip().values[codes[codes>=0]]
+        df['STN_Name'] = names
+    else:
+        df.loc[:,'STN_Name'] = df.STN_Name.str.title().str.strip()
+    return df
+
+def _valuesDefault(df):
+    """
+    Turns the wide data (one row per station-element-month) into the long format of dataLoad,
+    with pandas string and datetime parsing.
+    """
+    df = df.drop(columns=df.columns[1:5])
+    # repair some time values without ':'
+    df.loc[~df.TIME.str.contains(':'),'TIME']=df[~df.TIME.str.contains(':')].TIME.str.slice_replace(-2,-2,':')
+    # turn all remaining na TIMES into 9:00
+    df.loc[:,'TIME'] = _pd.to_datetime(df.TIME,format='%H:%M',errors='coerce').fillna(_pd.to_datetime('9:00')).dt.hour
+    df = df.melt(id_vars=df.columns[:5],var_name='day')
+    df.loc[:,'YEAR'] = _pd.to_numeric(df.YEAR)
+    df.loc[:,'MONTH'] = _pd.to_numeric(df.MONTH)
+    dftime = df.get(['YEAR','MONTH','day','TIME']).rename(columns={'TIME':'hour'})
+    df['dateTime']=_pd.to_datetime(dftime,errors='coerce')
+    df.dropna(subset=['dateTime'],inplace=True)
+    df['date'] = _pd.to_datetime(df.dateTime.dt.date)
+
+    df['value'] = _pd.to_numeric(df.value,errors='coerce')
+    df.sort_values(by=['STN_Name','EG_EL','dateTime'],inplace=True,ignore_index=True)
+
+    # Add season and Dk
+    df['season']=_pd.cut(df.MONTH,[0,1,5,9,12],labels=['Bega','Belg','Kiremt','Bega1']).replace('Bega1','Bega')
+    df['seasonyear'] = df.YEAR
+    df.loc[df.MONTH==1,'seasonyear'] = df.YEAR[df.MONTH==1]-1
+    df['dk'] = _pd.cut(df.day,[0,10,20,31],labels=[1,2,3])
+    return df
+
+def _valuesFast(df):
+    """
+    Turns the wide data (one row per station-element-month) into the long format of dataLoad,
+    with all date arithmetic done on integer arrays of the wide rows.
+    """
+    n = len(df)
+    year = _pd.to_numeric(df.YEAR).values.astype(float)
+    month = _pd.to_numeric(df.MONTH).values.astype(float)
+    
+    # repair and parse TIME once per unique value; same rules as the default engine
+    codes,uniques = _pd.factorize(df.TIME)
+    times = _pd.Series(uniques,dtype=object)
+    noColon = ~times.str.contains(':')
+    times[noColon] = times[noColon].str.slice_replace(-2,-2,':')
+    hours = _pd.to_datetime(times,format='%H:%M',errors='coerce').fillna(_pd.to_datetime('9:00')).dt.hour.values
+    hour = _np.append(hours,9)[codes] # missing TIME (code -1) becomes 9:00
+    
+    # month start (days since epoch) and month length; invalid year/months are dropped
+    validYM = _np.isfinite(year)&_np.isfinite(month)&(month>=1)&(month<=12)
+    monthNr = _np.where(validYM,(year-1970)*12+month-1,0).astype('int64')
+    monthStart = monthNr.astype('datetime64[M]').astype('datetime64[D]').astype('int64')
+    monthDays = _monthDays[_isLeap(monthNr//12+1970),monthNr%12+1]
+    
+    # melt: day-column major, as DataFrame.melt
+    values = _np.empty((31,n))
+    for d in range(1,32):
+        values[d-1] = _pd.to_numeric(df[d],errors='coerce').values
+    rows = _np.tile(_np.arange(n),31)
+    days = _np.repeat(_np.arange(1,32),n)
+    keep = validYM[rows]&(days<=monthDays[rows])
+    rows = rows[keep]
+    days = days[keep]
+    values = values.reshape(-1)[keep]
+    dayNr = monthStart[rows]+days-1
+    dateTime = (dayNr*24+hour[rows])*3600*10**9
+    
+    # sort by station, element and dateTime
+    stnCodes = _pd.factorize(df.STN_Name.values,sort=True)[0]
+    stnCodes[stnCodes<0] = len(stnCodes)
+    elCodes = _pd.factorize(df.EG_EL.values,sort=True)[0]
+    elCodes[elCodes<0] = len(elCodes)
+    order = _np.lexsort((dateTime,elCodes[rows],stnCodes[rows]))
+    rows = rows[order]
+    days = days[order]
+    
+    monthInt = month[rows].astype('int64')
+    yearInt = year[rows].astype('int64')
+    dfLong = _pd.DataFrame({
+        'STN_Name':df.STN_Name.values[rows],
+        'EG_EL':df.EG_EL.values[rows],
+        'YEAR':yearInt,
+        'MONTH':monthInt,
+        'TIME':hour[rows].astype('int64'),
+        'day':_np.arange(32,dtype=object)[days],
+        'value':values[order],
+        'dateTime':dateTime[order].astype('datetime64[ns]'),
+        'date':(dayNr[order]*24*3600*10**9).astype('datetime64[ns]'),
+        'season':_pd.Categorical.from_codes(_monthSeason[monthInt],categories=_seasons,ordered=True),
+        'seasonyear':yearInt+_monthSeasonyear[monthInt],
+        'dk':_pd.Categorical.from_codes(_dayDk[days]-1,categories=[1,2,3],ordered=True)
+        })
+    return dfLong
+
+@_memoize
 def locSelect(dataFrame,stationName='Assela'):
     """
     From a dataFrame resulting from the function dataLoad(), select the data for
@@ -101,34 +574,16 @@ def locSelect(dataFrame,stationName='Assela'):
     df = dataFrame
     stationName = stationName.title()
     
-    if len(df[df.STN_Name==stationName])==0:
+    dfStation = _stationRows(df,stationName)
+    if len(dfStation)==0:
         print('The provided stationName is not found in the provided DataFrame.')
         print('Available stationnames are: '+str(df.STN_Name.unique()))
         return
     else:
-        elements = df.EG_EL[df.STN_Name==stationName].unique()
-        dfSeasonDk = df[df.STN_Name==stationName].get(['date','season','seasonyear','dk']).drop_duplicates(subset=['date']).set_index(['date'])
-        dfDay = df.loc[(df.STN_Name==stationName)&(df.EG_EL==elements[0]),['value','date']].resample(rule='D',on='date').mean()
-        dfDay = dfDay.rename(columns={'value':elements[0]})
-        for i in range(1,len(elements)):
-            dfAdd = df.loc[(df.STN_Name==stationName)&(df.EG_EL==elements[i]),['value','date']].resample(rule='D',on='date').mean()
-            dfDay[elements[i]] = dfAdd.value
-        
-        if 'PRECIP' in elements:
-            dfDay['RD'] = _pd.to_numeric(_pd.cut(dfDay.PRECIP,[-1,1,dfDay.PRECIP.max()],labels=[0,1]))
-        
-        dfDay['YEAR'] = dfDay.index.year
-        dfDay['MONTH'] = dfDay.index.month
-        dfDay['day'] = dfDay.index.day
-        dfDay['season'] = dfSeasonDk['season']
-        dfDay['seasonyear'] = dfSeasonDk['seasonyear']
-        dfDay['dk'] = dfSeasonDk['dk']
-        
-        #Reorganize order of columns
-        timecols = ['YEAR','seasonyear','season','MONTH','dk','day']
-        elcols = dfDay.columns[~dfDay.columns.isin(timecols)].to_list()
-        cols = timecols+elcols
-        dfDay = dfDay[cols]
+        panel,present = _dailyPanel(dfStation)
+        dfDay = panel.droplevel('STN_Name')
+        dfDay.index = _pd.DatetimeIndex(dfDay.index,freq='D',name='date')
+        elcols = [col for col in dfDay.columns if col not in ['YEAR','seasonyear','season','MONTH','dk','day']]
         
         dateMin = str(dfDay.index.date.min())
         dateMax = str(dfDay.index.date.max())
@@ -151,6 +606,129 @@ def locSelect(dataFrame,stationName='Assela'):
         
         return dfDay
 
+def locSelectAll(dataFrame,panel=False):
+    """
+    From a dataFrame resulting from the function dataLoad(), select the daily data of all stations
+    at once, with the different elements as different columns (as locSelect() does for one station).
+
+    Parameters
+    ----------
+    dataFrame : _pd DataFrame
+        The dataFrame that results from a succesful use of the function dataLoad.
+    panel : BOOL, optional
+        If False, return a dictionary with per station the DataFrame that locSelect() returns.
+        If True, return one DataFrame indexed by STN_Name and date, with a column for every element
+        in the data (NaN for stations without that element). The default is False.
+
+    The whole dataFrame is pivoted in one pass, instead of selecting every station and element separately.
+    Multiple data points on the same day are averaged into one value per day.
+
+    Returns
+    -------
+    Dictionary of Pandas DataFrames (panel=False) or one Pandas DataFrame (panel=True).
+
+    """
+    df = dataFrame
+    if len(df)==0:
+        print('The provided DataFrame is empty.')
+        return
+    dfPanel,present = _dailyPanel(df)
+    stations = dfPanel.index.levels[0]
+    print('Daily data selected for '+str(len(stations))+' stations, from '+str(dfPanel.index.levels[1].min().date())+
+          ' to '+str(dfPanel.index.levels[1].max().date())+'.')
+    if panel:
+        return dfPanel
+    
+    timecols = ['YEAR','seasonyear','season','MONTH','dk','day']
+    elements = [col for col in dfPanel.columns if col not in timecols+['RD']]
+    bounds = _np.append(0,_np.cumsum(_np.bincount(dfPanel.index.codes[0],minlength=len(stations))))
+    dfDict = {}
+    for i,stationName in enumerate(stations):
+        cols = timecols+[el for j,el in enumerate(elements) if present[i,j]]
+        if ('PRECIP' in elements) and present[i,elements.index('PRECIP')]:
+            cols.append('RD')
+        dfDay = dfPanel.iloc[bounds[i]:bounds[i+1]].droplevel('STN_Name')[cols]
+        dfDay.index = _pd.DatetimeIndex(dfDay.index,freq='D',name='date')
+        dfDay.stationName = stationName
+        dfDict[stationName] = dfDay
+    return dfDict
+
+def _stationRows(df,stationName):
+    """
+    Returns the rows of one station, sorted by EG_EL. Uses the sorting of dataLoad() (binary search) and
+    falls back to selecting by mask if the dataFrame is not sorted by STN_Name.
+    """
+    lo,hi = _rowRange(df,stationName)
+    dfStation = df.iloc[lo:hi]
+    # a sample of the column is enough to notice data that is not sorted (for example concatenated dataLoad results)
+    sample = df.STN_Name.iloc[::max(len(df)//1000,1)]
+    if isinstance(sample.dtype,_pd.CategoricalDtype):
+        sample = sample.cat.codes
+    if (sample.is_monotonic_increasing==False) or (dfStation.STN_Name!=stationName).any():
+        dfStation = df[df.STN_Name==stationName].sort_values(['EG_EL'],kind='stable')
+    return dfStation
+
+def _dailyPanel(df):
+    """
+    Daily averages of all stations and elements of long-format data in one pass, in the layout of locSelect(),
+    indexed by STN_Name and date. The period of a station is the period of its first element (as in locSelect()).
+    Also returns a boolean array (stations x elements) which elements are present per station.
+    """
+    stnCodes,stations = _pd.factorize(df.STN_Name,sort=True)
+    elCodes,elements = _pd.factorize(df.EG_EL,sort=True)
+    stations = _pd.Index(list(stations),dtype=object)
+    elements = list(elements)
+    nStations,nElements = len(stations),len(elements)
+    dayNr = _dates(df).astype('datetime64[D]').astype('int64')
+    valid = (stnCodes>=0)&(elCodes>=0)
+    stnCodes,elCodes,dayNr = stnCodes[valid],elCodes[valid],dayNr[valid]
+    value = df.value.values[valid].astype(float)
+    
+    # first and last day per station-element; a station gets the period of its first element
+    pairs = _pd.DataFrame({'pair':stnCodes*nElements+elCodes,'day':dayNr}).groupby('pair').day.agg(['min','max'])
+    present = _np.zeros(nStations*nElements,dtype=bool)
+    present[pairs.index.values] = True
+    present = present.reshape(nStations,nElements)
+    firstPair = _np.arange(nStations)*nElements+present.argmax(axis=1)
+    start = pairs['min'].reindex(firstPair).values
+    end = pairs['max'].reindex(firstPair).values
+    nDays = end-start+1
+    offset = _np.append(0,_np.cumsum(nDays)[:-1])
+    
+    # one row per station-day; average the values per row and element with bincount
+    use = (dayNr>=start[stnCodes])&(dayNr<=end[stnCodes])&_np.isfinite(value)
+    row = offset[stnCodes[use]]+dayNr[use]-start[stnCodes[use]]
+    nRows = int(nDays.sum())
+    flat = row*nElements+elCodes[use]
+    sums = _np.bincount(flat,weights=value[use],minlength=nRows*nElements)
+    counts = _np.bincount(flat,minlength=nRows*nElements)
+    with _np.errstate(invalid='ignore',divide='ignore'):
+        daily = (sums/counts).reshape(nRows,nElements)
+    
+    rowStation = _np.repeat(_np.arange(nStations),nDays)
+    dates = (start[rowStation]+_np.arange(nRows)-offset[rowStation]).astype('datetime64[D]').astype('datetime64[ns]')
+    dfPanel = _pd.DataFrame(_calendarColumns(dates))
+    for j,el in enumerate(elements):
+        dfPanel[el] = daily[:,j]
+    if 'PRECIP' in elements:
+        precip = dfPanel.PRECIP.values
+        dfPanel['RD'] = _np.where(precip>1,1,_np.where(precip>-1,0,_np.nan))
+    dfPanel.index = _pd.MultiIndex.from_arrays([stations.take(rowStation),dates],names=['STN_Name','date'])
+    return dfPanel,present
+
+def _calendarColumns(dates):
+    """
+    Returns the columns YEAR, seasonyear, season, MONTH, dk and day (as in dataLoad()) for an array of dates.
+    """
+    cal = _dayCalendar(_dayNumbers(dates))
+    return {'YEAR':cal['YEAR'],
+            'seasonyear':cal['seasonyear'],
+            'season':_pd.Categorical.from_codes(cal['seasonCode'],categories=_seasons,ordered=True),
+            'MONTH':cal['MONTH'],
+            'dk':_pd.Categorical.from_codes(cal['dk']-1,categories=[1,2,3],ordered=True),
+            'day':cal['day']}
+
+@_memoize
 def timeData(dataFrame,element,timeperiod):    
     """
     This function creates a DataFrame with relevant data for timeperiod analysis, for timeperiod dekadal, month, season or year.
@@ -191,25 +769,8 @@ def timeData(dataFrame,element,timeperiod):
               'Please select one of the following '+str(options))
         return
     
-    if timeperiod == 'day':
-        getList = ['YEAR','MONTH','day',element]
-        groupList = ['YEAR','MONTH','day']
-        aggGroupList = ['MONTH','day']        
-    elif timeperiod == 'dekadal':
-        getList = ['YEAR','MONTH','dk',element]
-        groupList = ['YEAR','MONTH','dk']
-        aggGroupList = ['MONTH','dk']
-    elif timeperiod =='month':
-        getList = ['YEAR','MONTH',element]
-        groupList = ['YEAR','MONTH']
-        aggGroupList = ['MONTH']    
-    elif timeperiod =='season':
-        getList = ['seasonyear','season',element]
-        groupList = ['seasonyear','season']
-        aggGroupList = ['season']
-    else:
-        getList = ['YEAR',element]
-        groupList = ['YEAR']
+    groupList = _timeGroups[timeperiod][0]
+    getList = groupList+[element]
     
     dfEL = df.get(getList)
     if (element == 'PRECIP') or (element == 'RD'):
@@ -217,11 +778,240 @@ def timeData(dataFrame,element,timeperiod):
     elif (element == 'TMPMIN') or (element == 'TMPMAX'):
         periodEL = dfEL.groupby(by=groupList).mean()
     
-    nNona = dfEL.groupby(by=groupList).count()
+    nNona = dfEL.groupby(by=groupList).count()[element].values
+    
+    dfReturn = _timeDataTable(periodEL,nNona,element,timeperiod,stationName)
     
-    if timeperiod != 'year':
-        periodMean = periodEL.groupby(level=aggGroupList).mean().rename(columns={element:element+'avg'})
-        periodStd = periodEL.groupby(level=aggGroupList).std().rename(columns={element:element+'std'})
+    print(timeperiod+' data for '+element+' are calculated for station '+stationName)
+    if timeperiod=='season':
+        print('Seasonal timeperiod is used. The year in the DataFrame for season Bega means the last three months of that year and the first month of the next year.')
+    
+    return dfReturn
+
+def timeDataAll(dataFrame,elements=None):
+    """
+    Creates the timeData() tables of all timeperiods (day, dekadal, month, season and year) for the elements of a single station
+    DataFrame at once. The daily values are summed once per dekad; month sums are made from the dekad sums, and season and year
+    sums from the month sums (with the number of days with observation likewise), instead of grouping the daily data for every table.
+
+    Parameters
+    ----------
+    dataFrame : pandas DataFrame
+        A single station dataframe resulting from the function locSelect.
+    elements : list of STR, optional
+        The elements to organize. The default is None: all elements of 'TMPMIN','TMPMAX','PRECIP','RD' in dataFrame.
+
+    Returns
+    -------
+    Dictionary with per element a dictionary with per timeperiod the DataFrame that timeData() returns.
+
+    """
+    df = dataFrame
+    stationName = df.stationName
+    element_options = ['TMPMIN','TMPMAX','PRECIP','RD']
+    if elements is None:
+        elements = [el for el in element_options if el in df.columns]
+    elif type(elements)==str:
+        elements = [elements]
+    for element in elements:
+        if element not in element_options:
+            print('The chosen element is not (yet) implemented./nCurrently implemented are one of '+str(element_options))
+            return
+        if element not in df.columns:
+            print('The provided DataFrame misses column \''+element+'\'.\n',
+                  'Please provide another DataFrame or select another element.\n',
+                  'The provided DataFrame only has elements '+str(df.columns.to_list()[6:]))
+            return
+    if df.index.is_monotonic_increasing==False:
+        df = df.sort_index()
+    
+    year = df.YEAR.values
+    month = df.MONTH.values
+    day = df.day.values
+    dkCode = _np.asarray(df.dk.cat.codes.values)
+    seasonCode = _np.asarray(df.season.cat.codes.values)
+    seasonyear = df.seasonyear.values
+    values = df[elements].values.astype(float)
+    nona = _np.isfinite(values)
+    
+    # the pyramid: every level is summed from the sums (and counts) of the level below;
+    # year from month, as season Bega crosses the turn of the year
+    levels = {'base':(_np.arange(len(df)),_np.where(nona,values,0),nona.astype('int64'))}
+    for timeperiod,below,key in [('day','base',(year*12+month)*32+day),
+                                 ('dekadal','day',(year*12+month)*3+dkCode),
+                                 ('month','dekadal',year*12+month),
+                                 ('season','month',seasonyear*3+seasonCode),
+                                 ('year','month',year)]:
+        rows,sums,counts = levels[below]
+        key = key[rows]
+        start = _np.flatnonzero(_np.diff(key,prepend=key[0]-1)!=0)
+        levels[timeperiod] = (rows[start],_np.add.reduceat(sums,start,axis=0),_np.add.reduceat(counts,start,axis=0))
+    del levels['base']
+    
+    dfAll = {}
+    for j,element in enumerate(elements):
+        dfAll[element] = {}
+        for timeperiod,(rows,sums,counts) in levels.items():
+            groupList = _timeGroups[timeperiod][0]
+            if (element == 'PRECIP') or (element == 'RD'):
+                periodValues = sums[:,j]
+            else:
+                with _np.errstate(invalid='ignore',divide='ignore'):
+                    periodValues = sums[:,j]/counts[:,j]
+            keys = df.iloc[rows][groupList]
+            if timeperiod == 'season':
+                # groupby order: seasonyear, then season categories
+                order = _np.lexsort((seasonCode[rows],seasonyear[rows]))
+                keys,periodValues,nNona = keys.iloc[order],periodValues[order],counts[order,j]
+            else:
+                nNona = counts[:,j]
+            periodEL = _pd.DataFrame({element:periodValues},index=_pd.MultiIndex.from_frame(keys))
+            periodEL,nNona = _unobservedPeriods(periodEL,nNona,element,timeperiod)
+            dfAll[element][timeperiod] = _timeDataTable(periodEL,nNona,element,timeperiod,stationName)
+    
+    print('day, dekadal, month, season and year data for '+', '.join(elements)+' are calculated for station '+stationName)
+    return dfAll
+
+@_memoize
+def timeDataPanel(data,element,timeperiod):
+    """
+    Creates the timeData() table of one element and timeperiod for all stations at once, in one grouped pass.
+
+    Parameters
+    ----------
+    data : pandas DataFrame or StationCube
+        A dataFrame resulting from the function dataLoad(), or a StationCube (see stationCube.StationCube).
+    element : string
+        The element of which data needs to be organized. Options: 'TMPMIN','TMPMAX','PRECIP','RD'.
+    timeperiod: string
+        The timeperiod for which the data needs to be organized. Options: 'day','dekadal','month','season' or 'year'.
+
+    Per station, the daily data covers the same period as locSelect() would select: the period of the first element of that
+    station, rows without a value included. A StationCube keeps that period in its bounds (see StationCube.fromFrame());
+    a cube saved without bounds uses the period from the first to the last observation of the first element with data.
+
+    Returns
+    -------
+    Pandas DataFrame with element timeperiod data of all stations that have the element, indexed by STN_Name and the period columns.
+    For every station, the rows are the same as in timeData(locSelect(dataFrame,station),element,timeperiod). For a StationCube
+    without bounds, the periods at the edges and the aggregates of other elements than the first can differ from that.
+
+    """
+    options = ['year','season','month','dekadal','day']
+    element_options = ['TMPMIN','TMPMAX','PRECIP','RD']
+    if element not in element_options:
+        print('The chosen element is not (yet) implemented./nCurrently implemented are one of '+str(element_options))
+        return
+    if (timeperiod not in options):
+        print('The provided timeperiod \''+timeperiod+'\' is not one of the options.\n',
+              'Please select one of the following '+str(options))
+        return
+    
+    if isinstance(data,_pd.DataFrame):
+        dfPanel,present = _dailyPanel(data)
+        elements = [col for col in dfPanel.columns if col not in ['YEAR','seasonyear','season','MONTH','dk','day','RD']]
+    else:
+        dfPanel,present = _cubePanel(data)
+        elements = data.elements
+    presentEL = 'PRECIP' if element == 'RD' else element
+    if presentEL not in elements:
+        print('The provided data misses element \''+element+'\'.\n',
+              'Please provide other data or select another element.')
+        return
+    stations = dfPanel.index.get_level_values('STN_Name').unique()[present[:,elements.index(presentEL)]]
+    dfPanel = dfPanel[dfPanel.index.get_level_values('STN_Name').isin(stations)]
+    
+    groupList = ['STN_Name']+_timeGroups[timeperiod][0]
+    dfEL = dfPanel.get(groupList[1:]+[element])
+    if (element == 'PRECIP') or (element == 'RD'):
+        periodEL = dfEL.groupby(by=groupList,observed=True).sum()
+    elif (element == 'TMPMIN') or (element == 'TMPMAX'):
+        periodEL = dfEL.groupby(by=groupList,observed=True).mean()
+    nNona = dfEL.groupby(by=groupList,observed=True).count()[element].values
+    periodEL,nNona = _unobservedPeriods(periodEL,nNona,element,timeperiod,keys=['STN_Name'])
+    
+    dfReturn = _timeDataTable(periodEL,nNona,element,timeperiod,list(stations),keys=['STN_Name'])
+    periodCols = ['YEAR','season'] if timeperiod == 'season' else _timeGroups[timeperiod][0]
+    metadata = {key:getattr(dfReturn,key) for key in ['element','long_name','unit','dimension','stationName','timeperiod','yearID','seasonID','monthID','dkID']}
+    dfReturn = dfReturn.set_index(['STN_Name']+periodCols)
+    for key,value in metadata.items():
+        setattr(dfReturn,key,value)
+    
+    print(timeperiod+' data for '+element+' are calculated for '+str(len(stations))+' stations')
+    return dfReturn
+
+def _cubePanel(cube):
+    """
+    Returns the daily data of a StationCube in the layout of _dailyPanel(): per station the days of its first element
+    (from the bounds of the cube, or else from its first to last observation), and which elements are present per station.
+    """
+    data = _np.asarray(cube.data)
+    if cube.bounds is not None:
+        bounds = _np.asarray(cube.bounds)
+        present = bounds[:,:,0]>=0
+        firstEl = present.argmax(axis=1)
+        start,end = bounds[_np.arange(len(cube.stations)),firstEl].T
+    else:
+        nona = _np.isfinite(data)
+        present = nona.any(axis=2)
+        firstEl = present.argmax(axis=1)
+        firstNona = nona[_np.arange(len(cube.stations)),firstEl]
+        start = firstNona.argmax(axis=1)
+        end = data.shape[2]-1-firstNona[:,::-1].argmax(axis=1)
+    keep = present.any(axis=1)
+    stationNr = _np.flatnonzero(keep)
+    nDays = (end-start+1)[stationNr]
+    rowStation = _np.repeat(stationNr,nDays)
+    dayNr = start[rowStation]+_np.arange(nDays.sum())-_np.repeat(_np.append(0,_np.cumsum(nDays)[:-1]),nDays)
+    dates = cube.dates.values[dayNr]
+    dfPanel = _pd.DataFrame(_calendarColumns(dates))
+    for j,el in enumerate(cube.elements):
+        dfPanel[el] = data[rowStation,j,dayNr].astype(float)
+    stations = _pd.Index(cube.stations,dtype=object)
+    dfPanel.index = _pd.MultiIndex.from_arrays([stations.take(rowStation),dates],names=['STN_Name','date'])
+    return dfPanel,present[keep]
+
+_timeGroups = {'day':(['YEAR','MONTH','day'],['MONTH','day']),
+               'dekadal':(['YEAR','MONTH','dk'],['MONTH','dk']),
+               'month':(['YEAR','MONTH'],['MONTH']),
+               'season':(['seasonyear','season'],['season']),
+               'year':(['YEAR'],None)}
+
+def _unobservedPeriods(periodEL,nNona,element,timeperiod,keys=[]):
+    """
+    Adds the periods without data that the grouping of timeData() creates for the categorical dk and season columns:
+    every combination of the years (and months) of the data with all dekads or seasons, per key (such as STN_Name).
+    These periods get the sum 0 for PRECIP and RD (NaN for temperatures) and no observations, so they count in the
+    averages and standard deviations of PRECIP and RD, as in timeData(), and are removed afterwards by _timeDataTable().
+    """
+    if timeperiod not in ['dekadal','season']:
+        return periodEL,nNona
+    groupList = _timeGroups[timeperiod][0]
+    categorical = periodEL.index.get_level_values(groupList[-1]).dtype
+    categories = _pd.Categorical(categorical.categories,dtype=categorical)
+    frame = periodEL.index.to_frame(index=False)
+    groups = frame.groupby(by=keys,sort=False) if len(keys)>0 else [(None,frame)]
+    indexes = []
+    for key,group in groups:
+        levels = [group[col].unique() for col in keys]+[_np.sort(group[col].unique()) for col in groupList[:-1]]+[categories]
+        indexes.append(_pd.MultiIndex.from_product(levels,names=keys+groupList))
+    index = indexes[0].append(indexes[1:]) if len(indexes)>1 else indexes[0]
+    if len(index) == len(periodEL):
+        return periodEL,nNona
+    fill = 0 if (element == 'PRECIP') or (element == 'RD') else _np.nan
+    nNona = _pd.Series(nNona,index=periodEL.index).reindex(index,fill_value=0).values
+    return periodEL.reindex(index,fill_value=fill),nNona
+
+def _timeDataTable(periodEL,nNona,element,timeperiod,stationName,keys=[]):
+    """
+    Completes the period values of one element (periodEL, indexed by the period columns) and the number of days with
+    observation per period (nNona) to the DataFrame that timeData() returns. If periodEL has extra index levels keys
+    (such as STN_Name), the averages and standard deviations are calculated per key.
+    """
+    aggGroupList = keys+(_timeGroups[timeperiod][1] or [])
+    if len(aggGroupList)>0:
+        periodMean = periodEL.groupby(level=aggGroupList,observed=True).mean().rename(columns={element:element+'avg'})
+        periodStd = periodEL.groupby(level=aggGroupList,observed=True).std().rename(columns={element:element+'std'})
         periodEL = periodEL.join(periodMean,on=aggGroupList)
         periodEL = periodEL.join(periodStd,on=aggGroupList)
     else:
@@ -232,43 +1022,8 @@ def timeData(dataFrame,element,timeperiod):
     
     # To get missing data info; only if period is not day
     if timeperiod!='day':
-        timecols = periodEL.get(groupList)
-        
-        if timeperiod == 'dekadal':
-            datetime = _pd.to_datetime(timecols.rename(columns={'YEAR':'year','MONTH':'month','dk':'day'}))
-            monthDays = _pd.Series(datetime.dt.days_in_month,index=periodEL.index)
-            dekaCons = [
-                        (periodEL.dk<=2),
-                        (periodEL.dk==3)&(monthDays==28),
-                        (periodEL.dk==3)&(monthDays==29),
-                        (periodEL.dk==3)&(monthDays==30),
-                        (periodEL.dk==3)&(monthDays==31)
-                        ]
-            dekaVals = [10,8,9,10,11]
-            periodDays = _pd.Series(_np.select(dekaCons,dekaVals),index=periodEL.index)
-        elif timeperiod == 'month':
-            timecols.loc[:,'day'] = 1
-            datetime = _pd.to_datetime(timecols.rename(columns={'YEAR':'year','MONTH':'month'}))
-            periodDays = _pd.Series(datetime.dt.days_in_month,index=periodEL.index)
-        elif timeperiod == 'season':
-            timecols.loc[:,'day'] = 1
-            timecols.loc[:,'month'] = 1
-            datetime = _pd.to_datetime(timecols.rename(columns={'seasonyear':'year'}).get(['year','month','day'])) 
-            seasCons = [
-                (timecols.season=='Bega'),
-                (timecols.season=='Kiremt'),
-                (timecols.season=='Belg')&(datetime.dt.is_leap_year==False),
-                (timecols.season=='Belg')&(datetime.dt.is_leap_year)
-            ]
-            seasVals = [31*3+30,30*2+31*2,28+2*31+30,29+2*31+30]
-            periodDays = _pd.Series(_np.select(seasCons,seasVals),index=periodEL.index)
-        else:
-            timecols.loc[:,'day'] = 1
-            timecols.loc[:,'month'] = 1
-            datetime = _pd.to_datetime(timecols.rename(columns={'YEAR':'year'}).get(['year','month','day'])) 
-            yearCons = [(datetime.dt.is_leap_year),(datetime.dt.is_leap_year==False)]
-            periodDays = _pd.Series(_np.select(yearCons,[366,365]),index=periodEL.index)
-        nNona = _pd.Series(nNona[element].values,index=periodEL.index)
+        periodDays = _pd.Series(_periodDays(periodEL,timeperiod),index=periodEL.index)
+        nNona = _pd.Series(nNona,index=periodEL.index)
         periodEL['periodDays'] = periodDays
         periodEL['nonaFrac'] = nNona/periodDays
         
@@ -277,14 +1032,11 @@ def timeData(dataFrame,element,timeperiod):
     if timeperiod=='day':
         periodEL = periodEL.dropna(subset=[element])
     
-    print(timeperiod+' data for '+element+' are calculated for station '+stationName)
     if timeperiod=='season':
-        print('Seasonal timeperiod is used. The year in the DataFrame for season Bega means the last three months of that year and the first month of the next year.')
         #rename seasonyear column and sort by season Belg->Kiremt->Bega
         periodEL = periodEL.rename(columns={'seasonyear':'YEAR'})
         periodEL.loc[:,'season'] = _pd.Categorical(periodEL.season,['Belg','Kiremt','Bega'])
-        periodEL = periodEL.sort_values(by=['YEAR','season'])
-        
+        periodEL = periodEL.sort_values(by=keys+['YEAR','season'])
         
     dfReturn = periodEL.set_index(_np.arange(len(periodEL)))
     # general metadata
@@ -305,7 +1057,20 @@ def timeData(dataFrame,element,timeperiod):
     
     return dfReturn
 
-def locData(dataFrame,element,year,season=None,month=None,dekadal=None):
+def _periodDays(periods,timeperiod):
+    """
+    Returns the number of days of every period (dekadal, month, season or year) in a DataFrame with the period columns of timeData().
+    """
+    if timeperiod == 'season':
+        return _calPeriodDays('season',periods.seasonyear.values,season=_np.asarray(periods.season.astype(str)))
+    elif timeperiod == 'year':
+        return _calPeriodDays('year',periods.YEAR.values)
+    elif timeperiod == 'month':
+        return _calPeriodDays('month',periods.YEAR.values,periods.MONTH.values)
+    return _calPeriodDays('dekadal',periods.YEAR.values,periods.MONTH.values,_np.asarray(periods.dk).astype('int64'))
+
+@_memoize
+def locData(dataFrame,element,year,season=None,month=None,dekadal=None,climatology=None):
     """
     From a dataFrame resulting from the function dataLoad(), select the data for one element of a specific timeperiod, for all available stations.
     The timeperiod can be a year, a specific year-season, a specific year-month or a specific year-month-dekadal.
@@ -326,13 +1091,17 @@ def locData(dataFrame,element,year,season=None,month=None,dekadal=None):
         If None, it is not used. The month-number for which data needs to be retrieved. To be used for a certain month, or in combination with dekadal.
     dekadal : None, or INT, optional
         If None, it is not used. The dekadal number (1,2 or 3) for which data needs to be retrieved. If used, also month needs to be provided.
+    climatology : None or Climatology, optional
+        If None, the average and standard deviation are calculated from all years in dataFrame. If a Climatology
+        (see climatology.Climatology) is provided, they are taken from it, and only the chosen year is aggregated.
+        The default is None.
 
     Returns
     -------
     Pandas DataFrame with the data for the specified timeperiod, indexed by stationname.
 
     """   
-    df = dataFrame.copy()
+    df = dataFrame
     
     element_options = ['TMPMIN','TMPMAX','PRECIP','RD']
     
@@ -378,7 +1147,6 @@ def locData(dataFrame,element,year,season=None,month=None,dekadal=None):
                   'Please provide strings belg, bega or kiremt')
             return
         else:
-            df.loc[:,'YEAR'] = df.seasonyear
             seasonList = [season]
             monthList = [1,2,3,4,5,6,7,8,9,10,11,12]
             dkList = [1,2,3]
@@ -387,23 +1155,44 @@ def locData(dataFrame,element,year,season=None,month=None,dekadal=None):
         monthList = [1,2,3,4,5,6,7,8,9,10,11,12]
         seasonList = ['Belg','Bega','Kiremt']
     
+    if (climatology is not None) and (element not in climatology.elements):
+        print('The provided climatology misses element \''+element+'\'. Available elements are: '+str(climatology.elements))
+        return
+    
+    # the selected dekads of the year (table of 36), looked up for the dekad of the year of every row
+    dkYears = _np.arange(36)
+    dkSelected = (_np.isin(_np.array(_seasons)[_monthSeason[dkYears//3+1]],seasonList)
+                  &_np.isin(dkYears//3+1,monthList)&_np.isin(dkYears%3+1,dkList))
+    dkCodes = df.dk.cat.codes.values if isinstance(df.dk.dtype,_pd.CategoricalDtype) else df.dk.values-1
+    inPeriod = dkSelected[(df.MONTH.values.astype('int64')-1)*3+dkCodes]&(df.EG_EL==('PRECIP' if element=='RD' else element)).values
+    # the year of a season is the seasonyear
+    yearValues = df.seasonyear.values if season != None else df.YEAR.values
+    if climatology is not None:
+        inPeriod &= (yearValues==year)
+    rows = _np.flatnonzero(inPeriod)
+    values = df.value.values[rows]
     if element == 'RD':
-        df['value'] = _pd.to_numeric(_pd.cut(df.value,[-1,1,df.value.max()],labels=[0,1]))
-        df.EG_EL.replace('PRECIP','RD',inplace=True)
-            
-    subdf = df[(df.YEAR==year)&(df.season.isin(seasonList))&(df.MONTH.isin(monthList))&(df.dk.isin(dkList))&(df.EG_EL==element)]
-    subdfAll = df[(df.season.isin(seasonList))&(df.MONTH.isin(monthList))&(df.dk.isin(dkList))&(df.EG_EL==element)]
+        # rainy day: more than 1 mm
+        values = _np.where(values>1,1.,_np.where(values>-1,0.,_np.nan))
+    subdfAll = _pd.DataFrame({'STN_Name':df.STN_Name.values[rows],'YEAR':yearValues[rows],'value':values})
+    subdf = subdfAll[subdfAll.YEAR==year]
         
-    grouper = subdf.get(['STN_Name','value']).groupby(by=['STN_Name'])
-    grouperAll = subdfAll.get(['STN_Name','YEAR','value']).groupby(by=['STN_Name','YEAR'])
+    grouper = subdf.get(['STN_Name','value']).groupby(by=['STN_Name'],observed=True)
     if (element=='PRECIP') or (element=='RD'):
         dfLoc = grouper.sum()
-        dfLocAll = grouperAll.sum()
     else:
         dfLoc = grouper.mean()
-        dfLocAll = grouperAll.mean()
-    dfLoc[element+'avg'] = dfLocAll.groupby(by=['STN_Name']).mean()['value']
-    dfLoc[element+'std'] = dfLocAll.groupby(by=['STN_Name']).std()['value']
+    dfLoc.index = dfLoc.index.astype(object) # compact data has categorical station names
+    if climatology is None:
+        grouperAll = subdfAll.get(['STN_Name','YEAR','value']).groupby(by=['STN_Name','YEAR'],observed=True)
+        dfLocAll = grouperAll.sum() if (element=='PRECIP') or (element=='RD') else grouperAll.mean()
+        dfLocAll.index = dfLocAll.index.set_levels(dfLocAll.index.levels[0].astype(object),level='STN_Name')
+        dfLoc[element+'avg'] = dfLocAll.groupby(by=['STN_Name'],observed=True).mean()['value']
+        dfLoc[element+'std'] = dfLocAll.groupby(by=['STN_Name'],observed=True).std()['value']
+    else:
+        stats = climatology.stat(element,season,month,dekadal)
+        dfLoc[element+'avg'] = stats[element+'avg']
+        dfLoc[element+'std'] = stats[element+'std']
     dfLoc = dfLoc.rename(columns={'value':element})
 
     dfLoc = dfLoc.get([element,element+'avg',element+'std'])
@@ -440,4 +1229,196 @@ def locData(dataFrame,element,year,season=None,month=None,dekadal=None):
     dfReturn.monthID = month
     dfReturn.dkID = dekadal
     
-    return dfReturn
\ No newline at end of file
+    return dfReturn
+
+def locDataSeries(dataFrame,element,timeperiod,years=None,climatology=None,asArray=False):
+    """
+    The locData() results of all periods of a timeperiod type at once: per year and period, the element's station values with the
+    average and standard deviation of all comparable periods of that station, calculated in one grouped computation.
+
+    Parameters
+    ----------
+    dataFrame : _pd DataFrame
+        The dataFrame that results from a succesful use of the function dataLoad. Not used if climatology is provided.
+    element : STR
+        The element of which data needs to be organized. Options: 'TMPMIN','TMPMAX','PRECIP','RD'.
+    timeperiod : STR
+        Options: 'year','season','month' or 'dekadal'.
+    years : None or tuple of INT, optional
+        If provided, only the periods from the first to the last year (inclusive) are returned. The averages and standard
+        deviations are always those of all years (or of the normal period of climatology). The default is None.
+    climatology : None or Climatology, optional
+        If provided, its yearly values and statistics are used instead of calculating them from dataFrame. The default is None.
+    asArray : BOOL, optional
+        If True, return the station values as array instead of as DataFrame. The default is False.
+
+    Returns
+    -------
+    If asArray is False: Pandas DataFrame indexed by YEAR, the period columns (season, MONTH or MONTH and dk) and STN_Name, with
+    columns element, element+'avg' and element+'std'. Use locDataSlice() or locDataSlices() to get the periods as locData() DataFrames.
+    If asArray is True: an array of the station values with shape (periods, stations), a DataFrame with the periods and a list of the stations.
+    For season, YEAR holds the seasonyear.
+
+    """
+    element_options = ['TMPMIN','TMPMAX','PRECIP','RD']
+    if element not in element_options:
+        print('The chosen element is not (yet) implemented./nCurrently implemented are one of '+str(element_options))
+        return
+    if timeperiod not in _periodCols:
+        print('The provided timeperiod \''+str(timeperiod)+'\' is not one of the options.\n',
+              'Please select one of the following '+str(list(_periodCols)))
+        return
+    if climatology is None:
+        climatology = _Climatology(dataFrame)
+    if element not in climatology.elements:
+        print('The provided data misses element \''+element+'\'. Available elements are: '+str(climatology.elements))
+        return
+    
+    periodCols = _periodCols[timeperiod]
+    periodEL = climatology.values[element][timeperiod]
+    if years is not None:
+        yearNr = periodEL.index.get_level_values('YEAR')
+        periodEL = periodEL[(yearNr>=years[0])&(yearNr<=years[-1])]
+    series = periodEL.join(climatology.stats[element][timeperiod],on=['STN_Name']+periodCols)
+    series = series.get([element,element+'avg',element+'std']).reorder_levels(['YEAR']+periodCols+['STN_Name'])
+    if timeperiod == 'season':
+        # sort by season Belg->Kiremt->Bega
+        seasonLevel = series.index.levels[series.index.names.index('season')]
+        series.index = series.index.set_levels(seasonLevel.reorder_categories(['Belg','Kiremt','Bega']),level='season')
+    series = series.sort_index()
+    
+    nPeriods = len(series.index.droplevel('STN_Name').unique())
+    print('Data for element '+element+' is calculated for '+str(nPeriods)+' '+timeperiod+' periods',
+          'for '+str(len(series.index.get_level_values('STN_Name').unique()))+' locations.')
+    if asArray:
+        table = series[element].unstack('STN_Name')
+        return table.values,table.index.to_frame(index=False),table.columns.to_list()
+    
+    # general metadata
+    series.element = element
+    series.long_name = _long_names[element]
+    series.unit = _units[element]
+    series.dimension = 'spatial'
+    series.timeperiod = timeperiod
+    return series
+
+def locDataSlice(series,year,season=None,month=None,dekadal=None):
+    """
+    Returns one period of a locDataSeries() result as the DataFrame that locData() returns for that period, with its metadata
+    (so it can be used by mapFunctions.idwMap() and kriMap()).
+    """
+    timeperiod = series.timeperiod
+    if timeperiod == 'dekadal':
+        key = (year,month,dekadal)
+    elif timeperiod == 'month':
+        key = (year,month)
+    elif timeperiod == 'season':
+        key = (year,season)
+    else:
+        key = (year,)
+    if None in key:
+        print('The provided series has timeperiod '+timeperiod+'. Please provide the year and the '+timeperiod+' period.')
+        return
+    levels = list(range(len(key)))
+    inPeriod = _np.ones(len(series),dtype=bool)
+    for level,value in zip(levels,key):
+        inPeriod &= (series.index.get_level_values(level)==value)
+    if inPeriod.any()==False:
+        print('The chosen period is not in the provided series.')
+        return
+    return _locDataFrame(series[inPeriod].droplevel(levels),series,key)
+
+def locDataSlices(series):
+    """
+    Iterates over all periods of a locDataSeries() result. Yields per period the key (year, and season, month or month and dk)
+    and the DataFrame that locData() returns for that period, with its metadata.
+    """
+    levels = list(range(series.index.nlevels-1))
+    for key,dfLoc in series.groupby(level=levels,observed=True,sort=False):
+        key = key if isinstance(key,tuple) else (key,)
+        yield key,_locDataFrame(dfLoc.droplevel(levels),series,key)
+
+def _locDataFrame(dfLoc,series,key):
+    dfLoc = dfLoc.copy()
+    dfLoc.index = dfLoc.index.astype(object)
+    keyDict = dict(zip(['YEAR']+_periodCols[series.timeperiod],key))
+    # general metadata
+    dfLoc.element = series.element
+    dfLoc.long_name = series.long_name
+    dfLoc.unit = series.unit
+    dfLoc.dimension = 'spatial'
+    
+    # timeData metadata
+    dfLoc.stationName = None
+    dfLoc.timeperiod = None
+    
+    # locData metadata
+    dfLoc.yearID = keyDict['YEAR']
+    dfLoc.seasonID = keyDict.get('season')
+    dfLoc.monthID = keyDict.get('MONTH')
+    dfLoc.dkID = keyDict.get('dk')
+    return dfLoc
+
+def periodAggregate(data,element,timeperiod):
+    """
+    Aggregates the data of one element for all stations and all periods of a timeperiod type, like locData does for one period.
+    The data can be one DataFrame from dataLoad(), or an iterable of such DataFrames (for example dataIter()), which is
+    consumed chunk by chunk; only the (small) per-chunk aggregates are kept in memory.
+    For rainfall ('PRECIP') and rainy days ('RD'), the sum is given. For temperatures ('TMPMIN' or 'TMPMAX'), the average is given.
+
+    Parameters
+    ----------
+    data : pandas DataFrame or iterable of pandas DataFrames
+        Data from dataLoad() or chunks from dataIter().
+    element : STR
+        The element of which data needs to be organized. Options: 'TMPMIN','TMPMAX','PRECIP','RD'.
+    timeperiod : STR
+        The timeperiod for which the data needs to be organized. Options: 'dekadal','month','season' or 'year'.
+
+    Returns
+    -------
+    Pandas DataFrame indexed by STN_Name and the period columns (YEAR, and season, MONTH or MONTH and dk), with columns
+    element (the period value) and 'count' (the number of observations in the period).
+    For season, YEAR holds the seasonyear.
+
+    """
+    element_options = ['TMPMIN','TMPMAX','PRECIP','RD']
+    groupLists = {'year':['YEAR'],'season':['seasonyear','season'],'month':['YEAR','MONTH'],'dekadal':['YEAR','MONTH','dk']}
+    
+    if element not in element_options:
+        print('The chosen element is not (yet) implemented./nCurrently implemented are one of '+str(element_options))
+        return
+    if timeperiod not in groupLists:
+        print('The provided timeperiod \''+timeperiod+'\' is not one of the options.\n',
+              'Please select one of the following '+str(list(groupLists)))
+        return
+    if isinstance(data,_pd.DataFrame):
+        data = [data]
+    
+    groupList = ['STN_Name']+groupLists[timeperiod]
+    sourceEL = 'PRECIP' if element=='RD' else element
+    partials = []
+    for chunk in data:
+        sub = chunk.loc[chunk.EG_EL==sourceEL,groupList+['value']]
+        if element == 'RD':
+            # rainy day: more than 1 mm
+            sub = sub.assign(value=_np.where(sub.value>1,1.,_np.where(sub.value>-1,0.,_np.nan)))
+        partials.append(sub.groupby(by=groupList,observed=True).value.agg(['sum','count']))
+    
+    if len(partials) == 0:
+        print('No data provided.')
+        return
+    periodEL = _pd.concat(partials).groupby(level=groupList,observed=True).sum()
+    if (element=='PRECIP') or (element=='RD'):
+        periodEL[element] = periodEL['sum']
+    else:
+        periodEL[element] = periodEL['sum']/periodEL['count'].where(periodEL['count']>0)
+    periodEL = periodEL.get([element,'count'])
+    if timeperiod == 'season':
+        periodEL.index = periodEL.index.rename('YEAR',level='seasonyear')
+    
+    periodEL.element = element
+    periodEL.long_name = _long_names[element]
+    periodEL.unit = _units[element]
+    periodEL.timeperiod = timeperiod
+    return periodEL
\ No newline at end of file
@@ -11,18 +11,22 @@ import numpy as _np
 import matplotlib.pyplot as _plt
 from matplotlib import cm as _cm
 import pandas as _pd
+from importlib.util import find_spec as _find_spec
+from collections import OrderedDict as _OrderedDict
 
 from pycamtET.support import saveCheck as _saveCheck
-from pycamtET.supportMap import _metercrs,_adm_d,_adm2_d,_adm1_d,_adm0_d,_legend_elements
-from pycamtET.supportMap import gridcalculate as _gridcalculate
+from pycamtET.supportMap import _metercrs,_legend_elements
+from pycamtET.supportMap import admLayer as _admLayer
+from pycamtET.adminIndex import admUnits as _admUnits
+from pycamtET.supportMap import gridcalculate as _gridcalculate,gridlabels as _gridlabels
 
 from pycamtET.pckgSettings import getSettings as _getSettings
-_siPath = _getSettings()['pckgsdataPath']+'\\stationinfo.csv'
+_siPath = _getSettings()['pckgsdataPath']+'/stationInfo.csv'
 
-def kriMap(dfLoc,region=None,adm2=None,adm3=None,krigingModel='gaussian',savePath=None):
+def kriMap(dfLoc,region=None,adm2=None,adm3=None,krigingModel='gaussian',savePath=None,variogramParameters=None,neighbours=None,gridsize=100,returnGrid=False):
     """
     Based on provided locations and their info, create a map based on Kriging.
-    On a rectangle grid of 100 * 100 points covering the full region, the estimated value is calculated with OrdinaryKriging from the package pykrige.
+    On a rectangle grid of gridsize * gridsize points covering the full region, the estimated value is calculated with ordinary kriging as in the package pykrige.
     After that, the points within the polygon of the region are kept.
     Two maps are created: the absolute values, and the anomaly.
     Anomalies for temperature data: observation - average.
@@ -39,11 +43,30 @@ def kriMap(dfLoc,region=None,adm2=None,adm3=None,krigingModel='gaussian',savePat
     savePath : string, optional
         A valid folder path as string. The default is None.
         If None, data is not exported to the computer. If provided, data is exported to the provided folder.
+    variogramParameters : None, list or dict, optional
+        Used as input for pykrige.ok.OrdinaryKriging(variogram_parameters). pykrige reads a list as [sill, range, nugget]
+        (gaussian, spherical, exponential, hole-effect), [slope, nugget] (linear) or [scale, exponent, nugget] (power);
+        a dict such as {'psill':..,'range':..,'nugget':..} names the parameters, as the 'variogram' of the metadata
+        with returnGrid=True.
+        If None, a variogram is fitted to the values and one to the averages (fits are cached). If provided, this fixed
+        variogram is used for both, and the kriging system is solved once. The default is None.
+    neighbours : None or INT, optional
+        If None, all stations are used (global kriging). If provided, local kriging: the grid is divided in blocks of
+        about 64 grid points, and every block uses only the nearest neighbours stations of its centre. The default is None.
+    gridsize : INT, optional
+        The number of grid points in both directions. The default is 100.
+    returnGrid : BOOL, optional
+        If True, the grids are returned as well (see gridExport()). The default is False.
+
+    Kriging systems are solved once per station set, grid and variogram and cached (see kriMany()).
 
     Returns
     -------
     (fig1,fig2) : matplotlib Figures
         The created absolute and anomaly maps.
+    grid : dictionary, only if returnGrid is True
+        The grids estimate, average, anomaly and variance (kriging variance of estimate) with their coordinates, mask
+        and metadata, as gridExport() takes it.
 
     """        
     # Retrieve metadata
@@ -67,56 +90,37 @@ def kriMap(dfLoc,region=None,adm2=None,adm3=None,krigingModel='gaussian',savePat
     df = dfLoc.join(stationInfo.set_index(['STN_Name'])).drop_duplicates(subset=['GEOGR1','GEOGR2'])
 
     # get the shapefile corresponding to the selected area
-    if (adm3!=None):
-        if (adm3 not in _adm_d.admin3Name.values):
-            print('The selected adm3 name is not available. Please select another name.')
-            return
-        else:
-            gpdshape = _adm_d[_adm_d.admin3Name==adm3]
-            plotshape = _adm_d[_adm_d.admin3Name==adm3]
-            areaname = adm3
-    elif (adm2!=None):
-        if (adm2 not in _adm2_d.admin2Name.values):
-            print('The selected adm2 name is not available. Please select another name.')
-            return
-        else:
-            gpdshape = _adm2_d[_adm2_d.admin2Name==adm2]
-            plotshape = _adm_d[_adm_d.admin2Name==adm2]
-            areaname = adm2
-    elif (region!=None):
-        if (region not in _adm_d.admin1Name.values):
-            print('The selected adm3 name is not available. Please select another name.')
-            return
-        else:
-            gpdshape = _adm1_d[_adm1_d.admin1Name==region]
-            plotshape = _adm2_d[_adm2_d.admin1Name==region]
-            areaname = region
-    else:
-        gpdshape = _adm0_d
-        plotshape = _adm1_d
-        areaname = 'Ethiopia'
+    area = _areaShapes(region,adm2,adm3)
+    if area is None:
+        return
+    gpdshape,plotshape,areaname = area
 
     # Prepare grid data
-    gridinfo = _gridcalculate(gpdshape,areaname)
+    gridinfo = _gridcalculate(gpdshape,areaname,gridsize)
     gridx = gridinfo.x_d.unique()
     gridy = gridinfo.y_d.unique()
     bool2d = _np.array(gridinfo.bool1d).reshape(gridx.size,gridy.size)
 
     nona = df[element].notna()
-    x = df.GEOGR1[nona]
-    y = df.GEOGR2[nona]
-    z = df[element][nona]
-    zavg = df[element+'avg'][nona]
+    stationxy = _np.column_stack([df.GEOGR1[nona].values,df.GEOGR2[nona].values]).astype(float)
+    z = df[element][nona].values.astype(float)
+    zavg = df[element+'avg'][nona].values.astype(float)
 
-    from pykrige.ok import OrdinaryKriging
-    
-    OK = OrdinaryKriging(x,y,z,variogram_model=krigingModel,verbose=False,enable_plotting=False)
-    OKavg = OrdinaryKriging(x,y,zavg,variogram_model=krigingModel,verbose=False,enable_plotting=False)
-    zgrid,ss = OK.execute('grid',gridx,gridy)
-    zgridavg,ssavg = OKavg.execute('grid',gridx,gridy)
-    
-    zgrid[~bool2d] = _np.nan
-    zgridavg[~bool2d] = _np.nan
+    # only the grid points within the area are estimated; with a fixed variogram value and average in one system
+    gridxy = _np.column_stack([gridinfo.x_d.values,gridinfo.y_d.values])[bool2d.reshape(-1)]
+    zgrid = _np.full(bool2d.shape,_np.nan)
+    zgridavg = _np.full(bool2d.shape,_np.nan)
+    zgridvar = _np.full(bool2d.shape,_np.nan)
+    variogram = _variogram(stationxy,z,krigingModel,variogramParameters)
+    weights,variance,order = _cachedKrigingWeights((areaname,bool2d.size),gridxy,stationxy,krigingModel,variogram,neighbours)
+    zgridvar[bool2d] = variance
+    if variogramParameters is None:
+        variogramavg = _variogram(stationxy,zavg,krigingModel)
+        weightsavg,varianceavg,orderavg = _cachedKrigingWeights((areaname,bool2d.size),gridxy,stationxy,krigingModel,variogramavg,neighbours)
+        zgrid[bool2d] = weights@z[order]
+        zgridavg[bool2d] = weightsavg@zavg[orderavg]
+    else:
+        zgrid[bool2d],zgridavg[bool2d] = (weights@_np.column_stack([z,zavg])[order]).T
 
     if (element == 'PRECIP') or (element == 'RD'):
         zgridanom = zgrid/zgridavg
@@ -131,7 +135,7 @@ def kriMap(dfLoc,region=None,adm2=None,adm3=None,krigingModel='gaussian',savePat
     fig1,ax1=_plt.subplots()
     fig2,ax2=_plt.subplots()
     ax1.contourf(gridx,gridy,zgrid,cmap=cmap)
-    cbar = fig1.colorbar(_cm.ScalarMappable(cmap=cmap),location='bottom')
+    cbar = fig1.colorbar(_cm.ScalarMappable(cmap=cmap),location='bottom',ax=ax1)
     cbar.set_ticks(_np.linspace(0,1,5))
     cbar.set_ticklabels(_np.round(_np.linspace(_np.nanmin(zgrid),_np.nanmax(zgrid),5),0))
     cbar.set_label(element+' '+unit)    
@@ -142,7 +146,7 @@ def kriMap(dfLoc,region=None,adm2=None,adm3=None,krigingModel='gaussian',savePat
     elif (element == 'TMPMIN') or (element =='TMPMAX'):
         absmax = _np.max(_np.abs((_np.nanmin(zgridanom),_np.nanmax(zgridanom))))
         ax2.contourf(gridx,gridy,zgridanom,cmap=cmap,vmin=-absmax,vmax=absmax)
-        cbar2 = fig2.colorbar(_cm.ScalarMappable(cmap=cmap),location='bottom')
+        cbar2 = fig2.colorbar(_cm.ScalarMappable(cmap=cmap),location='bottom',ax=ax2)
         cbar2.set_ticks(_np.linspace(0,1,5))
         cbar2.set_ticklabels(_np.round(_np.linspace(-absmax,absmax,5),1))
         cbar2.set_label(element+' anomaly '+unit)          
@@ -164,13 +168,18 @@ def kriMap(dfLoc,region=None,adm2=None,adm3=None,krigingModel='gaussian',savePat
         fig2.savefig(fig2Path)
         df.to_csv(csvPath)
         print('Data exported to %s, %s and %s.' % (fig1Path,fig2Path,csvPath))
-        
+
+    if returnGrid:
+        metadata = _gridMetadata(dfLoc,areaname,gridsize,'kriging')
+        metadata.update({'krigingModel':krigingModel,'variogram':_variogramDict(krigingModel,variogram),'neighbours':neighbours})
+        grid = _gridDict(gridx,gridy,bool2d,{'estimate':zgrid,'average':zgridavg,'anomaly':zgridanom,'variance':zgridvar},metadata)
+        return fig1,fig2,grid
     return fig1,fig2
 
-def idwMap(dfLoc,region=None,adm2=None,adm3=None,savePath=None):
+def idwMap(dfLoc,region=None,adm2=None,adm3=None,savePath=None,power=1,neighbours=None,gridsize=100,returnGrid=False):
     """
     Based on provided locations and their info, create a map based on Inverse Distance Weighting (idw).
-    On a rectangle grid of 100 * 100 points covering the full region, the estimated value is calculated based on idw with all supplied station data.
+    On a rectangle grid of gridsize * gridsize points covering the full region, the estimated value is calculated based on idw with all supplied station data.
     After that, the points within the polygon of the region are kept.
     Two maps are created: the absolute values, and the anomaly.
     Anomalies for temperature data: observation - average.
@@ -183,11 +192,24 @@ def idwMap(dfLoc,region=None,adm2=None,adm3=None,savePath=None):
     savePath : string, optional
         A valid folder path as string. The default is None.
         If None, data is not exported to the computer. If provided, data is exported to the provided folder.
+    power : FLOAT, optional
+        The power of the inverse distance: weights are 1/distance**power. The default is 1.
+    neighbours : None or INT, optional
+        If None, all stations are used for every grid point. If provided, only the nearest neighbours stations are used.
+        The default is None.
+    gridsize : INT, optional
+        The number of grid points in both directions. The default is 100.
+    returnGrid : BOOL, optional
+        If True, the grids are returned as well (see gridExport()). The default is False.
+
+    Stations without data for the element are left out. A grid point at the location of a station gets the station value.
 
     Returns
     -------
     (fig1,fig2) : matplotlib Figures
         The created absolute and anomaly maps.
+    grid : dictionary, only if returnGrid is True
+        The grids estimate, average and anomaly with their coordinates, mask and metadata, as gridExport() takes it.
 
     """
     # Collect metaData
@@ -209,75 +231,34 @@ def idwMap(dfLoc,region=None,adm2=None,adm3=None,savePath=None):
     
     stationInfo = _pd.read_csv(_siPath)
     df = dfLoc.join(stationInfo.set_index(['STN_Name'])).drop_duplicates(subset=['GEOGR1','GEOGR2'])
+    df = df[df[element].notna()]
 
     # get the shapefile corresponding to the selected area
-    if (adm3!=None):
-        if (adm3 not in _adm_d.admin3Name.values):
-            print('The selected adm3 name is not available. Please select another name.')
-            return
-        else:
-            gpdshape = _adm_d[_adm_d.admin3Name==adm3]
-            plotshape = _adm_d[_adm_d.admin3Name==adm3]
-            areaname = adm3
-    elif (adm2!=None):
-        if (adm2 not in _adm2_d.admin2Name.values):
-            print('The selected adm2 name is not available. Please select another name.')
-            return
-        else:
-            gpdshape = _adm2_d[_adm2_d.admin2Name==adm2]
-            plotshape = _adm_d[_adm_d.admin2Name==adm2]
-            areaname = adm2
-    elif (region!=None):
-        if (region not in _adm_d.admin1Name.values):
-            print('The selected adm3 name is not available. Please select another name.')
-            return
-        else:
-            gpdshape = _adm1_d[_adm1_d.admin1Name==region]
-            plotshape = _adm2_d[_adm2_d.admin1Name==region]
-            areaname = region
-    else:
-        gpdshape = _adm0_d
-        plotshape = _adm1_d
-        areaname = 'Ethiopia'
+    area = _areaShapes(region,adm2,adm3)
+    if area is None:
+        return
+    gpdshape,plotshape,areaname = area
 
     # Prepare grid data
-    gridinfo = _gridcalculate(gpdshape,areaname)
+    gridinfo = _gridcalculate(gpdshape,areaname,gridsize)
     gridshape = (len(gridinfo.x_d.unique()),len(gridinfo.y_d.unique()))
-    bool1d = gridinfo.bool1d
-    x_m = gridinfo.x_m
-    y_m = gridinfo.y_m
+    bool1d = _np.asarray(gridinfo.bool1d,dtype=bool)
     x2d_d = _np.array(gridinfo.x_d).reshape(gridshape)
     y2d_d = _np.array(gridinfo.y_d).reshape(gridshape)
     
     # Station lots and lans need to be turned into meter, in order to calculate distances
     import geopandas as gpd
     statpoints = gpd.points_from_xy(df.GEOGR1,df.GEOGR2,crs='epsg:4326').to_crs(_metercrs)
-    stationxy = []
-    for i in range(len(statpoints)):
-        xypoint = _np.array((statpoints[i].x,statpoints[i].y))
-        stationxy.append(xypoint)
-    stationxy = _np.array(stationxy)
-
-    estimateList = []
-    estimateavgList = []
-    for i in range(len(bool1d)):
-        if bool1d[i]:
-            gridpointxy = _np.array((x_m[i],y_m[i]))
-            distances = _np.linalg.norm(gridpointxy-stationxy,axis=1)
-            distInv = 1/distances
-            weights = distInv/distInv.sum()
-            estimates = df[element].values*weights
-            estimatesavg = df[element+'avg'].values*weights
-            estimate = estimates.sum()
-            estimateavg = estimatesavg.sum()
-        else:
-            estimate = _np.nan
-            estimateavg = _np.nan
-        estimateList.append(estimate)
-        estimateavgList.append(estimateavg)
+    stationxy = _np.column_stack([statpoints.x,statpoints.y])
+
+    # only the grid points within the area are estimated; value and average at once, with cached weights
+    gridxy = _np.column_stack([gridinfo.x_m.values,gridinfo.y_m.values])[bool1d]
+    weights,order = _cachedIdwWeights((areaname,len(bool1d)),gridxy,stationxy,power,neighbours)
+    estimate1d = _np.full((len(bool1d),2),_np.nan)
+    estimate1d[bool1d] = (weights@df.get([element,element+'avg']).values[order])/_np.asarray(weights.sum(axis=1)).reshape(-1,1)
 
-    estimate2d = _np.array(estimateList).reshape(gridshape)
-    estimateavg2d = _np.array(estimateavgList).reshape(gridshape)
+    estimate2d = estimate1d[:,0].reshape(gridshape)
+    estimateavg2d = estimate1d[:,1].reshape(gridshape)
     if (element == 'PRECIP') or (element == 'RD'):
         estimateanom2d = estimate2d/estimateavg2d
         cmap = 'RdYlGn'
@@ -304,7 +285,7 @@ def idwMap(dfLoc,region=None,adm2=None,adm3=None,savePath=None):
     elif (element == 'TMPMIN') or (element =='TMPMAX'):
         absmax = _np.max(_np.abs((_np.nanmin(estimateanom2d),_np.nanmax(estimateanom2d))))
         ax2.contourf(x2d_d,y2d_d,estimateanom2d,cmap=cmap,vmin=-absmax,vmax=absmax)
-        cbar2 = fig2.colorbar(_cm.ScalarMappable(cmap=cmap),location='bottom')
+        cbar2 = fig2.colorbar(_cm.ScalarMappable(cmap=cmap),location='bottom',ax=ax2)
         cbar2.set_ticks(_np.linspace(0,1,5))
         cbar2.set_ticklabels(_np.round(_np.linspace(-absmax,absmax,5),1))
         cbar2.set_label(element+' anomaly '+unit)        
@@ -326,9 +307,778 @@ def idwMap(dfLoc,region=None,adm2=None,adm3=None,savePath=None):
         fig2.savefig(fig2Path)
         df.to_csv(csvPath)
         print('Data exported to %s, %s and %s.' % (fig1Path,fig2Path,csvPath)) 
-    
+
+    if returnGrid:
+        metadata = _gridMetadata(dfLoc,areaname,gridsize,'idw')
+        metadata.update({'power':power,'neighbours':neighbours})
+        grid = _gridDict(x2d_d[0],y2d_d[:,0],bool1d.reshape(gridshape),{'estimate':estimate2d,'average':estimateavg2d,'anomaly':estimateanom2d},metadata)
+        return fig1,fig2,grid
     return fig1,fig2
 
+def idwMany(series,region=None,adm2=None,adm3=None,power=1,neighbours=None,gridsize=100,returnGrid=False):
+    """
+    Inverse Distance Weighting (idw) of all periods of a locDataSeries() result at once, on the grid of idwMap().
+    The weights depend only on the grid and the station locations: they are calculated (or taken from the cache)
+    once, and all periods are estimated with one matrix product. Stations without data in a period are left out of
+    that period; with neighbours, the nearest stations with data are used.
+
+    Parameters
+    ----------
+    series : Pandas DataFrame
+        A dataFrame returned by the function dFu.locDataSeries().
+    region, adm2, adm3 : None or STR, optional
+        The area, as in idwMap(). The default is None: Ethiopia.
+    power : FLOAT, optional
+        The power of the inverse distance, as in idwMap(). The default is 1.
+    neighbours : None or INT, optional
+        The number of nearest stations to use, as in idwMap(). The default is None: all stations.
+    gridsize : INT, optional
+        The number of grid points in both directions. The default is 100.
+    returnGrid : BOOL, optional
+        If True, the grids are returned as one dictionary (see gridExport()) instead. The default is False.
+
+    Returns
+    -------
+    estimate : numpy ndarray
+        The estimated values, with shape (periods, grid y, grid x); NaN outside the area.
+    estimateavg : numpy ndarray
+        The estimated averages, with the same shape.
+    periods : Pandas DataFrame
+        The periods (YEAR and the period columns) of the first axis.
+    (x2d_d,y2d_d) : tuple of numpy ndarrays
+        The longitudes and latitudes of the grid.
+    or, if returnGrid is True:
+    grid : dictionary
+        The grids estimate and average with periods, coordinates, mask and metadata.
+
+    """
+    element = series.element
+    stationInfo = _pd.read_csv(_siPath).set_index(['STN_Name'])
+    table = series.get([element,element+'avg']).unstack('STN_Name')
+    stations = table[element].columns
+    coords = stationInfo.reindex(stations).get(['GEOGR1','GEOGR2'])
+    coords = coords[coords.notna().all(axis=1)].drop_duplicates(subset=['GEOGR1','GEOGR2'])
+    values = table[element][coords.index].values.T
+    valuesavg = table[element+'avg'][coords.index].values.T
+    periods = table.index.to_frame(index=False)
+
+    area = _areaShapes(region,adm2,adm3)
+    if area is None:
+        return
+    gpdshape,plotshape,areaname = area
+    gridinfo = _gridcalculate(gpdshape,areaname,gridsize)
+    gridshape = (len(gridinfo.x_d.unique()),len(gridinfo.y_d.unique()))
+    bool1d = _np.asarray(gridinfo.bool1d,dtype=bool)
+    gridxy = _np.column_stack([gridinfo.x_m.values,gridinfo.y_m.values])[bool1d]
+
+    import geopandas as gpd
+    statpoints = gpd.points_from_xy(coords.GEOGR1,coords.GEOGR2,crs='epsg:4326').to_crs(_metercrs)
+    stationxy = _np.column_stack([statpoints.x,statpoints.y])
+
+    # stations without data in a period get no weight in that period: estimate = W@(values, 0 if NaN) / W@(1 if data)
+    nona = _np.isfinite(values)
+    filled = _np.where(nona,values,0)
+    filledavg = _np.where(nona,valuesavg,0)
+    estimate1d = _np.full((len(bool1d),2*len(periods)),_np.nan)
+    with _np.errstate(invalid='ignore',divide='ignore'):
+        if (neighbours is None) or (neighbours>=len(stationxy)):
+            weights,order = _cachedIdwWeights((areaname,len(bool1d)),gridxy,stationxy,power)
+            denominator = weights@nona[order].astype(float)
+            estimate1d[bool1d] = (weights@_np.concatenate([filled[order],filledavg[order]],axis=1))/_np.tile(denominator,2)
+        else:
+            # the nearest stations with data: from a cached table of the nearest neighbours+(most missing) stations
+            nNearest = min(len(stationxy),neighbours+int((~nona).sum(axis=0).max()))
+            weights,idx = _cachedIdwNearest((areaname,len(bool1d)),gridxy,stationxy,power,nNearest)
+            blockSize = max(2**22//(len(gridxy)*nNearest),1)
+            for start in range(0,len(periods),blockSize):
+                block = slice(start,min(start+blockSize,len(periods)))
+                valid = nona[:,block].T[:,idx]
+                keep = valid&(_np.cumsum(valid,axis=2,dtype='int16')<=neighbours)
+                weightsBlock = weights[None]*keep
+                denominator = weightsBlock.sum(axis=2).T
+                estimate1d[bool1d,block] = _np.einsum('pnk,pnk->np',weightsBlock,filled[:,block].T[:,idx])/denominator
+                estimate1d[bool1d,len(periods)+block.start:len(periods)+block.stop] = _np.einsum('pnk,pnk->np',weightsBlock,filledavg[:,block].T[:,idx])/denominator
+
+    estimate = estimate1d[:,:len(periods)].T.reshape((len(periods),)+gridshape)
+    estimateavg = estimate1d[:,len(periods):].T.reshape((len(periods),)+gridshape)
+    x2d_d = _np.array(gridinfo.x_d).reshape(gridshape)
+    y2d_d = _np.array(gridinfo.y_d).reshape(gridshape)
+    print('IDW estimates calculated for '+str(len(periods))+' periods of '+element+' for '+areaname+'.')
+    if returnGrid:
+        metadata = _gridMetadata(series,areaname,gridsize,'idw')
+        metadata.update({'power':power,'neighbours':neighbours})
+        return _gridDict(x2d_d[0],y2d_d[:,0],bool1d.reshape(gridshape),{'estimate':estimate,'average':estimateavg},metadata,periods)
+    return estimate,estimateavg,periods,(x2d_d,y2d_d)
+
+def kriMany(series,region=None,adm2=None,adm3=None,krigingModel='gaussian',variogramParameters=None,neighbours=None,gridsize=100,returnGrid=False):
+    """
+    Ordinary kriging of all periods of a locDataSeries() result at once, on the grid of kriMap().
+    One variogram is used for all periods, and the kriging system is solved once per set of stations with data: the
+    kriging weights of the grid points are applied to all periods with one matrix product.
+
+    Parameters
+    ----------
+    series : Pandas DataFrame
+        A dataFrame returned by the function dFu.locDataSeries().
+    region, adm2, adm3 : None or STR, optional
+        The area, as in kriMap(). The default is None: Ethiopia.
+    krigingModel : str, optional
+        The variogram model, as in kriMap(). The default is 'gaussian'.
+    variogramParameters : None, list or dict, optional
+        A fixed variogram, as in kriMap(). If None, the variogram is fitted once to the station averages (over all
+        periods) of element+'avg'. The default is None.
+    neighbours : None or INT, optional
+        If provided, local kriging with the nearest neighbours stations per block of grid points, as in kriMap().
+        The default is None: all stations.
+    gridsize : INT, optional
+        The number of grid points in both directions. The default is 100.
+    returnGrid : BOOL, optional
+        If True, the grids are returned as one dictionary (see gridExport()) instead. The default is False.
+
+    Returns
+    -------
+    estimate : numpy ndarray
+        The estimated values, with shape (periods, grid y, grid x); NaN outside the area.
+    variance : numpy ndarray
+        The kriging variances of the estimates, with the same shape.
+    estimateavg : numpy ndarray
+        The estimated averages, with the same shape.
+    periods : Pandas DataFrame
+        The periods (YEAR and the period columns) of the first axis.
+    (x2d_d,y2d_d) : tuple of numpy ndarrays
+        The longitudes and latitudes of the grid.
+    or, if returnGrid is True:
+    grid : dictionary
+        The grids estimate, variance and average with periods, coordinates, mask and metadata.
+
+    """
+    element = series.element
+    stationInfo = _pd.read_csv(_siPath).set_index(['STN_Name'])
+    table = series.get([element,element+'avg']).unstack('STN_Name')
+    stations = table[element].columns
+    coords = stationInfo.reindex(stations).get(['GEOGR1','GEOGR2'])
+    coords = coords[coords.notna().all(axis=1)].drop_duplicates(subset=['GEOGR1','GEOGR2'])
+    values = table[element][coords.index].values.T
+    valuesavg = table[element+'avg'][coords.index].values.T
+    periods = table.index.to_frame(index=False)
+    stationxy = coords.values.astype(float)
+
+    area = _areaShapes(region,adm2,adm3)
+    if area is None:
+        return
+    gpdshape,plotshape,areaname = area
+    gridinfo = _gridcalculate(gpdshape,areaname,gridsize)
+    gridshape = (len(gridinfo.x_d.unique()),len(gridinfo.y_d.unique()))
+    bool1d = _np.asarray(gridinfo.bool1d,dtype=bool)
+    gridxy = _np.column_stack([gridinfo.x_d.values,gridinfo.y_d.values])[bool1d]
+
+    # one variogram per station set and element
+    meanavg = _np.nanmean(valuesavg,axis=1)
+    fitted = _np.isfinite(meanavg)
+    variogram = _variogram(stationxy[fitted],meanavg[fitted],krigingModel,variogramParameters)
+
+    # one kriging system per pattern of stations with data
+    nona = _np.isfinite(values)
+    uniques,inverse = _np.unique(nona.T,axis=0,return_inverse=True)
+    estimate1d = _np.full((len(bool1d),3*len(periods)),_np.nan)
+    for i in range(len(uniques)):
+        inPattern = uniques[i]
+        if inPattern.sum() < 2:
+            continue
+        periodNr = _np.flatnonzero(inverse.reshape(-1)==i)
+        weights,variance,order = _cachedKrigingWeights((areaname,len(bool1d)),gridxy,stationxy[inPattern],krigingModel,variogram,neighbours)
+        sub = _np.flatnonzero(inPattern)[order]
+        columns = _np.concatenate([periodNr,periodNr+2*len(periods)])
+        estimate1d[_np.ix_(bool1d,columns)] = weights@_np.concatenate([values[sub][:,periodNr],valuesavg[sub][:,periodNr]],axis=1)
+        estimate1d[_np.ix_(bool1d,periodNr+len(periods))] = variance[:,None]
+
+    estimate,variance,estimateavg = (estimate1d[:,j*len(periods):(j+1)*len(periods)].T.reshape((len(periods),)+gridshape) for j in range(3))
+    x2d_d = _np.array(gridinfo.x_d).reshape(gridshape)
+    y2d_d = _np.array(gridinfo.y_d).reshape(gridshape)
+    print('Kriging estimates calculated for '+str(len(periods))+' periods of '+element+' for '+areaname+' with '
+          +str(len(uniques))+' kriging system(s).')
+    if returnGrid:
+        metadata = _gridMetadata(series,areaname,gridsize,'kriging')
+        metadata.update({'krigingModel':krigingModel,'variogram':_variogramDict(krigingModel,variogram),'neighbours':neighbours})
+        return _gridDict(x2d_d[0],y2d_d[:,0],bool1d.reshape(gridshape),{'estimate':estimate,'variance':variance,'average':estimateavg},metadata,periods)
+    return estimate,variance,estimateavg,periods,(x2d_d,y2d_d)
+
+def _variogram(stationxy,values,krigingModel='gaussian',variogramParameters=None):
+    """
+    Returns the variogram parameters of pykrige.ok.OrdinaryKriging: the fixed variogramParameters (list or dict), or
+    fitted to the values at stationxy (longitude, latitude). Fits are cached with the weight matrices.
+    """
+    from pykrige.ok import OrdinaryKriging
+    stationxy = _np.asarray(stationxy,dtype=float)
+    values = _np.asarray(values,dtype=float)
+    if variogramParameters is not None:
+        OK = OrdinaryKriging(stationxy[:,0],stationxy[:,1],values,variogram_model=krigingModel,variogram_parameters=variogramParameters,
+                             verbose=False,enable_plotting=False)
+        return tuple(OK.variogram_model_parameters)
+    order = _np.lexsort((stationxy[:,1],stationxy[:,0]))
+    key = ('variogram',krigingModel,stationxy[order].round(6).tobytes(),values[order].tobytes())
+    if key in _weightCache:
+        _weightCache.move_to_end(key)
+        return _weightCache[key][0]
+    OK = OrdinaryKriging(stationxy[:,0],stationxy[:,1],values,variogram_model=krigingModel,verbose=False,enable_plotting=False)
+    parameters = tuple(OK.variogram_model_parameters)
+    _weightCacheAdd(key,parameters,len(key[2])+len(key[3]))
+    return parameters
+
+def _variogramDict(krigingModel,variogram):
+    """
+    Returns the variogram parameters of _variogram() (pykrige variogram_model_parameters) as dict with their names,
+    which pykrige.ok.OrdinaryKriging(variogram_parameters) reads back as the same variogram.
+    """
+    if krigingModel == 'linear':
+        names = ['slope','nugget']
+    elif krigingModel == 'power':
+        names = ['scale','exponent','nugget']
+    else:
+        names = ['psill','range','nugget']
+    return {name:float(value) for name,value in zip(names,variogram)}
+
+def _cachedKrigingWeights(gridKey,gridxy,stationxy,krigingModel,variogram,neighbours=None):
+    """
+    Returns the ordinary kriging weights (grid points x stations), the kriging variances of the grid points and the order
+    of the stations in the columns of the weights, as pykrige.ok.OrdinaryKriging computes them (exact at the stations).
+    The kriging matrix is factorized once and solved for all grid points. With neighbours, local kriging (see
+    _localKriging()) and the weights are a sparse csr_matrix. Cached as _cachedIdwWeights().
+    """
+    from pykrige.ok import OrdinaryKriging
+    from scipy.linalg import lu_factor,lu_solve
+    stationxy = _np.asarray(stationxy,dtype=float)
+    order = _np.lexsort((stationxy[:,1],stationxy[:,0]))
+    sortedxy = stationxy[order]
+    if (neighbours is not None) and (neighbours>=len(sortedxy)):
+        neighbours = None
+    key = (gridKey,'kriging',krigingModel,tuple(variogram),neighbours,sortedxy.round(6).tobytes())
+    if key in _weightCache:
+        _weightCache.move_to_end(key)
+        weights,variance = _weightCache[key][0]
+        return weights,variance,order
+
+    variogramFunction = OrdinaryKriging.variogram_dict[krigingModel]
+    if neighbours is not None:
+        weights,variance = _localKriging(_np.asarray(gridxy,dtype=float),sortedxy,variogramFunction,variogram,neighbours)
+        _weightCacheAdd(key,(weights,variance),weights.data.nbytes+weights.indices.nbytes+weights.indptr.nbytes+variance.nbytes)
+        return weights,variance,order
+    n = len(sortedxy)
+    a = _np.ones((n+1,n+1))
+    a[:n,:n] = -variogramFunction(variogram,_np.sqrt(_sqDistances(sortedxy,sortedxy)))
+    _np.fill_diagonal(a,0)
+    a[n,n] = 0
+    factorized = lu_factor(a)
+
+    distances = _np.sqrt(_sqDistances(_np.asarray(gridxy,dtype=float),sortedxy))
+    b = _np.ones((len(distances),n+1))
+    b[:,:n] = -variogramFunction(variogram,distances)
+    b[:,:n][distances<=1e-10] = 0
+    solution = lu_solve(factorized,b.T)
+    variance = (solution*-b.T).sum(axis=0)
+    weights = _np.ascontiguousarray(solution[:n].T)
+    _weightCacheAdd(key,(weights,variance),weights.nbytes+variance.nbytes)
+    return weights,variance,order
+
+def _localKriging(gridxy,stationxy,variogramFunction,variogram,neighbours,blockPoints=64):
+    """
+    Local (moving window) ordinary kriging: the grid points are divided in square blocks of about blockPoints points,
+    and each block is kriged with the neighbours stations nearest to its centre (KD-tree from scipy). The kriging systems
+    of all blocks are solved as one batch, split over threads (one per cpu). Returns the weights as sparse csr_matrix
+    (grid points x stations) and the kriging variances.
+    """
+    from scipy.sparse import csr_matrix
+    from concurrent.futures import ThreadPoolExecutor
+    import os
+    # blocks of neighbouring grid points
+    nTiles = max(int(_np.ceil(_np.sqrt(len(gridxy)/blockPoints))),1)
+    lower = gridxy.min(axis=0)
+    span = _np.maximum(gridxy.max(axis=0)-lower,1e-12)
+    tile = _np.minimum(((gridxy-lower)/span*nTiles).astype(int),nTiles-1)
+    blockNr = _np.unique(tile[:,0]*nTiles+tile[:,1],return_inverse=True)[1].reshape(-1)
+    pointOrder = _np.argsort(blockNr,kind='stable')
+    blockOf = blockNr[pointOrder]
+    counts = _np.bincount(blockOf)
+    starts = _np.concatenate([[0],_np.cumsum(counts)[:-1]])
+    position = _np.arange(len(blockOf))-starts[blockOf]
+    points = gridxy[pointOrder]
+    centres = _np.add.reduceat(points,starts,axis=0)/counts[:,None]
+
+    # the nearest stations of every block
+    if _find_spec('scipy') is not None:
+        from scipy.spatial import cKDTree
+        stationNr = cKDTree(stationxy).query(centres,k=neighbours)[1].reshape(len(centres),-1)
+    else:
+        stationNr = _np.argpartition(_sqDistances(centres,stationxy),neighbours-1,axis=1)[:,:neighbours]
+    blockxy = stationxy[stationNr]
+
+    # kriging matrices (blocks x neighbours+1 x neighbours+1) and right hand sides (blocks x neighbours+1 x block points)
+    n = neighbours
+    a = _np.ones((len(centres),n+1,n+1))
+    a[:,:n,:n] = -variogramFunction(variogram,_np.sqrt(((blockxy[:,:,None,:]-blockxy[:,None,:,:])**2).sum(axis=3)))
+    a[:,_np.arange(n),_np.arange(n)] = 0
+    a[:,n,n] = 0
+    distances = _np.sqrt(((points[:,None,:]-blockxy[blockOf])**2).sum(axis=2))
+    b = _np.ones((len(points),n+1))
+    b[:,:n] = -variogramFunction(variogram,distances)
+    b[:,:n][distances<=1e-10] = 0
+    rhs = _np.zeros((len(centres),n+1,counts.max()))
+    rhs[blockOf,:,position] = b
+
+    # batched solve, blocks split over threads
+    chunks = _np.array_split(_np.arange(len(centres)),min(os.cpu_count() or 1,len(centres)))
+    solution = _np.empty_like(rhs)
+    def solveChunk(chunk):
+        solution[chunk] = _np.linalg.solve(a[chunk],rhs[chunk])
+    if len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            list(executor.map(solveChunk,chunks))
+    else:
+        solveChunk(chunks[0])
+    pointSolution = solution[blockOf,:,position]
+
+    variance = _np.empty(len(points))
+    variance[pointOrder] = (pointSolution*-b).sum(axis=1)
+    rows = _np.repeat(pointOrder,n)
+    weights = csr_matrix((pointSolution[:,:n].ravel(),(rows,stationNr[blockOf].ravel())),shape=(len(points),len(stationxy)))
+    return weights,variance
+
+def gridExport(grid,filePath):
+    """
+    Exports a grid dictionary (from idwMap(), kriMap(), idwMany() or kriMany() with returnGrid=True) to file.
+    If filePath ends with .tif and the package rasterio is installed, every grid is written as compressed GeoTIFF
+    <filePath without .tif>_<grid>.tif (one band per period, EPSG:4326, NaN outside the area) together with
+    <..>_mask.tif; periods and metadata are stored as tags. Otherwise the dictionary is written as one compressed
+    .npz file. Reload with gridLoad().
+
+    Returns
+    -------
+    paths : list of STR
+        The written files.
+    """
+    import json
+    layers = grid['grids']
+    periods = grid.get('periods')
+    base = str(filePath)
+    if base.lower().endswith(('.tif','.tiff')) and (_find_spec('rasterio') is None):
+        print('Package rasterio is not installed. The grid is exported as .npz instead.')
+        base = base[:base.rfind('.')]+'.npz'
+    if base.lower().endswith(('.tif','.tiff')):
+        import rasterio
+        from rasterio.transform import from_origin
+        base = base[:base.rfind('.')]
+        x,y = grid['x'],grid['y']
+        dx,dy = x[1]-x[0],y[1]-y[0]
+        # north up: the first row is the northern most
+        transform = from_origin(x[0]-dx/2,y[-1]+dy/2,dx,dy)
+        tags = {'metadata':json.dumps(grid['metadata'])}
+        if periods is not None:
+            tags['periods'] = periods.to_json(orient='split',index=False)
+        paths = []
+        for name,values in list(layers.items())+[('mask',grid['mask'])]:
+            values = _np.asarray(values)
+            bands = values[None] if values.ndim==2 else values
+            dtype = 'uint8' if name=='mask' else 'float32'
+            layerPath = base+'_'+name+'.tif'
+            with rasterio.open(layerPath,'w',driver='GTiff',height=bands.shape[1],width=bands.shape[2],count=bands.shape[0],
+                               dtype=dtype,crs='EPSG:4326',transform=transform,compress='deflate',
+                               nodata=None if name=='mask' else _np.nan) as raster:
+                raster.write(bands[:,::-1,:].astype(dtype))
+                raster.update_tags(layer=name,**tags)
+            paths.append(layerPath)
+    else:
+        if base.lower().endswith('.npz')==False:
+            base += '.npz'
+        arrays = {'x':grid['x'],'y':grid['y'],'mask':grid['mask'],'metadata':_np.array(json.dumps(grid['metadata']))}
+        arrays.update({'grid_'+name:values for name,values in layers.items()})
+        if periods is not None:
+            arrays.update({'period_'+column:periods[column].values.astype(str if periods[column].dtype==object else periods[column].dtype) for column in periods.columns})
+        _np.savez_compressed(base,**arrays)
+        paths = [base]
+    print('Grid exported to '+', '.join(paths)+'.')
+    return paths
+
+def gridLoad(filePath):
+    """
+    Loads a grid dictionary exported with gridExport(): filePath is the .npz file, or the .tif path given to gridExport().
+    """
+    import json
+    base = str(filePath)
+    if base.lower().endswith(('.tif','.tiff')):
+        import glob
+        import rasterio
+        base = base[:base.rfind('.')]
+        grids = {}
+        for layerPath in sorted(glob.glob(base+'_*.tif')):
+            with rasterio.open(layerPath) as raster:
+                tags = raster.tags()
+                bands = raster.read()[:,::-1,:]
+                transform = raster.transform
+            grids[tags['layer']] = bands
+        mask = grids.pop('mask')[0].astype(bool)
+        first = next(iter(grids.values()))
+        x = transform.c+transform.a*(_np.arange(first.shape[2])+0.5)
+        y = transform.f+transform.e*(_np.arange(first.shape[1])+0.5)[::-1]
+        periods = _pd.read_json(tags['periods'],orient='split') if 'periods' in tags else None
+        if periods is None:
+            grids = {name:values[0] for name,values in grids.items()}
+        return _gridDict(x,y,mask,grids,json.loads(tags['metadata']),periods)
+    with _np.load(base) as data:
+        grids = {key[5:]:data[key] for key in data.files if key.startswith('grid_')}
+        periodColumns = {key[7:]:data[key] for key in data.files if key.startswith('period_')}
+        periods = _pd.DataFrame(periodColumns) if len(periodColumns)>0 else None
+        return _gridDict(data['x'],data['y'],data['mask'],grids,json.loads(str(data['metadata'])),periods)
+
+def _gridDict(x,y,mask,grids,metadata,periods=None):
+    """
+    Returns the grid dictionary of gridExport(): x (longitudes) and y (latitudes) of the grid columns and rows, mask
+    (grid points within the area), grids (name: array of shape (grid y, grid x), or (periods, grid y, grid x)),
+    periods (None or DataFrame) and metadata (dictionary).
+    """
+    return {'x':_np.asarray(x,dtype=float),'y':_np.asarray(y,dtype=float),'mask':_np.asarray(mask,dtype=bool),
+            'grids':grids,'periods':periods,'metadata':metadata}
+
+def _gridMetadata(df,areaname,gridsize,method):
+    """
+    Returns the metadata of a grid dictionary from the metadata of a locData() or locDataSeries() DataFrame.
+    """
+    metadata = {'area':areaname,'gridsize':gridsize,'method':method}
+    for attribute in ['element','long_name','unit','timeperiod','yearID','seasonID','monthID','dkID']:
+        value = getattr(df,attribute,None)
+        if value is not None:
+            metadata[attribute] = value.item() if hasattr(value,'item') else value
+    return metadata
+
+def zonalStats(grids,level=2,region=None,adm2=None,adm3=None,gridsize=100,threshold=None,periods=None):
+    """
+    Aggregates interpolated grids to the admin units of level within the area: per unit and grid the mean, minimum and
+    maximum of the grid values, the number of grid points with a value, and optionally the fraction below a threshold.
+    The grid points are labelled with their unit once per grid (see supportMap.gridlabels()); all grids are then
+    reduced at once per unit.
+
+    Parameters
+    ----------
+    grids : numpy ndarray
+        One grid (grid y, grid x) or a stack of grids (periods, grid y, grid x) of the area, for example the estimates
+        of idwMany() or kriMany(), or an anomaly calculated from them.
+    level : INT, optional
+        The admin level of the units: 1 (regions), 2 (zones) or 3 (districts). The default is 2.
+    region, adm2, adm3 : None or STR, optional
+        The area of the grids, as in idwMany(). The default is None: Ethiopia.
+    gridsize : INT, optional
+        The gridsize of the grids. The default is 100.
+    threshold : None or FLOAT, optional
+        If provided, the column fracBelow gives the fraction of the grid points of the unit with a value below threshold.
+        The default is None.
+    periods : None or Pandas DataFrame, optional
+        The periods of a stack of grids, as returned by idwMany() or kriMany(). If None, the grids are numbered (column 'grid').
+
+    Returns
+    -------
+    stats : Pandas DataFrame
+        Indexed by the period columns (for a stack of grids) and the unit name (admin1Name, admin2Name or admin3Name),
+        with columns mean, min, max, nGrid and optionally fracBelow.
+
+    """
+    area = _areaShapes(region,adm2,adm3)
+    if area is None:
+        return
+    gpdshape,plotshape,areaname = area
+    gridinfo = _gridcalculate(gpdshape,areaname,gridsize)
+    labels,names = _gridlabels(gridinfo,areaname,gridsize,level)
+    grids = _np.asarray(grids,dtype=float)
+    single = grids.ndim == 2
+    values = grids.reshape(-1,grids.shape[-2]*grids.shape[-1])
+    if values.shape[1] != len(labels):
+        print('The grids do not match the grid of '+areaname+' with gridsize '+str(gridsize)+'.')
+        return
+
+    # grid points sorted by unit: every unit is one segment, reduced for all grids at once
+    cells = _np.flatnonzero(labels>=0)
+    cells = cells[_np.argsort(labels[cells],kind='stable')]
+    starts = _np.flatnonzero(_np.diff(labels[cells],prepend=-1)!=0)
+    unitNames = names[labels[cells][starts]]
+    sortedValues = values[:,cells]
+    nona = _np.isfinite(sortedValues)
+    nGrid = _np.add.reduceat(nona,starts,axis=1)
+    with _np.errstate(invalid='ignore',divide='ignore'):
+        stats = {'mean':_np.add.reduceat(_np.where(nona,sortedValues,0),starts,axis=1)/nGrid,
+                 'min':_np.fmin.reduceat(sortedValues,starts,axis=1),
+                 'max':_np.fmax.reduceat(sortedValues,starts,axis=1),
+                 'nGrid':nGrid}
+        if threshold is not None:
+            stats['fracBelow'] = _np.add.reduceat(sortedValues<threshold,starts,axis=1)/nGrid
+    column = 'admin'+str(level)+'Name'
+    if single:
+        index = _pd.Index(unitNames,name=column)
+    else:
+        if periods is None:
+            periods = _pd.DataFrame({'grid':_np.arange(len(values))})
+        index = periods.loc[periods.index.repeat(len(starts))].reset_index(drop=True)
+        index[column] = _np.tile(unitNames,len(values))
+        index = _pd.MultiIndex.from_frame(index)
+    return _pd.DataFrame({name:stat.reshape(-1) for name,stat in stats.items()},index=index)
+
+def crossValidate(series,methods=['idw','linear','power','gaussian','spherical','exponential'],power=1,neighbours=None,
+                  variogramParameters=None,predictions=False):
+    """
+    Leave-one-out cross-validation of the interpolation methods of idwMap() and kriMap(): every station is predicted
+    from the other stations with data in the same period, for all stations and periods at once. For IDW the station
+    itself gets weight zero in the station x station weight matrix; for kriging the errors follow from the inverse
+    of the kriging matrix of all stations (z_i - estimate_i = (inverse @ z)_i / inverse_ii), one inverse per pattern
+    of stations with data.
+
+    Parameters
+    ----------
+    series : Pandas DataFrame
+        Output of dataFunctions.locDataSeries() (many periods) or dataFunctions.locData() (one period).
+    methods : list of STR, optional
+        'idw' and/or kriging models (the krigingModel options of kriMap()). The default is
+        ['idw','linear','power','gaussian','spherical','exponential'].
+    power : INT, optional
+        The power of IDW. The default is 1.
+    neighbours : None or INT, optional
+        If provided, IDW uses only the nearest neighbours stations with data, as idwMany(). Kriging always uses all
+        stations. The default is None.
+    variogramParameters : None, list or dict, optional
+        Fixed variogram parameters of the kriging models, as in kriMap(). The default is None: fitted per model, as in
+        kriMap() for one period and as in kriMany() for many periods.
+    predictions : BOOL, optional
+        If True, the leave-one-out predictions are returned as well. The default is False.
+
+    Returns
+    -------
+    stats : Pandas DataFrame
+        Indexed by method, with columns RMSE, MAE, bias (mean of prediction - observation) and n (number of predictions).
+    predictions : Pandas DataFrame, only if predictions is True
+        The predictions per method (columns), indexed as series.
+
+    """
+    from pykrige.ok import OrdinaryKriging
+    element = series.element
+    unknown = [method for method in methods if (method!='idw') and (method not in OrdinaryKriging.variogram_dict)]
+    if len(unknown) > 0:
+        print('The method(s) '+str(unknown)+' are not available. Please select from '+str(['idw']+list(OrdinaryKriging.variogram_dict)))
+        return
+    stationInfo = _pd.read_csv(_siPath).set_index(['STN_Name'])
+    single = series.index.nlevels == 1
+    if single:
+        series = _pd.concat({0:series.get([element,element+'avg'])},names=['period','STN_Name'])
+    table = series.get([element,element+'avg']).unstack('STN_Name')
+    stations = table[element].columns
+    coords = stationInfo.reindex(stations).get(['GEOGR1','GEOGR2'])
+    coords = coords[coords.notna().all(axis=1)].drop_duplicates(subset=['GEOGR1','GEOGR2'])
+    values = table[element][coords.index].values.T
+    valuesavg = table[element+'avg'][coords.index].values.T
+    nona = _np.isfinite(values)
+    filled = _np.where(nona,values,0)
+
+    estimates = {}
+    if 'idw' in methods:
+        import geopandas as gpd
+        statpoints = gpd.points_from_xy(coords.GEOGR1,coords.GEOGR2,crs='epsg:4326').to_crs(_metercrs)
+        stationxy = _np.column_stack([statpoints.x,statpoints.y])
+        sqDistances = _sqDistances(stationxy,stationxy)
+        # the station itself gets no weight
+        _np.fill_diagonal(sqDistances,_np.inf)
+        with _np.errstate(invalid='ignore',divide='ignore'):
+            if (neighbours is None) or (neighbours>=len(stationxy)-1):
+                weights = _idwWeights(sqDistances,power)
+                estimates['idw'] = (weights@filled)/(weights@nona.astype(float))
+            else:
+                idx = _np.argsort(sqDistances,axis=1)[:,:-1]
+                weights = _idwWeights(_np.take_along_axis(sqDistances,idx,axis=1),power)
+                estimate = _np.full(values.shape,_np.nan)
+                blockSize = max(2**22//idx.size,1)
+                for start in range(0,values.shape[1],blockSize):
+                    block = slice(start,min(start+blockSize,values.shape[1]))
+                    valid = nona[:,block].T[:,idx]
+                    keep = valid&(_np.cumsum(valid,axis=2,dtype='int16')<=neighbours)
+                    weightsBlock = weights[None]*keep
+                    estimate[:,block] = _np.einsum('pnk,pnk->np',weightsBlock,filled[:,block].T[:,idx])/weightsBlock.sum(axis=2).T
+                estimates['idw'] = estimate
+
+    krigingModels = [method for method in methods if method!='idw']
+    if len(krigingModels) > 0:
+        stationxy = coords.values.astype(float)
+        distances = _np.sqrt(_sqDistances(stationxy,stationxy))
+        uniques,inverse = _np.unique(nona.T,axis=0,return_inverse=True)
+        if single:
+            fitValues,fitted = values[:,0],nona[:,0]
+        else:
+            fitValues = _np.nanmean(valuesavg,axis=1)
+            fitted = _np.isfinite(fitValues)
+        for krigingModel in krigingModels:
+            variogram = _variogram(stationxy[fitted],fitValues[fitted],krigingModel,variogramParameters)
+            variogramFunction = OrdinaryKriging.variogram_dict[krigingModel]
+            estimate = _np.full(values.shape,_np.nan)
+            for i in range(len(uniques)):
+                inPattern = _np.flatnonzero(uniques[i])
+                n = len(inPattern)
+                if n < 3:
+                    continue
+                periodNr = _np.flatnonzero(inverse.reshape(-1)==i)
+                # the kriging matrix of kriMap() (pykrige): -variogram with zero diagonal, bordered by ones
+                a = _np.ones((n+1,n+1))
+                a[:n,:n] = -variogramFunction(variogram,distances[_np.ix_(inPattern,inPattern)])
+                _np.fill_diagonal(a,0)
+                a[n,n] = 0
+                ainv = _np.linalg.inv(a)
+                z = values[inPattern][:,periodNr]
+                estimate[_np.ix_(inPattern,periodNr)] = z-(ainv[:n,:n]@z)/_np.diag(ainv)[:n,None]
+            estimates[krigingModel] = estimate
+
+    rows = {}
+    for method in methods:
+        # only stations with data are validated
+        estimates[method] = _np.where(nona,estimates[method],_np.nan)
+        error = estimates[method]-values
+        error = error[_np.isfinite(error)]
+        rows[method] = {'RMSE':_np.sqrt(_np.mean(error**2)) if error.size>0 else _np.nan,
+                        'MAE':_np.mean(_np.abs(error)) if error.size>0 else _np.nan,
+                        'bias':_np.mean(error) if error.size>0 else _np.nan,'n':error.size}
+    stats = _pd.DataFrame.from_dict(rows,orient='index')
+    stats.index.name = 'method'
+    stats.element = element
+    if predictions == False:
+        return stats
+    predicted = _pd.DataFrame({method:_pd.DataFrame(estimates[method].T,index=table.index,columns=coords.index).stack(dropna=False)
+                               for method in methods})
+    predicted = predicted.reorder_levels(series.index.names).reindex(series.index)
+    if single:
+        predicted = predicted.droplevel('period')
+    return stats,predicted
+
+_weightCache = _OrderedDict()
+_weightCacheBytes = 512*2**20
+
+def clearWeightCache():
+    """
+    Removes all cached IDW and kriging weights and variogram fits.
+    """
+    _weightCache.clear()
+
+def _cachedIdwWeights(gridKey,gridxy,stationxy,power=1,neighbours=None):
+    """
+    Returns the (not normalized) IDW weight matrix of grid points x stations, and the order of the stations in its columns.
+    Weight matrices are cached in memory (least recently used are removed above 512 MB), keyed on gridKey
+    (area name and number of grid points), the sorted station coordinates, power and neighbours.
+    With neighbours and scipy installed, the matrix is a sparse csr_matrix.
+    """
+    stationxy = _np.asarray(stationxy,dtype=float)
+    order = _np.lexsort((stationxy[:,1],stationxy[:,0]))
+    sortedxy = stationxy[order]
+    if (neighbours is not None) and (neighbours>=len(sortedxy)):
+        neighbours = None
+    key = (gridKey,power,neighbours,sortedxy.round(3).tobytes())
+    if key in _weightCache:
+        _weightCache.move_to_end(key)
+        return _weightCache[key][0],order
+    
+    if neighbours is None:
+        weights = _idwWeights(_sqDistances(gridxy,sortedxy),power)
+        size = weights.nbytes
+    else:
+        if _find_spec('scipy') is not None:
+            from scipy.spatial import cKDTree
+            from scipy.sparse import csr_matrix
+            distances,idx = cKDTree(sortedxy).query(gridxy,k=neighbours)
+            distances,idx = distances.reshape(len(gridxy),-1),idx.reshape(len(gridxy),-1)
+            values = _idwWeights(distances**2,power)
+            weights = csr_matrix((values.ravel(),idx.ravel(),_np.arange(0,values.size+1,neighbours)),shape=(len(gridxy),len(sortedxy)))
+            size = weights.data.nbytes+weights.indices.nbytes+weights.indptr.nbytes
+        else:
+            sqDistances = _sqDistances(gridxy,sortedxy)
+            far = _np.argpartition(sqDistances,neighbours-1,axis=1)[:,neighbours:]
+            weights = _idwWeights(sqDistances,power)
+            _np.put_along_axis(weights,far,0,axis=1)
+            size = weights.nbytes
+    _weightCacheAdd(key,weights,size)
+    return weights,order
+
+def _cachedIdwNearest(gridKey,gridxy,stationxy,power=1,nNearest=1):
+    """
+    Returns the (not normalized) IDW weights of the nNearest stations of every grid point, and the station numbers,
+    both as arrays of shape grid points x nNearest, sorted from nearest to farthest. Cached as _cachedIdwWeights().
+    """
+    stationxy = _np.asarray(stationxy,dtype=float)
+    order = _np.lexsort((stationxy[:,1],stationxy[:,0]))
+    sortedxy = stationxy[order]
+    key = (gridKey,power,'nearest',nNearest,sortedxy.round(3).tobytes())
+    if key in _weightCache:
+        _weightCache.move_to_end(key)
+        weights,idx = _weightCache[key][0]
+        return weights,order[idx]
+    
+    if _find_spec('scipy') is not None:
+        from scipy.spatial import cKDTree
+        distances,idx = cKDTree(sortedxy).query(gridxy,k=nNearest)
+        sqDistances,idx = distances.reshape(len(gridxy),-1)**2,idx.reshape(len(gridxy),-1)
+    else:
+        sqDistances = _sqDistances(gridxy,sortedxy)
+        idx = _np.argsort(sqDistances,axis=1)[:,:nNearest]
+        sqDistances = _np.take_along_axis(sqDistances,idx,axis=1)
+    weights = _idwWeights(sqDistances,power)
+    _weightCacheAdd(key,(weights,idx),weights.nbytes+idx.nbytes)
+    return weights,order[idx]
+
+def _weightCacheAdd(key,entry,size):
+    """
+    Adds an entry to the weight cache and removes the least recently used entries above _weightCacheBytes.
+    """
+    _weightCache[key] = (entry,size)
+    total = sum(item[1] for item in _weightCache.values())
+    while (total > _weightCacheBytes) and (len(_weightCache) > 1):
+        oldKey,item = _weightCache.popitem(last=False)
+        total -= item[1]
+
+def _areaShapes(region=None,adm2=None,adm3=None):
+    """
+    Returns the shape of the selected area (adm3, adm2, region or else all of Ethiopia), the shapes to plot on the map
+    and the area name; or None if the name is not available.
+    """
+    if (adm3!=None):
+        gpdshape = _admUnits(adm3,3)
+        return None if gpdshape is None else (gpdshape,gpdshape,adm3)
+    elif (adm2!=None):
+        gpdshape = _admUnits(adm2,2)
+        return None if gpdshape is None else (gpdshape,_admUnits(adm2,2,3),adm2)
+    elif (region!=None):
+        gpdshape = _admUnits(region,1)
+        return None if gpdshape is None else (gpdshape,_admUnits(region,1,2),region)
+    else:
+        return _admLayer(0),_admLayer(1),'Ethiopia'
+
+def _sqDistances(pointsxy,stationxy):
+    """
+    Squared distances between points (n x 2) and stations (m x 2), as n x m array.
+    """
+    sqDistances = pointsxy[:,0,None]-stationxy[None,:,0]
+    sqDistances *= sqDistances
+    dy = pointsxy[:,1,None]-stationxy[None,:,1]
+    dy *= dy
+    sqDistances += dy
+    return sqDistances
+
+def _idwWeights(sqDistances,power=1):
+    """
+    Inverse distance weights (not normalized) from squared distances: 1/distance**power. A row with a zero distance
+    (a point at a station) only gets weight for the coinciding station(s). Overwrites sqDistances.
+    """
+    atStation = sqDistances==0
+    onStation = atStation.any(axis=1)
+    with _np.errstate(divide='ignore'):
+        if power == 1:
+            weights = _np.sqrt(sqDistances,out=sqDistances)
+            _np.reciprocal(weights,out=weights)
+        elif power == 2:
+            weights = _np.reciprocal(sqDistances,out=sqDistances)
+        else:
+            weights = _np.power(sqDistances,-power/2,out=sqDistances)
+    if onStation.any():
+        weights[onStation] = atStation[onStation]
+    return weights
+
 def stationDistr(dfLoc,savePath=None):
     """
 
@@ -359,7 +1109,7 @@ def stationDistr(dfLoc,savePath=None):
 
     fig,ax=_plt.subplots()
     ax.scatter(x,y,c='r',label='Stations',s=5)
-    _adm1_d.plot(ax=ax,facecolor='none')
+    _admLayer(1).plot(ax=ax,facecolor='none')
     ax.set_title('Stations with data for '+element+' in the period '+timeStr)
     ax.set_xlabel('longitude')
     ax.set_ylabel('latitude')
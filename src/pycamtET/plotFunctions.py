@@ -14,6 +14,7 @@ import matplotlib.pyplot as _plt
 import matplotlib.patches as _mpatches
 
 from pycamtET.support import _dayEmpty,_dkEmpty,_monthEmpty,_dkTicks,_monthTicks,_twoMonthEmpty,_twoMonthTicks,_colorDict
+from pycamtET.supportCalendar import _seasonMonths,_monthSeasonyear
 from pycamtET.support import saveCheck as _saveCheck,vecAvg as _vecAvg
 
 from pycamtET.pckgSettings import getSettings as _getSettings
@@ -554,13 +555,8 @@ def cumulativeRF(dekadf,year,season=None,savePath=None):
             return
         else:
             df = dekadf.copy()
-            df.loc[df.MONTH==1,'YEAR'] = df.YEAR[df.MONTH==1]-1
-            if season=='Bega':
-                seasonlist = [1,10,11,12]
-            elif season == 'Belg':
-                seasonlist = [2,3,4,5]
-            else:
-                seasonlist = [6,7,8,9]    
+            df.loc[:,'YEAR'] = df.YEAR.values+_monthSeasonyear[df.MONTH.values]
+            seasonlist = _seasonMonths[season]
     else: #situation: only year provided
         seasonlist = [1,2,3,4,5,6,7,8,9,10,11,12]
     
@@ -635,12 +631,7 @@ def cumulativeRFday(daydf,year,season=None,savePath=None):
         else:
             df = daydf.copy()
             df.loc[:,'YEAR']=df.seasonyear
-            if season=='Bega':
-                seasonlist = [1,10,11,12]
-            elif season == 'Belg':
-                seasonlist = [2,3,4,5]
-            else:
-                seasonlist = [6,7,8,9]  
+            seasonlist = _seasonMonths[season]
             timeStr = str(year)+' '+season
     else: #situation: only year provided
         seasonlist = [1,2,3,4,5,6,7,8,9,10,11,12]
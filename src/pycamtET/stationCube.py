@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+Dense station x element x day data model, as alternative to the long-format DataFrame of dataFunctions.dataLoad().
+
+@author: jandirk
+"""
+import numpy as _np
+import pandas as _pd
+
+from pycamtET.support import _long_names
+from pycamtET.supportCalendar import dayCalendar as _dayCalendar,dayNumbers as _dayNumbers,_seasons,_monthSeasonNr
+
+# number of values that StationCube.reduce() reads at once
+_chunkValues = 2**24
+
+class StationCube:
+    """
+    Daily data of all stations and elements in one float32 array of shape (stations, elements, days).
+
+    Attributes
+    ----------
+    data : numpy ndarray (float32)
+        The daily values; NaN where there is no data. Can be a read-only memory map (see load()).
+    stations : list of STR
+        Station names, in the order of the first axis of data.
+    elements : list of STR
+        Element names, in the order of the second axis of data.
+    dates : pandas DatetimeIndex
+        The dates of the third axis of data.
+    bounds : None or numpy ndarray (int64)
+        Per station and element the first and last day number (position on the third axis) of its rows in the data the
+        cube was created from, including rows without a value; -1 if there are none. Shape (stations, elements, 2).
+        None for cubes saved without bounds.
+
+    Create a StationCube with StationCube.fromFrame(dataFrame) or StationCube.load(path).
+    """
+    def __init__(self,data,stations,elements,startDate,bounds=None):
+        self.data = data
+        self.bounds = bounds
+        self.stations = list(stations)
+        self.elements = list(elements)
+        self.dates = _pd.date_range(startDate,periods=data.shape[2],freq='D')
+        self.stationIndex = {name:i for i,name in enumerate(self.stations)}
+        self.elementIndex = {name:i for i,name in enumerate(self.elements)}
+
+    def __repr__(self):
+        return ('StationCube: '+str(len(self.stations))+' stations, '+str(len(self.elements))+' elements ('+', '.join(self.elements)+'), '
+                +str(len(self.dates))+' days ('+str(self.dates[0].date())+' to '+str(self.dates[-1].date())+')')
+
+    @classmethod
+    def fromFrame(cls,dataFrame):
+        """
+        Creates a StationCube from a DataFrame that results from dataLoad(). Multiple values of a station-element on
+        the same day are averaged. If PRECIP is present, the element RD (rainy day: more than 1 mm) is added, as in locSelect().
+        """
+        df = dataFrame
+        stnCodes,stations = _pd.factorize(df.STN_Name,sort=True)
+        elCodes,elements = _pd.factorize(df.EG_EL,sort=True)
+        if 'date' in df.columns:
+            dayNr = df.date.values.astype('datetime64[D]').astype('int64')
+        else:
+            dayNr = df.dateTime.values.astype('datetime64[D]').astype('int64')
+        start = dayNr.min()
+        dayCodes = dayNr-start
+        shape = (len(stations),len(elements),int(dayCodes.max())+1)
+
+        value = df.value.values.astype(float)
+        # the period of every station-element, rows without a value included (as locSelect() uses it)
+        hasRow = (stnCodes>=0)&(elCodes>=0)
+        pairs = _pd.DataFrame({'pair':stnCodes[hasRow]*shape[1]+elCodes[hasRow],'day':dayCodes[hasRow]}).groupby('pair').day.agg(['min','max'])
+        bounds = _np.full((shape[0]*shape[1],2),-1,dtype='int64')
+        bounds[pairs.index.values] = pairs.values
+        bounds = bounds.reshape(shape[0],shape[1],2)
+        valid = hasRow&_np.isfinite(value)
+        flat = _np.ravel_multi_index((stnCodes[valid],elCodes[valid],dayCodes[valid]),shape)
+        size = shape[0]*shape[1]*shape[2]
+        sums = _np.bincount(flat,weights=value[valid],minlength=size)
+        counts = _np.bincount(flat,minlength=size)
+        with _np.errstate(invalid='ignore',divide='ignore'):
+            data = (sums/counts).astype('float32').reshape(shape)
+        elements = list(elements)
+
+        if 'PRECIP' in elements:
+            precip = data[:,elements.index('PRECIP')]
+            rd = _np.where(precip>1,1,_np.where(precip>-1,0,_np.nan)).astype('float32')
+            data = _np.concatenate([data,rd[:,None,:]],axis=1)
+            bounds = _np.concatenate([bounds,bounds[:,elements.index('PRECIP'),None]],axis=1)
+            elements.append('RD')
+
+        return cls(data,stations,elements,_np.datetime64(int(start),'D'),bounds)
+
+    def select(self,stationName,element=None):
+        """
+        Returns the daily values of one station, as array of shape (elements, days), or of shape (days,) if element is given.
+        The array is a view on the cube, no data is copied.
+        """
+        stationName = stationName.title()
+        if stationName not in self.stationIndex:
+            print('The provided stationName is not found in the StationCube.')
+            return
+        if element is None:
+            return self.data[self.stationIndex[stationName]]
+        if element not in self.elementIndex:
+            print('The provided element is not found in the StationCube. Available elements are: '+str(self.elements))
+            return
+        return self.data[self.stationIndex[stationName],self.elementIndex[element]]
+
+    def periods(self,timeperiod):
+        """
+        Returns the periods of timeperiod ('day','dekadal','month','season' or 'year') covered by the cube, as DataFrame with
+        the period columns (YEAR, MONTH, dk, season), the first day number (start) and number of days in the cube (periodDays).
+        For season, YEAR holds the seasonyear.
+        """
+        dates = self.dates
+        cal = _dayCalendar(_dayNumbers(dates))
+        year = cal['YEAR']
+        if timeperiod == 'day':
+            key = _np.arange(len(dates))
+        elif timeperiod == 'dekadal':
+            key = year*36+cal['dkYear']
+        elif timeperiod == 'month':
+            key = year*12+cal['MONTH']
+        elif timeperiod == 'season':
+            # Bega (Oct-Jan), Belg (Feb-May), Kiremt (Jun-Sep) are consecutive blocks of days
+            key = cal['seasonyear']*4+_monthSeasonNr[cal['MONTH']]
+        elif timeperiod == 'year':
+            key = year
+        else:
+            print('The provided timeperiod \''+str(timeperiod)+'\' is not one of the options.\n',
+                  'Please select one of the following '+str(['year','season','month','dekadal','day']))
+            return
+        start = _np.flatnonzero(_np.diff(key,prepend=key[0]-1)!=0)
+        periods = _pd.DataFrame({'YEAR':year[start],'MONTH':cal['MONTH'][start]})
+        if timeperiod == 'day':
+            periods['day'] = cal['day'][start]
+        elif timeperiod == 'dekadal':
+            periods['dk'] = cal['dk'][start]
+        elif timeperiod == 'season':
+            periods['YEAR'] = cal['seasonyear'][start]
+            periods['season'] = _np.array(_seasons)[cal['seasonCode'][start]]
+            periods = periods.drop(columns=['MONTH'])
+        elif timeperiod == 'year':
+            periods = periods.drop(columns=['MONTH'])
+        periods['start'] = start
+        periods['periodDays'] = _np.diff(_np.append(start,len(dates)))
+        return periods
+
+    def reduce(self,timeperiod,how='auto'):
+        """
+        Aggregates the daily values to all periods of timeperiod ('dekadal','month','season' or 'year'), vectorized over chunks
+        of whole periods. A memory-mapped cube is read chunk by chunk, not loaded as a whole.
+
+        Parameters
+        ----------
+        timeperiod : STR
+            Options: 'day','dekadal','month','season' or 'year'.
+        how : STR, 'auto', 'sum' or 'mean', optional
+            If auto: the sum for PRECIP and RD, the average for other elements. The default is 'auto'.
+
+        Returns
+        -------
+        values : numpy ndarray of shape (stations, elements, periods)
+            The period values.
+        counts : numpy ndarray of shape (stations, elements, periods)
+            The number of days with data in every period.
+        periods : pandas DataFrame
+            The periods, see StationCube.periods().
+        """
+        periods = self.periods(timeperiod)
+        if periods is None:
+            return
+        start = periods.start.values
+        end = _np.append(start[1:],len(self.dates))
+        sums = _np.zeros(self.data.shape[:2]+(len(start),))
+        counts = _np.zeros(self.data.shape[:2]+(len(start),),dtype='int32')
+        # whole periods in chunks of about _chunkValues values, so a memory-mapped cube is read part by part
+        chunkDays = max(1,_chunkValues//max(1,self.data.shape[0]*self.data.shape[1]))
+        first = 0
+        while first < len(start):
+            last = max(first+1,int(_np.searchsorted(end,start[first]+chunkDays,side='right')))
+            chunk = _np.asarray(self.data[:,:,start[first]:end[last-1]])
+            nona = _np.isfinite(chunk)
+            offsets = start[first:last]-start[first]
+            sums[:,:,first:last] = _np.add.reduceat(_np.where(nona,chunk,0),offsets,axis=2,dtype=float)
+            counts[:,:,first:last] = _np.add.reduceat(nona,offsets,axis=2,dtype='int32')
+            first = last
+        with _np.errstate(invalid='ignore',divide='ignore'):
+            means = sums/counts
+        if how == 'sum':
+            values = sums
+        elif how == 'mean':
+            values = means
+        elif how == 'auto':
+            isSum = _np.isin(self.elements,['PRECIP','RD'])
+            values = _np.where(isSum[None,:,None],sums,means)
+        else:
+            print('how not clear. Please select \'auto\', \'sum\' or \'mean\'')
+            return
+        return values,counts,periods
+
+    def toFrame(self,element,timeperiod='day'):
+        """
+        Returns the (period) values of one element for all stations as DataFrame, with the periods as rows and the stations as columns.
+        """
+        if element not in self.elementIndex:
+            print('The provided element is not found in the StationCube. Available elements are: '+str(self.elements))
+            return
+        values,counts,periods = self.reduce(timeperiod)
+        index = _pd.MultiIndex.from_frame(periods.drop(columns=['start','periodDays']))
+        df = _pd.DataFrame(values[:,self.elementIndex[element],:].T,index=index,columns=self.stations)
+        df.element = element
+        df.long_name = _long_names.get(element,element)
+        return df
+
+    def save(self,path):
+        """
+        Saves the cube to a folder (created if needed), as data.npy with the array and index.json with the station names,
+        elements, start date and bounds. Load it with StationCube.load(path).
+        """
+        import json
+        from pathlib import Path
+        folder = Path(path)
+        if folder.exists()==False:
+            folder.mkdir(parents=True)
+        _np.save(folder/'data.npy',_np.asarray(self.data))
+        index = {'stations':self.stations,'elements':self.elements,'startDate':str(self.dates[0].date())}
+        if self.bounds is not None:
+            index['bounds'] = _np.asarray(self.bounds).tolist()
+        with open(folder/'index.json','w') as handler:
+            json.dump(index,handler)
+        print('StationCube saved to '+str(folder))
+
+    @classmethod
+    def load(cls,path,mmap=True):
+        """
+        Loads a cube saved with StationCube.save(). If mmap is True (default), the data is memory-mapped read-only:
+        only the parts that are used are read from disk.
+        """
+        import json
+        from pathlib import Path
+        folder = Path(path)
+        if (folder/'data.npy').exists()==False:
+            print('No StationCube found at '+str(folder))
+            return
+        with open(folder/'index.json','r') as handler:
+            index = json.load(handler)
+        data = _np.load(folder/'data.npy',mmap_mode='r' if mmap else None)
+        bounds = _np.array(index['bounds'],dtype='int64') if 'bounds' in index else None
+        return cls(data,index['stations'],index['elements'],_np.datetime64(index['startDate'],'D'),bounds)
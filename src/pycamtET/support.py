@@ -2,6 +2,7 @@
 import pandas as pd
 import numpy as np
 from os import path
+from collections import OrderedDict
 
 from pycamtET.pckgSettings import getSettings
 setDict = getSettings()
@@ -84,6 +85,9 @@ def vecAvg(ws,wdir):
     return ws_avg,wdir_avg
 
 def stationInfo(filePath,updateAll=False):
+    """
+    Adds the station info (name, ID, location and elevation) of the stations in a datafile, or in a list of datafiles, to pckgsdataPath/stationInfo.csv.
+    """
     from pycamtET.pckgSettings import getSettings
     from pandas import read_csv
     from pathlib import Path
@@ -91,11 +95,12 @@ def stationInfo(filePath,updateAll=False):
     if type(updateAll)!=bool:
         print('Please only provide a boolean True or False for updateAll.')
         return
-    if Path(filePath).exists()==False:
-        print('Please provide a valid filepath.')
-        return
-    df = read_csv(filePath,usecols=[0,1,2,3,4])
-    df = df.set_axis(labels=['STN_Name','EG_GH_ID','GEOGR2','GEOGR1','ELEVATION'],axis=1)
+    filePaths = filePath if isinstance(filePath,(list,tuple)) else [filePath]
+    for fp in filePaths:
+        if Path(fp).exists()==False:
+            print('Please provide a valid filepath.')
+            return
+    df = pd.concat([read_csv(fp,usecols=[0,1,2,3,4]).set_axis(labels=['STN_Name','EG_GH_ID','GEOGR2','GEOGR1','ELEVATION'],axis=1) for fp in filePaths],ignore_index=True)
     df.loc[:,'STN_Name'] = df.STN_Name.str.title().str.strip()
     si = df.drop_duplicates(subset=['STN_Name'],ignore_index=True)
     
@@ -130,9 +135,239 @@ def stationInfo(filePath,updateAll=False):
     return siAll
 
 def rmGridData():
-    from pckgSettings import getSettings
+    from pycamtET.pckgSettings import getSettings
     from shutil import rmtree
     from pathlib import Path
     gridpath = getSettings()['pckgsdataPath']+'/griddata'
     if Path(gridpath).exists():
-        rmtree(gridpath)
\ No newline at end of file
+        rmtree(gridpath)
+
+### cache for dataFunctions.dataLoad
+def fileFingerprint(filePath):
+    """
+    Returns a dictionary with the resolved path, the size, the modification time and a content hash (blake2b) of the file at filePath.
+    """
+    from pathlib import Path
+    from hashlib import blake2b
+    p = Path(filePath).resolve()
+    stat = p.stat()
+    h = blake2b(digest_size=16)
+    with open(p,'rb') as handler:
+        for block in iter(lambda: handler.read(2**20),b''):
+            h.update(block)
+    return {'path':str(p),'size':stat.st_size,'mtime':stat.st_mtime,'hash':h.hexdigest()}
+
+def _cacheFile(cacheName):
+    from pathlib import Path
+    from hashlib import sha1
+    cacheDir = Path(getSettings()['pckgsdataPath'])/'datacache'
+    return cacheDir/(sha1(cacheName.encode()).hexdigest()+'.npz')
+
+def cacheSave(df,cacheName,meta=None,compress=True):
+    """
+    Stores a DataFrame column by column as a (compressed) .npz file under pckgsdataPath/datacache.
+    Object columns are stored as integer codes plus their unique values, categorical columns as codes plus categories.
+    Argument meta is a JSON-serializable dictionary (for example a fileFingerprint) stored next to the data.
+    """
+    import json
+    cachePath = _cacheFile(cacheName)
+    if cachePath.parent.exists()==False:
+        cachePath.parent.mkdir()
+    arrays = {}
+    columns = []
+    for i,col in enumerate(df.columns):
+        s = df[col]
+        key = 'c'+str(i)
+        if isinstance(s.dtype,pd.CategoricalDtype):
+            arrays[key+'codes'] = s.cat.codes.values
+            arrays[key+'uniques'] = np.array(s.cat.categories.to_list())
+            columns.append([col,'category',bool(s.cat.ordered)])
+        elif s.dtype == object:
+            codes,uniques = pd.factorize(np.asarray(s))
+            arrays[key+'codes'] = codes
+            arrays[key+'uniques'] = np.array(uniques.tolist())
+            columns.append([col,'object',None])
+        else:
+            arrays[key] = s.values
+            columns.append([col,'array',None])
+    arrays['meta'] = np.array(json.dumps({'cacheName':cacheName,'columns':columns,'meta':meta}))
+    if compress:
+        np.savez_compressed(cachePath,**arrays)
+    else:
+        np.savez(cachePath,**arrays)
+    return cachePath
+
+def cacheMeta(cacheName):
+    """
+    Returns the meta dictionary stored with cacheName, or None if there is no cache.
+    """
+    import json
+    cachePath = _cacheFile(cacheName)
+    if cachePath.exists()==False:
+        return None
+    with np.load(cachePath) as npz:
+        return json.loads(str(npz['meta']))['meta']
+
+def cacheLoad(cacheName,categorical=False):
+    """
+    Reads a DataFrame stored with cacheSave(). Returns None if there is no cache for cacheName.
+    If categorical is True, object columns are returned as categorical columns (without converting the stored codes).
+    """
+    import json
+    cachePath = _cacheFile(cacheName)
+    if cachePath.exists()==False:
+        return None
+    data = {}
+    with np.load(cachePath) as npz:
+        columns = json.loads(str(npz['meta']))['columns']
+        for i,(col,kind,ordered) in enumerate(columns):
+            key = 'c'+str(i)
+            if kind == 'category':
+                data[col] = pd.Categorical.from_codes(npz[key+'codes'],categories=npz[key+'uniques'],ordered=ordered)
+            elif (kind == 'object') and categorical:
+                data[col] = pd.Categorical.from_codes(npz[key+'codes'],categories=npz[key+'uniques'])
+            elif kind == 'object':
+                codes = npz[key+'codes']
+                values = np.full(codes.size,np.nan,dtype=object)
+                values[codes>=0] = npz[key+'uniques'].astype(object)[codes[codes>=0]]
+                data[col] = values
+            else:
+                data[col] = npz[key]
+    return pd.DataFrame(data)
+
+def rmDataCache():
+    from shutil import rmtree
+    from pathlib import Path
+    cachepath = getSettings()['pckgsdataPath']+'/datacache'
+    if Path(cachepath).exists():
+        rmtree(cachepath)
+
+### memoization of dataFunctions results
+_memoSettings = {'enabled':False,'maxBytes':256*2**20}
+_memoStats = {'hits':0,'misses':0,'evictions':0}
+_memoResults = OrderedDict()
+_memoMetadata = ['element','long_name','unit','dimension','stationName','timeperiod','yearID','seasonID','monthID','dkID','filePath']
+
+def memoSettings(enabled=None,maxBytes=None):
+    """
+    Switches the memoization of dataFunctions results (locSelect, timeData, timeDataPanel and locData) on or off, and sets
+    the memory budget in bytes. Results that do not fit the budget are evicted, least recently used first.
+    Returns the current settings.
+    """
+    if enabled is not None:
+        _memoSettings['enabled'] = bool(enabled)
+        if enabled == False:
+            memoClear()
+    if maxBytes is not None:
+        _memoSettings['maxBytes'] = int(maxBytes)
+        _memoEvict()
+    return dict(_memoSettings)
+
+def memoStats():
+    """
+    Returns the number of hits, misses and evictions of the memoization, and the number and total size of the stored results.
+    """
+    return dict(_memoStats,entries=len(_memoResults),bytes=sum(entry[3] for entry in _memoResults.values()))
+
+def memoClear():
+    """
+    Removes all memoized results and resets the statistics.
+    """
+    _memoResults.clear()
+    _memoStats.update({'hits':0,'misses':0,'evictions':0})
+
+def _memoEvict():
+    total = sum(entry[3] for entry in _memoResults.values())
+    while (total > _memoSettings['maxBytes']) and (len(_memoResults) > 0):
+        key,entry = _memoResults.popitem(last=False)
+        total -= entry[3]
+        _memoStats['evictions'] += 1
+
+def frameFingerprint(df):
+    """
+    Returns a fingerprint of a DataFrame: its shape, columns, dtypes, metadata (such as stationName) and a hash
+    of every row including the index. Any change of a value gives a different fingerprint.
+    """
+    from hashlib import blake2b
+    h = blake2b(digest_size=16)
+    h.update(repr((df.shape,df.columns.to_list(),[str(dtype) for dtype in df.dtypes],
+                   [getattr(df,key,None) for key in _memoMetadata])).encode())
+    if len(df)>0:
+        h.update(pd.util.hash_pandas_object(df,index=True).values.tobytes())
+    return h.hexdigest()
+
+def memoize(func):
+    """
+    Decorator for dataFunctions that take and return DataFrames. If memoization is switched on (see memoSettings()), the result
+    is stored with a key of the function name, the fingerprints of the DataFrame arguments and the other arguments. A repeated
+    call returns a copy of the stored result with its metadata, and repeats the messages printed by the first call.
+    """
+    from functools import wraps
+    from inspect import signature
+    from contextlib import redirect_stdout
+    from io import StringIO
+    sig = signature(func)
+
+    @wraps(func)
+    def wrapper(*args,**kwargs):
+        if _memoSettings['enabled']==False:
+            return func(*args,**kwargs)
+        bound = sig.bind(*args,**kwargs)
+        bound.apply_defaults()
+        try:
+            key = (func.__name__,)+tuple((name,_memoArg(value)) for name,value in bound.arguments.items())
+        except TypeError:
+            # arguments without a reliable key (such as a StationCube) are not memoized
+            return func(*args,**kwargs)
+        if key in _memoResults:
+            _memoStats['hits'] += 1
+            _memoResults.move_to_end(key)
+            result,metadata,printed,size = _memoResults[key]
+            print(printed,end='')
+            return _memoCopy(result,metadata)
+        _memoStats['misses'] += 1
+        printed = StringIO()
+        with redirect_stdout(printed):
+            result = func(*args,**kwargs)
+        print(printed.getvalue(),end='')
+        if isinstance(result,pd.DataFrame):
+            metadata = {key:getattr(result,key) for key in _memoMetadata if key in result.__dict__}
+            size = int(result.memory_usage(deep=True).sum())
+            if size <= _memoSettings['maxBytes']:
+                _memoResults[key] = (_memoCopy(result,metadata),metadata,printed.getvalue(),size)
+                _memoEvict()
+        return result
+    return wrapper
+
+def _memoArg(value):
+    if isinstance(value,pd.DataFrame):
+        return frameFingerprint(value)
+    if isinstance(value,(list,tuple)):
+        return tuple(_memoArg(v) for v in value)
+    if (value is None) or isinstance(value,(str,int,float,bool,np.integer,np.floating)):
+        return repr(value)
+    raise TypeError('no memoization key for '+str(type(value)))
+
+def _memoCopy(df,metadata):
+    dfCopy = df.copy()
+    for key,value in metadata.items():
+        setattr(dfCopy,key,value)
+    return dfCopy
+
+### import time
+def importBenchmark(modules=['pycamtET','pycamtET.mapFunctions'],repeat=5):
+    """
+    Measures cold import times: every import is timed in a new python process.
+    Returns a DataFrame with per module the median, minimum and maximum import time in seconds.
+    """
+    import subprocess
+    import sys
+    code = 'import time;t=time.perf_counter();import {};print(time.perf_counter()-t)'
+    times = {}
+    for module in modules:
+        times[module] = []
+        for i in range(repeat):
+            result = subprocess.run([sys.executable,'-c',code.format(module)],capture_output=True,text=True,check=True)
+            times[module].append(float(result.stdout.strip().split('\n')[-1]))
+    times = pd.DataFrame(times)
+    return pd.DataFrame({'median':times.median(),'min':times.min(),'max':times.max()})
\ No newline at end of file
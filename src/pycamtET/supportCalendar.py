@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Calendar lookup tables for the periods used in pycamtET: dekads (1-3 per month, 1-36 per year), months and the
+Ethiopian seasons Bega (Oct-Jan), Belg (Feb-May) and Kiremt (Jun-Sep), with the seasonyear (January belongs to the
+Bega of the previous year). All tables are made once at import; period arithmetic is done by indexing them.
+"""
+import numpy as np
+
+### season codes
+# code of a season is its position in the (ordered) season categories of dataLoad
+_seasons = ['Bega','Belg','Kiremt']
+_seasonMonths = {'Bega':[1,10,11,12],'Belg':[2,3,4,5],'Kiremt':[6,7,8,9]}
+# per month (index 1-12; index 0 is not used)
+_monthSeason = np.array([0,0,1,1,1,1,2,2,2,2,0,0,0],dtype='int8')
+# number of the season in the seasonyear: Belg 1, Kiremt 2, Bega 3
+_monthSeasonNr = np.array([0,3,1,1,1,1,2,2,2,2,3,3,3],dtype='int8')
+# seasonyear minus year
+_monthSeasonyear = np.array([0,-1,0,0,0,0,0,0,0,0,0,0,0],dtype='int8')
+# dekad of the month (1-3) per day of the month (index 1-31)
+_dayDk = np.array([0]+[1]*10+[2]*10+[3]*11,dtype='int8')
+
+### period lengths, per leap year (index 0: no leap year, 1: leap year)
+_monthDays = np.array([[0,31,28,31,30,31,30,31,31,30,31,30,31],
+                       [0,31,29,31,30,31,30,31,31,30,31,30,31]],dtype='int16')
+# per dekad of the year (index 1-36)
+_dekadDays = np.concatenate([[[0],[0]],np.where(np.arange(36)%3<2,10,np.repeat(_monthDays[:,1:],3,axis=1)-20)],axis=1).astype('int16')
+# per season code; leap year of the seasonyear (February is in Belg)
+_seasonDays = np.array([[31*3+30,28+2*31+30,30*2+31*2],
+                        [31*3+30,29+2*31+30,30*2+31*2]],dtype='int16')
+_yearDays = np.array([365,366],dtype='int16')
+
+### day tables
+# per day of the year (index 0-365), per leap year
+_doyMonth = np.array([np.repeat(np.arange(1,13),_monthDays[leap,1:]).tolist()+[0]*(1-leap) for leap in [0,1]],dtype='int8')
+_doyDay = np.array([np.concatenate([np.arange(1,n+1) for n in _monthDays[leap,1:]]).tolist()+[0]*(1-leap) for leap in [0,1]],dtype='int8')
+
+# per day from 1800-01-01 to 2200-12-31: year and day of the year
+_firstYear,_lastYear = 1800,2200
+_firstDay = (np.datetime64(str(_firstYear),'D')-np.datetime64('1970-01-01','D')).astype('int64')
+_years = np.arange(_firstYear,_lastYear+1)
+_yearLeap = ((_years%4==0)&((_years%100!=0)|(_years%400==0))).astype('int8')
+_dayYear = np.repeat(_years,_yearDays[_yearLeap]).astype('int16')
+_dayDoy = np.concatenate([np.arange(n) for n in _yearDays[_yearLeap]]).astype('int16')
+
+def isLeap(year):
+    """
+    Returns 1 for leap years and 0 for other years (array of years or single year).
+    """
+    year = np.asarray(year)
+    return ((year%4==0)&((year%100!=0)|(year%400==0))).astype('int8')
+
+def dayNumbers(dates):
+    """
+    Returns the day numbers (days since 1970-01-01, int64) of an array of dates (datetime64 or DatetimeIndex).
+    """
+    return np.asarray(dates).astype('datetime64[D]').astype('int64')
+
+def dayCalendar(dayNr):
+    """
+    Returns the calendar of an array of day numbers (days since 1970-01-01, see dayNumbers()), as dictionary of arrays:
+    YEAR, MONTH, day, dk (1-3), dkYear (dekad of the year, 1-36), seasonCode (0 Bega, 1 Belg, 2 Kiremt) and seasonyear.
+    """
+    dayNr = np.asarray(dayNr,dtype='int64')
+    i = dayNr-_firstDay
+    if (i.size>0) and ((i.min()<0) or (i.max()>=len(_dayYear))):
+        # outside the tables: year and day of the year from datetime64
+        year = dayNr.astype('datetime64[D]').astype('datetime64[Y]').astype('int64')+1970
+        doy = dayNr-year.astype(str).astype('datetime64[D]').astype('int64')
+    else:
+        year = _dayYear[i].astype('int64')
+        doy = _dayDoy[i]
+    leap = isLeap(year)
+    month = _doyMonth[leap,doy].astype('int64')
+    day = _doyDay[leap,doy].astype('int64')
+    dk = _dayDk[day]
+    return {'YEAR':year,
+            'MONTH':month,
+            'day':day,
+            'dk':dk.astype('int64'),
+            'dkYear':(month-1)*3+dk,
+            'seasonCode':_monthSeason[month],
+            'seasonyear':year+_monthSeasonyear[month]}
+
+def periodDays(timeperiod,year,month=None,dk=None,season=None):
+    """
+    Returns the number of days of periods of timeperiod ('dekadal','month','season' or 'year') as int64 array.
+    year (the seasonyear for season), month, dk (1-3) and season (name or season code) are arrays or single values.
+    """
+    leap = isLeap(year)
+    if timeperiod == 'dekadal':
+        return _dekadDays[leap,(np.asarray(month,dtype='int64')-1)*3+np.asarray(dk,dtype='int64')].astype('int64')
+    elif timeperiod == 'month':
+        return _monthDays[leap,np.asarray(month,dtype='int64')].astype('int64')
+    elif timeperiod == 'season':
+        season = np.asarray(season)
+        if season.dtype.kind not in 'iu':
+            season = np.searchsorted(_seasons,season.astype(str))
+        return _seasonDays[leap,season].astype('int64')
+    elif timeperiod == 'year':
+        return _yearDays[leap].astype('int64')
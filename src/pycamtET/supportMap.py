@@ -3,6 +3,7 @@ import pandas as pd
 import numpy as np
 from os import path
 import os
+from importlib.util import find_spec
 
 from pycamtET.pckgSettings import getSettings
 setDict = getSettings()
@@ -12,86 +13,196 @@ _legend_elements = [Patch(facecolor='red', edgecolor='red',label='under'),
                    Patch(facecolor='yellow', edgecolor='yellow',label='normal'),
                    Patch(facecolor='green', edgecolor='green',label='over')]
 
-# geopandas-dependent
-geodata=True
+# geopandas-dependent; the admin layers are read on first use (admLayer)
+geodata = find_spec('geopandas') is not None
+if geodata==False:
+    print('Package geopandas is not installed. Map abilities can not be used.')
+_metercrs = 'EPSG:20137'
 
-try:
+_admPaths = {0:'adm0Path',1:'adm1Path',2:'adm2Path',3:'adm3Path'}
+_admNames = {0:'adm0 (full ET)',1:'adm1 (ET regions)',2:'adm2 (ET zones)',3:'adm3 (ET districts)'}
+_admLayers = {}
+
+def admLayer(level,tolerance=None):
+    """
+    Returns the admin layer of level 0 (Ethiopia), 1 (regions), 2 (zones) or 3 (districts) as GeoDataFrame, read from
+    the shape file in the settings (adm0Path, ..., adm3Path) on first use and kept in memory.
+    If pyarrow is installed, the layer is also saved as GeoParquet in pckgdata/admdata, and read from there the next
+    time (as long as the shape file is not changed).
+
+    Parameters
+    ----------
+    level : INT
+        0, 1, 2 or 3.
+    tolerance : None or FLOAT, optional
+        If provided, a copy with geometries simplified to this tolerance (in degrees, topology preserved), for example
+        for faster plotting. Simplified copies are saved as well. The default is None.
+
+    Returns
+    -------
+    layer : geopandas GeoDataFrame, or None if the shape file can not be read.
+    """
+    key = (level,tolerance)
+    if key in _admLayers:
+        return _admLayers[key]
+    if geodata==False:
+        print('Package geopandas is not installed. Map abilities can not be used.')
+        return
     import geopandas as gpd
-    test=gpd.read_file(setDict['adm3Path'])
-except:
-    print('Importing package geopandas or reading shapefile not successful. Map abilities can not be used.')
-    geodata=False
-    _adm_d,_adm_m,_metercrs,_adm2_d,_adm1_d,_adm0_d=[None]*6
-if geodata:
-    try:
-        _adm_d = gpd.read_file(setDict['adm3Path'])
-        _adm_m = _adm_d.to_crs(epsg=20137)
-        _metercrs = _adm_m.crs
-    except:
-        print('File location of adm3 (ET districts) shape file not found at '+setDict['adm3Path']+'. Map abilities cannot be used.\n',
-              'If you have the shape file, set the full path by using pckgSettings.setSettings(adm3Path="path/to/adm3shapefiles")')
-        _adm_d,_adm_m,_metercrs=[None]*3
-        geodata=False
-    try:
-        _adm2_d = gpd.read_file(setDict['adm2Path'])
-    except:
-        print('File location of adm2 (ET zones) shape file not found at '+setDict['adm2Path']+'. Map abilities cannot be used.\n',
-              'If you have the shape file, set the full path by using pckgSettings.setSettings(adm2Path="path/to/adm2shapefiles")')
-        _adm2_d=None
-        geodata=False
-    try:
-        _adm1_d = gpd.read_file(setDict['adm1Path'])
-    except:
-        print('File location of adm1 (ET regions) shape file not found at '+setDict['adm1Path']+'. Map abilities cannot be used.\n',
-              'If you have the shape file, set the full path by using pckgSettings.setSettings(adm1Path="path/to/adm1shapefiles")')
-        _adm1_d=None
-        geodata=False
-    try:
-        _adm0_d = gpd.read_file(setDict['adm0Path'])
-    except:
-        print('File location of adm0 (full ET) shape file not found at '+setDict['adm0Path']+'. Map abilities cannot be used.\n',
-              'If you have the shape file, set the full path by using pckgSettings.setSettings(adm0Path="path/to/adm0shapefiles")')
-        _adm0_d = None
-        geodata=False
-    from shapely.ops import unary_union
-
-def gridcalculate(gpdshape,areaname,gridsize=100):    
+    sourcePath = setDict[_admPaths[level]]
+    if path.isfile(sourcePath)==False:
+        print('File location of '+_admNames[level]+' shape file not found at '+sourcePath+'. Map abilities cannot be used.\n',
+              'If you have the shape file, set the full path by using pckgSettings.setSettings('+_admPaths[level]+'="path/to/shapefiles")')
+        return
+
+    # the cache file name holds the size and modification time of the shape file
+    dirName = setDict['pckgsdataPath']+'/admdata'
+    stat = os.stat(sourcePath)
+    prefix = 'adm'+str(level)+('' if tolerance is None else '_s'+str(tolerance))+'_'
+    pathName = dirName+'/'+prefix+str(stat.st_size)+'_'+str(int(stat.st_mtime))+'.parquet'
+    parquet = find_spec('pyarrow') is not None
+    if parquet and path.isfile(pathName):
+        layer = gpd.read_parquet(pathName)
+    else:
+        if tolerance is None:
+            layer = gpd.read_file(sourcePath)
+        else:
+            layer = admLayer(level)
+            if layer is None:
+                return
+            layer = layer.copy()
+            layer['geometry'] = layer.geometry.simplify(tolerance,preserve_topology=True)
+        if parquet:
+            if path.isdir(dirName)==False:
+                os.mkdir(dirName)
+            for oldFile in os.listdir(dirName):
+                if oldFile.startswith(prefix) and oldFile[len(prefix):len(prefix)+1].isdigit():
+                    os.remove(dirName+'/'+oldFile)
+            layer.to_parquet(pathName)
+    _admLayers[key] = layer
+    return layer
+
+def rmAdmData():
+    """
+    Removes the admin layers kept in memory and the GeoParquet copies in pckgdata/admdata.
+    """
+    from shutil import rmtree
+    _admLayers.clear()
+    dirName = setDict['pckgsdataPath']+'/admdata'
+    if path.isdir(dirName):
+        rmtree(dirName)
+
+def gridcalculate(gpdshape,areaname,gridsize=100):
+    """
+    Returns the grid of gridsize x gridsize points over the bounds of gpdshape, as DataFrame with columns x_d, y_d
+    (longitude, latitude), bool1d (point within the area) and x_m, y_m (in meter, CRS _metercrs); the points are ordered
+    as numpy.meshgrid(x, y) flattened.
+    The mask is calculated with a prepared geometry of the area (see _gridMask()) and the meter coordinates with a
+    pyproj transformation. Grids are saved in griddata as <areaname>_<gridsize>_<CRS>.npz (the mask bit-packed), and
+    read from there the next time.
+    """
     dirName = setDict['pckgsdataPath']+'/griddata'
-    pathName = dirName+'/'+areaname+'Grid.csv'
+    pathName = _gridPath(areaname,gridsize)
 
-    
     if path.isfile(pathName):
         print(areaname+' gridfile read from computer.')
-        griddf = pd.read_csv(pathName)
+        with np.load(pathName) as grid:
+            bounds = grid['bounds']
+            bool1d = np.unpackbits(grid['mask'],count=gridsize**2).astype(bool)
+            x_m = grid['x_m']
+            y_m = grid['y_m']
+        xpoints = np.linspace(bounds[0],bounds[2],gridsize)
+        ypoints = np.linspace(bounds[1],bounds[3],gridsize)
+        x2d_d,y2d_d = np.meshgrid(xpoints,ypoints)
     else:
         if path.isdir(dirName)==False:
             os.mkdir(dirName)
-        print('Grid not yet calculated before. It will be calculated now, this will take some time...')
+        import shapely
+        from pyproj import Transformer
+        from shapely.ops import unary_union
         shape_d = unary_union(gpdshape.geometry)
-    
-        xmin = shape_d.bounds[0]
-        ymin = shape_d.bounds[1]
-        xmax = shape_d.bounds[2]
-        ymax = shape_d.bounds[3]
-    
-        xpoints = np.linspace(xmin,xmax,gridsize)
-        ypoints = np.linspace(ymin,ymax,gridsize)
+        shapely.prepare(shape_d)
+        bounds = np.array(shape_d.bounds)
+
+        xpoints = np.linspace(bounds[0],bounds[2],gridsize)
+        ypoints = np.linspace(bounds[1],bounds[3],gridsize)
         x2d_d,y2d_d = np.meshgrid(xpoints,ypoints)
-        x1d_d = x2d_d.reshape(x2d_d.size)
-        y1d_d = y2d_d.reshape(y2d_d.size)
-        points_d=gpd.points_from_xy(x1d_d,y1d_d,crs='EPSG:4236')
-        bool1d = points_d.within(shape_d) 
-            
-        points_m=points_d.to_crs(_metercrs)
-    
-        griddf = pd.DataFrame(index=range(gridsize**2))
-        griddf.loc[:,'x_d'] = x1d_d
-        griddf.loc[:,'y_d'] = y1d_d
-        griddf.loc[:,'bool1d'] = bool1d
-        griddf.loc[:,'x_m'] = points_m.x
-        griddf.loc[:,'y_m'] = points_m.y
-    
-        griddf.to_csv(pathName,index=False)
-        print(areaname+' gridcalculation finished and saved on computer to save calculation time for the next time.')
-
-    return griddf
\ No newline at end of file
+        bool1d = _gridMask(shape_d,xpoints,ypoints).reshape(-1)
+        x_m,y_m = Transformer.from_crs('EPSG:4326',_metercrs,always_xy=True).transform(x2d_d.reshape(-1),y2d_d.reshape(-1))
+
+        np.savez(pathName,bounds=bounds,mask=np.packbits(bool1d),x_m=x_m,y_m=y_m)
+        print(areaname+' grid ('+str(gridsize)+' x '+str(gridsize)+') calculated and saved on computer to save calculation time for the next time.')
+
+    griddf = pd.DataFrame({'x_d':x2d_d.reshape(-1),
+                           'y_d':y2d_d.reshape(-1),
+                           'bool1d':bool1d,
+                           'x_m':x_m,
+                           'y_m':y_m})
+    return griddf
+
+def _gridPath(areaname,gridsize,suffix=''):
+    """
+    Returns the path of the grid file of areaname and gridsize (and the CRS _metercrs), with suffix before .npz.
+    """
+    crsName = str(_metercrs).replace(':','')
+    return setDict['pckgsdataPath']+'/griddata/'+areaname+'_'+str(gridsize)+'_'+crsName+suffix+'.npz'
+
+_gridLabels = {}
+
+def gridlabels(gridinfo,areaname,gridsize,level):
+    """
+    Returns the label raster of a grid from gridcalculate(): per grid point the number of the admin unit of level
+    (1 region, 2 zone, 3 district) it lies in (-1 outside the area or outside all units), and the unit names
+    (label i is names[i]). Calculated with a spatial index (STRtree) on the admin layer, saved next to the grid file
+    and kept in memory.
+    """
+    pathName = _gridPath(areaname,gridsize,'_adm'+str(level))
+    if pathName in _gridLabels:
+        return _gridLabels[pathName]
+    if path.isfile(pathName):
+        with np.load(pathName) as grid:
+            labels,names = grid['labels'],grid['names']
+    else:
+        import shapely
+        layer = admLayer(level)
+        if layer is None:
+            return
+        inside = np.flatnonzero(np.asarray(gridinfo.bool1d,dtype=bool))
+        points = shapely.points(gridinfo.x_d.values[inside],gridinfo.y_d.values[inside])
+        pointNr,rowNr = shapely.STRtree(layer.geometry.values).query(points,predicate='intersects')
+        # a grid point on a border gets the first unit
+        first = np.unique(pointNr,return_index=True)[1]
+        codes,names = pd.factorize(layer['admin'+str(level)+'Name'].values[rowNr[first]],sort=True)
+        labels = np.full(len(gridinfo),-1,dtype='int32')
+        labels[inside[pointNr[first]]] = codes
+        names = np.asarray(names,dtype=str)
+        if path.isdir(path.dirname(pathName))==False:
+            os.mkdir(path.dirname(pathName))
+        np.savez(pathName,labels=labels,names=names)
+    _gridLabels[pathName] = (labels,names)
+    return labels,names
+
+def _gridMask(shape,xpoints,ypoints,block=16):
+    """
+    Returns the mask (len(ypoints) x len(xpoints)) of the grid points within the prepared shapely geometry shape.
+    Blocks of block x block points whose box is fully within or outside shape are set at once; only the points in
+    blocks on the boundary are tested one by one (shapely.contains_xy).
+    """
+    import shapely
+    nBlocks = [-(-len(points)//block) for points in (xpoints,ypoints)]
+    xstart,ystart = [np.arange(n)*block for n in nBlocks]
+    xend = np.minimum(xstart+block,len(xpoints))-1
+    yend = np.minimum(ystart+block,len(ypoints))-1
+    bx0,by0 = np.meshgrid(xpoints[xstart],ypoints[ystart])
+    bx1,by1 = np.meshgrid(xpoints[xend],ypoints[yend])
+    boxes = shapely.box(bx0.reshape(-1),by0.reshape(-1),bx1.reshape(-1),by1.reshape(-1))
+    inside = shapely.contains_properly(shape,boxes).reshape(nBlocks[1],nBlocks[0])
+    outside = shapely.disjoint(shape,boxes).reshape(nBlocks[1],nBlocks[0])
+
+    xblock = np.arange(len(xpoints))//block
+    yblock = np.arange(len(ypoints))//block
+    mask = inside[yblock][:,xblock]
+    test = ~(mask|outside[yblock][:,xblock])
+    yi,xi = np.nonzero(test)
+    mask[yi,xi] = shapely.contains_xy(shape,xpoints[xi],ypoints[yi])
+    return mask
\ No newline at end of file
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Shared fixtures: a temporary pckgsdataPath, a small EMI datafile, and for the maps synthetic admin shape files with
+stations and a series of dekadal values.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import pycamtET.pckgSettings
+import pycamtET.support
+from pycamtET import dataFunctions as dFu
+
+@pytest.fixture
+def settings(tmp_path,monkeypatch):
+    # station info and caches go to a temporary pckgsdataPath
+    settingsDict = {'pckgsdataPath':str(tmp_path)}
+    monkeypatch.setattr(pycamtET.pckgSettings,'getSettings',lambda: settingsDict)
+    monkeypatch.setattr(pycamtET.support,'getSettings',lambda: settingsDict)
+    return tmp_path
+
+@pytest.fixture
+def emiFile(tmp_path):
+    rng = np.random.default_rng(0)
+    header = ['Name','ID','Lat','Lon','Elev','Element','Year','Month','Time']+['Val%02d' % d for d in range(1,32)]
+    stations = [('ASSELA','GH1','7.95','39.13','2430'),(' bahir dar','GH2','11.6','37.4','1800'),('Gondar ','GH3','12.6','37.5','2100')]
+    times = ['9:00','900','12:00','6:00','0600','1230']
+    rows = []
+    for station in stations:
+        for element in ['PRECIP','TMPMIN','TMPMAX']:
+            for year in [2015,2016]:
+                for month in range(1,13):
+                    values = rng.uniform(0,30,31).round(1).astype(str).astype(object)
+                    values[rng.random(31)<0.1] = ''
+                    values[rng.random(31)<0.05] = 'T'
+                    # day 31 of a 30-day month and days 29-31 of February hold values that are not valid dates
+                    rows.append(list(station)+[element,str(year),str(month),times[rng.integers(len(times))]]+list(values))
+    df = pd.DataFrame(rows,columns=header)
+    df = df.iloc[rng.permutation(len(df))]
+    filePath = tmp_path/'emi.csv'
+    df.to_csv(filePath,index=False)
+    return str(filePath)
+
+@pytest.fixture
+def emiData(settings,emiFile):
+    return dFu.dataLoad(emiFile,engine='fast')
+
+@pytest.fixture(scope='session')
+def shapeFiles(tmp_path_factory):
+    # four admin levels of a synthetic country: a grid of districts, two per zone cell, zones grouped in regions
+    gpd = pytest.importorskip('geopandas')
+    from shapely.geometry import Polygon,box
+    folder = tmp_path_factory.mktemp('shapefiles')
+    outline = Polygon([(33.0,8.0),(35.0,5.0),(38.5,3.5),(42.0,4.0),(47.9,8.0),(44.0,10.5),(43.0,12.5),(40.0,14.8),(37.0,14.5),(35.5,12.5),(34.5,10.5)])
+    lons,lats = np.linspace(33,48,9),np.linspace(3.4,15,7)
+    rows = []
+    for i in range(len(lons)-1):
+        for j in range(len(lats)-1):
+            mid = (lons[i]+lons[i+1])/2
+            for k,half in enumerate([box(lons[i],lats[j],mid,lats[j+1]),box(mid,lats[j],lons[i+1],lats[j+1])]):
+                part = half.intersection(outline)
+                if part.area > 1e-6:
+                    rows.append({'admin1Name':'Region%d' % (i//2+1+10*(j//3)),'admin2Name':'Zone%d_%d' % (i,j),
+                                 'admin3Name':'District%d_%d_%d' % (i,j,k),'geometry':part})
+    adm3 = gpd.GeoDataFrame(rows,crs='EPSG:4326')
+    adm2 = adm3.dissolve('admin2Name',as_index=False,aggfunc='first')[['admin1Name','admin2Name','geometry']]
+    adm1 = adm3.dissolve('admin1Name',as_index=False)[['admin1Name','geometry']]
+    adm0 = gpd.GeoDataFrame([{'admin0Name':'Ethiopia','geometry':outline}],crs='EPSG:4326')
+    paths = {}
+    for level,layer in enumerate([adm0,adm1,adm2,adm3]):
+        layer.to_file(folder/('ETadm%d.shp' % level))
+        paths['adm%dPath' % level] = str(folder/('ETadm%d.shp' % level))
+    return paths
+
+@pytest.fixture
+def mapSettings(settings,shapeFiles,monkeypatch):
+    # settings, station info and empty in-memory caches of the map modules
+    matplotlib = pytest.importorskip('matplotlib')
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from pycamtET import supportMap,adminIndex,mapFunctions
+    settingsDict = dict(shapeFiles,pckgsdataPath=str(settings),outPath=str(settings))
+    monkeypatch.setattr(supportMap,'setDict',settingsDict)
+    for module in [mapFunctions,adminIndex]:
+        monkeypatch.setattr(module,'_siPath',str(settings/'stationInfo.csv'))
+    for module,name in [(supportMap,'_admLayers'),(supportMap,'_gridLabels'),(adminIndex,'_nameIndexes'),
+                        (adminIndex,'_geometries'),(adminIndex,'_stationIndex')]:
+        monkeypatch.setattr(module,name,{})
+    monkeypatch.setattr(mapFunctions,'_weightCache',type(mapFunctions._weightCache)())
+    import geopandas as gpd
+    from shapely import contains_xy
+    rng = np.random.default_rng(1)
+    lon,lat = rng.uniform(33,48,400),rng.uniform(3.4,15,400)
+    inside = contains_xy(gpd.read_file(shapeFiles['adm0Path']).geometry[0],lon,lat)
+    stationInfo = pd.DataFrame({'STN_Name':['Stn%02d' % i for i in range(40)],'EG_GH_ID':'GH1',
+                                'GEOGR2':lat[inside][:40].round(2),'GEOGR1':lon[inside][:40].round(2),'ELEVATION':2000})
+    stationInfo.to_csv(settings/'stationInfo.csv',index=False)
+    yield settingsDict
+    plt.close('all')
+
+@pytest.fixture
+def mapSeries(mapSettings):
+    # dekadal PRECIP of 2015 for 40 stations, as dataFunctions.locDataSeries() returns it; 10% missing
+    rng = np.random.default_rng(2)
+    names = ['Stn%02d' % i for i in range(40)]
+    index = pd.MultiIndex.from_product([[2015],range(1,13),[1,2,3],names],names=['YEAR','MONTH','dk','STN_Name'])
+    series = pd.DataFrame({'PRECIP':rng.uniform(0,100,len(index)),'PRECIPavg':rng.uniform(20,80,len(index)),'PRECIPstd':5.},index=index)
+    series.loc[rng.random(len(index))<0.1,'PRECIP'] = np.nan
+    for key,value in {'element':'PRECIP','long_name':'Precipitation','unit':'(mm)','timeperiod':'dekadal'}.items():
+        setattr(series,key,value)
+    return series
+
+@pytest.fixture
+def mapLocData(mapSeries):
+    # dekad 1 of July 2015 of mapSeries, as dataFunctions.locData() returns it
+    dfLoc = mapSeries.xs((2015,7,1),level=['YEAR','MONTH','dk'])
+    for key,value in {'element':'PRECIP','long_name':'Precipitation','unit':'(mm)','yearID':2015,'seasonID':None,'monthID':7,'dkID':1}.items():
+        setattr(dfLoc,key,value)
+    return dfLoc
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+The name and station indexes of adminIndex against filtering and spatially joining the admin layers.
+"""
+import pandas as pd
+import pytest
+
+gpd = pytest.importorskip('geopandas')
+import shapely
+
+from pycamtET import adminIndex
+from pycamtET.supportMap import admLayer
+
+def test_admUnits(mapSettings):
+    for name,level,layerLevel in [('Region3',1,None),('Region3',1,3),('Zone4_2',2,3),('District4_2_1',3,None),('Region12',1,2)]:
+        layerLevel = level if layerLevel is None else layerLevel
+        layer = admLayer(layerLevel)
+        expected = layer[layer['admin'+str(level)+'Name']==name]
+        pd.testing.assert_frame_equal(adminIndex.admUnits(name,level,layerLevel),expected)
+        assert adminIndex.admGeometry(name,level).equals(shapely.unary_union(admLayer(level).query('admin%dName==@name' % level).geometry.values))
+    assert adminIndex.admUnits('Oromia',1) is None
+    assert adminIndex.admGeometry('Oromia',1) is None
+
+def test_stationAdmin(mapSettings):
+    stationInfo = pd.read_csv(adminIndex._siPath)
+    points = gpd.GeoDataFrame(stationInfo,geometry=gpd.points_from_xy(stationInfo.GEOGR1,stationInfo.GEOGR2),crs='EPSG:4326')
+    joined = gpd.sjoin(points,admLayer(3),predicate='intersects').drop_duplicates(subset=['STN_Name']).set_index('STN_Name')
+    table = adminIndex.stationAdmin()
+    assert list(table.index) == list(stationInfo.STN_Name)
+    pd.testing.assert_frame_equal(table.loc[joined.index],joined[['admin1Name','admin2Name','admin3Name']],check_dtype=False)
+    assert table.drop(joined.index).isna().all().all()
+    for region,adm2,adm3 in [('Region3',None,None),(None,table.admin2Name.iloc[0],None),(None,None,table.admin3Name.iloc[1])]:
+        level,name = [(level,name) for level,name in ((3,adm3),(2,adm2),(1,region)) if name is not None][0]
+        assert sorted(adminIndex.stationsIn(region,adm2,adm3)) == sorted(table.index[table['admin%dName' % level]==name])
+    assert len(adminIndex.stationsIn('Region3')) > 0
+    assert adminIndex.stationsIn('Oromia') == []
+    # a changed stationInfo.csv is read again
+    assert adminIndex.stationAdmin() is table
+    stationInfo.iloc[:30].to_csv(adminIndex._siPath,index=False)
+    assert len(adminIndex.stationAdmin()) == 30
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+appendData() against dataLoadMany() of all files, which processes everything again.
+"""
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from pycamtET import dataFunctions as dFu
+
+@pytest.fixture
+def files(emiFile,tmp_path):
+    # the second file overlaps the first; of the overlap, some rows have other values and some another TIME
+    raw = pd.read_csv(emiFile,dtype='object',keep_default_na=False)
+    first = raw.iloc[:150]
+    second = raw.iloc[100:].copy()
+    second.iloc[:25,9:] = '99.5'
+    second.iloc[25:50,8] = '1500'
+    third = raw.iloc[120:130].copy()
+    third.iloc[:,9:] = '0.5'
+    paths = [str(tmp_path/(name+'.csv')) for name in ['first','second','third']]
+    for df,path in zip([first,second,third],paths):
+        df.to_csv(path,index=False)
+    return paths
+
+@pytest.mark.parametrize('compact',[False,True])
+def test_append(settings,files,compact):
+    existing = dFu.dataLoadMany(files[:1],compact=compact)
+    appended = dFu.appendData(existing,files[1])
+    pd.testing.assert_frame_equal(appended,dFu.dataLoadMany(files[:2],compact=compact))
+    assert (appended.TIME==15).sum() > 0
+    appended = dFu.appendData(appended,files[2])
+    pd.testing.assert_frame_equal(appended,dFu.dataLoadMany(files,workers=1,compact=compact))
+
+def test_store(settings,files):
+    appended = dFu.appendData(dFu.dataLoadMany(files[:1]),files[1],storeName='test')
+    pd.testing.assert_frame_equal(dFu.storeLoad('test'),appended)
+    # a file that is already in the store is not added again
+    pd.testing.assert_frame_equal(dFu.appendData('test',files[1]),appended)
+    pd.testing.assert_frame_equal(dFu.appendData('test',files[2]),dFu.dataLoadMany(files,workers=1))
+    pd.testing.assert_frame_equal(dFu.storeLoad('test'),dFu.dataLoadMany(files,workers=1))
+    # the store lists the appended files
+    assert dFu.storeLoad('test').filePath == [str(Path(f).resolve()) for f in files[1:]]
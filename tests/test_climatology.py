@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+Climatology against the statistics that locData() calculates from the data itself.
+"""
+import pandas as pd
+import pytest
+
+from pycamtET import dataFunctions as dFu
+from pycamtET.climatology import Climatology
+
+periods = [{},{'season':'Belg'},{'season':'Bega'},{'month':3},{'month':12,'dekadal':3}]
+
+@pytest.mark.parametrize('elements',[None,['TMPMIN'],['TMPMIN','TMPMAX']])
+def test_elements(emiData,elements):
+    df = emiData if elements is None else emiData[emiData.EG_EL.isin(elements)].reset_index(drop=True)
+    clim = Climatology(df)
+    expected = sorted(df.EG_EL.unique())+(['RD'] if elements is None else [])
+    assert sorted(clim.elements) == sorted(expected)
+    for element in clim.elements:
+        for kw in periods:
+            pd.testing.assert_frame_equal(dFu.locData(df,element,2016,**kw),dFu.locData(df,element,2016,climatology=clim,**kw))
+
+def test_chunks(emiData):
+    # chunks of dataIter() give the same climatology as the whole data
+    whole = Climatology(emiData)
+    chunks = Climatology([emiData.iloc[i:i+5000] for i in range(0,len(emiData),5000)])
+    for element in whole.elements:
+        pd.testing.assert_frame_equal(whole.stat(element,month=7),chunks.stat(element,month=7))
+
+def test_empty():
+    clim = Climatology([])
+    assert clim.elements == [] and clim.values == {} and clim.stats == {}
+    assert clim.stat('PRECIP') is None
+    assert clim.toFrame('TMPMIN','year') is None
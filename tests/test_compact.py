@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Data loaded with compact=True against the regular long-format data.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from pycamtET import dataFunctions as dFu
+
+def test_columns(settings,emiFile):
+    regular = dFu.dataLoad(emiFile,engine='fast')
+    compact = dFu.dataLoad(emiFile,engine='fast',compact=True)
+    assert 'date' not in compact.columns
+    assert compact.memory_usage(deep=True).sum()*3 < regular.memory_usage(deep=True).sum()
+    for col in ['STN_Name','EG_EL','YEAR','MONTH','TIME','seasonyear','dateTime']:
+        assert (np.asarray(compact[col]) == regular[col].values).all()
+    assert (compact.day.values == regular.day.values.astype(int)).all()
+    assert (compact.season.astype(str).values == regular.season.astype(str).values).all()
+    assert (compact.dk.values == regular.dk.astype(int).values).all()
+    np.testing.assert_array_equal(compact.value.values,regular.value.values.astype('float32'))
+    assert (compact.dkYear.values == (regular.MONTH.values-1)*3+regular.dk.astype(int).values).all()
+
+def _assertEqual(left,right):
+    # compact data has integer dk where regular data has categorical dk, and float32 values
+    left,right = left.reset_index(),right.reset_index()
+    for col in left.columns:
+        if isinstance(left[col].dtype,pd.CategoricalDtype) or isinstance(right[col].dtype,pd.CategoricalDtype):
+            left[col],right[col] = left[col].astype(str),right[col].astype(str)
+    pd.testing.assert_frame_equal(left,right,check_dtype=False,rtol=1e-5,atol=1e-4)
+
+@pytest.mark.parametrize('timeperiod',['day','dekadal','month','season','year'])
+def test_downstream(settings,emiFile,timeperiod):
+    regular = dFu.dataLoad(emiFile,engine='fast')
+    compact = dFu.dataLoad(emiFile,engine='fast',compact=True)
+    dfReg = dFu.locSelect(regular,'Assela')
+    dfCom = dFu.locSelect(compact,'Assela')
+    _assertEqual(dfCom,dfReg)
+    for element in ['PRECIP','TMPMAX','RD']:
+        _assertEqual(dFu.timeData(dfCom,element,timeperiod),dFu.timeData(dfReg,element,timeperiod))
+        if timeperiod != 'day':
+            _assertEqual(dFu.periodAggregate(compact,element,timeperiod),dFu.periodAggregate(regular,element,timeperiod))
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+crossValidate() against leaving out every station in turn and interpolating it from the other stations.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('geopandas')
+pytest.importorskip('pykrige')
+from pykrige.ok import OrdinaryKriging
+from pyproj import Transformer
+
+from pycamtET import mapFunctions as mFu
+
+fixed = {'sill':900,'range':2,'nugget':50}
+
+def _leaveOneOut(series,method,power=1,neighbours=None):
+    stationInfo = pd.read_csv(mFu._siPath).set_index('STN_Name')
+    toMeter = Transformer.from_crs('EPSG:4326',mFu._metercrs,always_xy=True)
+    predicted = pd.Series(np.nan,index=series.index)
+    for period,dfLoc in series.PRECIP.groupby(level=['YEAR','MONTH','dk']):
+        dfLoc = dfLoc.dropna().droplevel(['YEAR','MONTH','dk'])
+        lon,lat = stationInfo.GEOGR1[dfLoc.index].values,stationInfo.GEOGR2[dfLoc.index].values
+        x,y = toMeter.transform(lon,lat)
+        for i,stationName in enumerate(dfLoc.index):
+            others = np.arange(len(dfLoc))!=i
+            if method == 'idw':
+                distances = np.sqrt((x[others]-x[i])**2+(y[others]-y[i])**2)
+                nearest = np.argsort(distances)[:neighbours]
+                weights = 1/distances[nearest]**power
+                estimate = weights@dfLoc.values[others][nearest]/weights.sum()
+            else:
+                OK = OrdinaryKriging(lon[others],lat[others],dfLoc.values[others],variogram_model=method,variogram_parameters=fixed)
+                estimate = OK.execute('points',lon[i:i+1],lat[i:i+1])[0][0]
+            predicted[period+(stationName,)] = estimate
+    return predicted
+
+@pytest.fixture
+def series(mapSeries):
+    # the first two months
+    series = mapSeries[mapSeries.index.get_level_values('MONTH')<=2]
+    series.element = 'PRECIP'
+    return series
+
+def test_idw(series):
+    stats,predicted = mFu.crossValidate(series,methods=['idw'],power=2,predictions=True)
+    np.testing.assert_allclose(predicted.idw.values,_leaveOneOut(series,'idw',power=2).values,rtol=1e-9)
+    error = (predicted.idw-series.PRECIP).dropna()
+    assert stats.loc['idw','n'] == len(error) == series.PRECIP.notna().sum()
+    np.testing.assert_allclose(stats.loc['idw',['RMSE','MAE','bias']].values.astype(float),
+                               [np.sqrt((error**2).mean()),error.abs().mean(),error.mean()])
+    stats,predicted = mFu.crossValidate(series,methods=['idw'],neighbours=6,predictions=True)
+    np.testing.assert_allclose(predicted.idw.values,_leaveOneOut(series,'idw',neighbours=6).values,rtol=1e-9)
+
+@pytest.mark.parametrize('krigingModel',['gaussian','spherical'])
+def test_kriging(series,krigingModel):
+    stats,predicted = mFu.crossValidate(series,methods=[krigingModel],variogramParameters=fixed,predictions=True)
+    np.testing.assert_allclose(predicted[krigingModel].values,_leaveOneOut(series,krigingModel).values,rtol=1e-6)
+
+def test_fitted(series,mapLocData):
+    # without variogramParameters, one variogram fitted to the station averages, as kriMany()
+    stationInfo = pd.read_csv(mFu._siPath).set_index('STN_Name')
+    meanavg = series.PRECIPavg.groupby(level='STN_Name').mean()
+    variogram = mFu._variogram(stationInfo.loc[meanavg.index,['GEOGR1','GEOGR2']].values,meanavg.values,'gaussian')
+    fitted = mFu.crossValidate(series,methods=['gaussian','idw'],predictions=True)
+    given = mFu.crossValidate(series,methods=['gaussian','idw'],variogramParameters=mFu._variogramDict('gaussian',variogram),predictions=True)
+    pd.testing.assert_frame_equal(fitted[1],given[1])
+    pd.testing.assert_frame_equal(fitted[0],given[0])
+    # one period from locData()
+    stats,predicted = mFu.crossValidate(mapLocData,methods=['idw'],predictions=True)
+    assert predicted.index.equals(mapLocData.index)
+    assert mFu.crossValidate(series,methods=['cubic']) is None
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+Chunked reading with dataIter() and incremental aggregation with periodAggregate(), against dataLoad() of the whole file.
+"""
+import pandas as pd
+import pytest
+
+from pycamtET import dataFunctions as dFu
+
+def _sorted(df):
+    return df.sort_values(by=['STN_Name','EG_EL','dateTime'],ignore_index=True)
+
+@pytest.mark.parametrize('engine',['default','fast'])
+def test_chunks(settings,emiFile,engine):
+    whole = dFu.dataLoad(emiFile,engine='fast')
+    chunks = list(dFu.dataIter(emiFile,chunksize=50,engine=engine))
+    assert len(chunks) > 1
+    pd.testing.assert_frame_equal(_sorted(pd.concat(chunks,ignore_index=True)),_sorted(whole))
+
+@pytest.mark.parametrize('timeperiod',['year','season','month','dekadal'])
+def test_periodAggregate(settings,emiFile,timeperiod):
+    whole = dFu.dataLoad(emiFile,engine='fast')
+    groupList = {'year':['YEAR'],'season':['seasonyear','season'],'month':['YEAR','MONTH'],'dekadal':['YEAR','MONTH','dk']}
+    for element in ['PRECIP','TMPMIN','RD']:
+        chunked = dFu.periodAggregate(dFu.dataIter(emiFile,chunksize=50),element,timeperiod)
+        pd.testing.assert_frame_equal(chunked,dFu.periodAggregate(whole,element,timeperiod))
+    # PRECIP is the sum, TMPMIN the average of the observations in the period
+    grouped = whole.groupby(['EG_EL','STN_Name']+groupList[timeperiod],observed=True).value
+    precip = dFu.periodAggregate(whole,'PRECIP',timeperiod)
+    tmpmin = dFu.periodAggregate(whole,'TMPMIN',timeperiod)
+    assert (precip.PRECIP.values == grouped.sum().loc['PRECIP'].values).all()
+    pd.testing.assert_series_equal(tmpmin.TMPMIN,grouped.mean().loc['TMPMIN'].reindex(tmpmin.index),check_names=False,check_index=False)
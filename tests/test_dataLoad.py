@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Equivalence of the default and fast engines of dataFunctions.dataLoad, with and without cache and row filters.
+"""
+import pandas as pd
+
+from pycamtET import dataFunctions as dFu
+
+def test_fastEngine(settings,emiFile):
+    default = dFu.dataLoad(emiFile)
+    fast = dFu.dataLoad(emiFile,engine='fast')
+    pd.testing.assert_frame_equal(default,fast)
+    # invalid dates are dropped
+    assert (default.dateTime.dt.day.values==default.day.values.astype(int)).all()
+    assert ((default.MONTH==4)&(default.day.astype(int)==31)).sum() == 0
+
+def test_cache(settings,emiFile):
+    reference = dFu.dataLoad(emiFile)
+    for engine in ['default','fast']:
+        first = dFu.dataLoad(emiFile,cache=True,engine=engine)
+        (settings/'stationInfo.csv').unlink()
+        cached = dFu.dataLoad(emiFile,cache=True,engine=engine)
+        pd.testing.assert_frame_equal(reference,first)
+        pd.testing.assert_frame_equal(reference,cached)
+        # a cached load registers the stations as well
+        assert sorted(pd.read_csv(settings/'stationInfo.csv').STN_Name) == ['Assela','Bahir Dar','Gondar']
+
+def test_filters(settings,emiFile):
+    # filtering the rows of the file gives the same data as filtering the processed data
+    full = dFu.dataLoad(emiFile)
+    for filters in [{'stations':['assela ','Gondar']},{'elements':'TMPMIN'},{'years':(2016,2016)},
+                    {'stations':'Bahir Dar','elements':['PRECIP','TMPMAX'],'years':(2015,2015)}]:
+        expected = full
+        if 'stations' in filters:
+            stations = [filters['stations']] if isinstance(filters['stations'],str) else filters['stations']
+            expected = expected[expected.STN_Name.isin([s.strip().title() for s in stations])]
+        if 'elements' in filters:
+            expected = expected[expected.EG_EL.isin(pd.Series(filters['elements']))]
+        if 'years' in filters:
+            expected = expected[expected.YEAR.between(*filters['years'])]
+        expected = expected.reset_index(drop=True)
+        for engine in ['default','fast']:
+            pd.testing.assert_frame_equal(dFu.dataLoad(emiFile,engine=engine,**filters),expected)
+        pd.testing.assert_frame_equal(dFu.dataLoad(emiFile,cache=True,**filters),expected)
+    assert dFu.dataLoad(emiFile,stations='Addis Ababa') is None
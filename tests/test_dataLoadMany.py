@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+dataLoadMany() of split and overlapping files against dataLoad() of one file with the same observations.
+"""
+import pandas as pd
+import pytest
+
+from pycamtET import dataFunctions as dFu
+
+def _split(emiFile,folder):
+    # two files with an overlap; the second file has other values for the overlapping rows
+    raw = pd.read_csv(emiFile,dtype='object',keep_default_na=False)
+    first = raw.iloc[:150]
+    second = raw.iloc[100:].copy()
+    second.iloc[:50,9:] = '99.5'
+    paths = [str(folder/'first.csv'),str(folder/'second.csv'),str(folder/'combined.csv')]
+    first.to_csv(paths[0],index=False)
+    second.to_csv(paths[1],index=False)
+    pd.concat([raw.iloc[:100],second]).to_csv(paths[2],index=False)
+    return paths
+
+def _sorted(df):
+    return df.sort_values(by=['STN_Name','EG_EL','dateTime'],ignore_index=True)
+
+@pytest.mark.parametrize('workers',[1,2])
+def test_overlap(settings,emiFile,tmp_path,workers):
+    first,second,combined = _split(emiFile,tmp_path)
+    many = dFu.dataLoadMany([first,second],workers=workers)
+    pd.testing.assert_frame_equal(many,_sorted(dFu.dataLoad(combined,engine='fast')))
+    assert (many.value==99.5).sum() > 0
+    assert many.filePath == [first,second]
+
+def test_filters(settings,emiFile,tmp_path):
+    first,second,combined = _split(emiFile,tmp_path)
+    filters = {'stations':'gondar','elements':['PRECIP','TMPMAX'],'years':(2016,2016)}
+    many = dFu.dataLoadMany([first,second],workers=1,compact=True,**filters)
+    pd.testing.assert_frame_equal(many,_sorted(dFu.dataLoad(combined,engine='fast',compact=True,**filters)))
+    assert list(many.STN_Name.unique()) == ['Gondar']
+    assert dFu.dataLoadMany([first,str(tmp_path/'missing.csv')]) is None
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Grids returned by the map functions, exported with gridExport() and read back with gridLoad().
+"""
+from importlib.util import find_spec
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('geopandas')
+
+from pycamtET import mapFunctions as mFu
+
+def _assertGridEqual(result,grid):
+    assert sorted(result) == sorted(grid)
+    for key in ['x','y','mask']:
+        np.testing.assert_array_equal(result[key],grid[key])
+    assert sorted(result['grids']) == sorted(grid['grids'])
+    for name,values in grid['grids'].items():
+        np.testing.assert_allclose(result['grids'][name],values,rtol=1e-6)
+    assert result['metadata'] == grid['metadata']
+    if grid['periods'] is None:
+        assert result['periods'] is None
+    else:
+        pd.testing.assert_frame_equal(result['periods'],grid['periods'].reset_index(drop=True),check_dtype=False)
+
+@pytest.mark.parametrize('suffix',['.npz','','.tif'])
+def test_roundtrip(mapSeries,mapLocData,tmp_path,suffix):
+    grids = [mFu.idwMap(mapLocData,region='Region3',gridsize=30,returnGrid=True)[2],
+             mFu.idwMany(mapSeries,region='Region3',neighbours=5,gridsize=30,returnGrid=True)]
+    if find_spec('pykrige') is not None:
+        grids.append(mFu.kriMap(mapLocData,region='Region3',gridsize=30,returnGrid=True)[2])
+    for nr,grid in enumerate(grids):
+        paths = mFu.gridExport(grid,tmp_path/('grid%d%s' % (nr,suffix)))
+        if (suffix == '.tif') and (find_spec('rasterio') is not None):
+            assert len(paths) == len(grid['grids'])+1
+            result = mFu.gridLoad(tmp_path/('grid%d.tif' % nr))
+        else:
+            assert paths == [str(tmp_path/('grid%d.npz' % nr))]
+            result = mFu.gridLoad(paths[0])
+        _assertGridEqual(result,grid)
+    # the mask is the area of the grids, and the metadata comes from the data
+    assert (grids[0]['mask'] == np.isfinite(grids[0]['grids']['estimate'])).all()
+    assert grids[0]['metadata'] == {'area':'Region3','gridsize':30,'method':'idw','element':'PRECIP','long_name':'Precipitation',
+                                    'unit':'(mm)','yearID':2015,'monthID':7,'dkID':1,'power':1,'neighbours':None}
+    assert grids[1]['grids']['estimate'].shape == (36,30,30)
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+idwMap() and idwMany() against inverse distance weighting point by point, and the reuse of cached weights.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('geopandas')
+from pyproj import Transformer
+
+from pycamtET import mapFunctions as mFu
+
+def _bruteIdw(grid,dfLoc,power,neighbours):
+    # estimate of every grid point within the area from the stations with data, distances in meter
+    stationInfo = pd.read_csv(mFu._siPath).set_index('STN_Name').loc[dfLoc.index]
+    toMeter = Transformer.from_crs('EPSG:4326',mFu._metercrs,always_xy=True)
+    x,y = np.meshgrid(grid['x'],grid['y'])
+    gridxy = np.column_stack(toMeter.transform(x[grid['mask']],y[grid['mask']]))
+    stationxy = np.column_stack(toMeter.transform(stationInfo.GEOGR1.values,stationInfo.GEOGR2.values))
+    estimate = np.full(grid['mask'].shape+(2,),np.nan)
+    nona = dfLoc.PRECIP.notna().values
+    values = dfLoc[['PRECIP','PRECIPavg']].values[nona]
+    result = []
+    for point in gridxy:
+        distances = np.sqrt(((stationxy[nona]-point)**2).sum(axis=1))
+        nearest = np.argsort(distances)[:neighbours]
+        weights = 1/distances[nearest]**power
+        result.append(weights@values[nearest]/weights.sum())
+    estimate[grid['mask']] = result
+    return estimate
+
+@pytest.mark.parametrize('power,neighbours',[(1,None),(2,None),(1,5),(3,8)])
+def test_idwMap(mapLocData,power,neighbours):
+    fig1,fig2,grid = mFu.idwMap(mapLocData,region='Region3',power=power,neighbours=neighbours,gridsize=30,returnGrid=True)
+    expected = _bruteIdw(grid,mapLocData,power,neighbours)
+    np.testing.assert_allclose(grid['grids']['estimate'],expected[...,0],rtol=1e-9)
+    np.testing.assert_allclose(grid['grids']['average'],expected[...,1],rtol=1e-9)
+    np.testing.assert_allclose(grid['grids']['anomaly'],expected[...,0]/expected[...,1],rtol=1e-9)
+    assert grid['mask'].sum() > 100
+    assert grid['metadata']['power'] == power
+
+@pytest.mark.parametrize('power,neighbours',[(1,None),(2,6)])
+def test_idwMany(mapSeries,power,neighbours):
+    # every period equals idwMap of that period, which leaves out the stations without data
+    many = mFu.idwMany(mapSeries,region='Region3',power=power,neighbours=neighbours,gridsize=30,returnGrid=True)
+    estimate,average,periods,(x,y) = mFu.idwMany(mapSeries,region='Region3',power=power,neighbours=neighbours,gridsize=30)
+    np.testing.assert_array_equal(estimate,many['grids']['estimate'])
+    pd.testing.assert_frame_equal(periods,many['periods'])
+    assert len(periods) == 36
+    for nr in [0,10,20,35]:
+        year,month,dk = periods.iloc[nr]
+        dfLoc = mapSeries.xs((year,month,dk),level=['YEAR','MONTH','dk'])
+        for key,value in {'element':'PRECIP','long_name':'','unit':'','yearID':year,'seasonID':None,'monthID':month,'dkID':dk}.items():
+            setattr(dfLoc,key,value)
+        grid = mFu.idwMap(dfLoc,region='Region3',power=power,neighbours=neighbours,gridsize=30,returnGrid=True)[2]
+        np.testing.assert_allclose(estimate[nr],grid['grids']['estimate'],rtol=1e-9)
+        np.testing.assert_allclose(average[nr],grid['grids']['average'],rtol=1e-9)
+    np.testing.assert_array_equal(x[0],grid['x'])
+
+def test_weightCache(mapSeries):
+    # the weights are calculated once per grid and station set
+    mFu.idwMany(mapSeries,region='Region3',gridsize=30)
+    entries = list(mFu._weightCache)
+    other = mapSeries+1
+    other.element = 'PRECIP'
+    mFu.idwMany(other,region='Region3',gridsize=30)
+    assert list(mFu._weightCache) == entries
+    mFu.idwMany(mapSeries,region='Region3',gridsize=31)
+    assert len(mFu._weightCache) == len(entries)+1
+    mFu.clearWeightCache()
+    assert len(mFu._weightCache) == 0
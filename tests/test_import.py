@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+"""
+Importing pycamtET does not import the heavy plotting and mapping dependencies.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+def test_lazyImports():
+    code = "import sys, pycamtET; print('matplotlib' in sys.modules, 'geopandas' in sys.modules)"
+    env = dict(os.environ,PYTHONPATH=str(Path(__file__).parents[1]/'src'))
+    result = subprocess.run([sys.executable,'-c',code],capture_output=True,text=True,check=True,env=env)
+    assert result.stdout.strip().split('\n')[-1] == 'False False'
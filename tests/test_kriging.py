@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+kriMap() and kriMany(), global and local, against pykrige.ok.OrdinaryKriging.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('geopandas')
+pytest.importorskip('pykrige')
+from pykrige.ok import OrdinaryKriging
+
+from pycamtET import mapFunctions as mFu
+
+fixed = {'sill':900,'range':2,'nugget':50}
+
+def _pykrige(grid,dfLoc,column,krigingModel,variogramParameters):
+    stationInfo = pd.read_csv(mFu._siPath).set_index('STN_Name').loc[dfLoc.index]
+    nona = dfLoc.PRECIP.notna().values
+    OK = OrdinaryKriging(stationInfo.GEOGR1.values[nona],stationInfo.GEOGR2.values[nona],dfLoc[column].values[nona],
+                         variogram_model=krigingModel,variogram_parameters=variogramParameters)
+    x,y = np.meshgrid(grid['x'],grid['y'])
+    estimate,variance = OK.execute('points',x[grid['mask']],y[grid['mask']])
+    result = np.full((2,)+grid['mask'].shape,np.nan)
+    result[:,grid['mask']] = estimate,variance
+    return result
+
+@pytest.mark.parametrize('krigingModel,variogramParameters',[('gaussian',None),('spherical',None),('gaussian',fixed),('exponential',[600,3,20])])
+def test_kriMap(mapLocData,krigingModel,variogramParameters):
+    fig1,fig2,grid = mFu.kriMap(mapLocData,region='Region3',krigingModel=krigingModel,variogramParameters=variogramParameters,
+                                gridsize=30,returnGrid=True)
+    estimate,variance = _pykrige(grid,mapLocData,'PRECIP',krigingModel,variogramParameters)
+    np.testing.assert_allclose(grid['grids']['estimate'],estimate,rtol=1e-6)
+    np.testing.assert_allclose(grid['grids']['variance'],variance,rtol=1e-6)
+    np.testing.assert_allclose(grid['grids']['average'],_pykrige(grid,mapLocData,'PRECIPavg',krigingModel,variogramParameters)[0],rtol=1e-6)
+    # the variogram of the metadata gives the same grids
+    again = mFu.kriMap(mapLocData,region='Region3',krigingModel=krigingModel,variogramParameters=grid['metadata']['variogram'],
+                       gridsize=30,returnGrid=True)[2]
+    np.testing.assert_allclose(again['grids']['estimate'],grid['grids']['estimate'],rtol=1e-9)
+
+def test_kriMany(mapSeries):
+    # with a fixed variogram, every period equals kriMap of that period
+    estimate,variance,average,periods,(x,y) = mFu.kriMany(mapSeries,region='Region3',variogramParameters=fixed,gridsize=30)
+    for nr in [0,17,35]:
+        year,month,dk = periods.iloc[nr]
+        dfLoc = mapSeries.xs((year,month,dk),level=['YEAR','MONTH','dk'])
+        for key,value in {'element':'PRECIP','long_name':'','unit':'','yearID':year,'seasonID':None,'monthID':month,'dkID':dk}.items():
+            setattr(dfLoc,key,value)
+        grid = mFu.kriMap(dfLoc,region='Region3',variogramParameters=fixed,gridsize=30,returnGrid=True)[2]
+        np.testing.assert_allclose(estimate[nr],grid['grids']['estimate'],rtol=1e-9)
+        np.testing.assert_allclose(variance[nr],grid['grids']['variance'],rtol=1e-9)
+        np.testing.assert_allclose(average[nr],grid['grids']['average'],rtol=1e-9)
+    many = mFu.kriMany(mapSeries,region='Region3',variogramParameters=fixed,gridsize=30,returnGrid=True)
+    np.testing.assert_array_equal(many['grids']['estimate'],estimate)
+    # pykrige reads sill as psill+nugget
+    assert many['metadata']['variogram'] == {'psill':850.,'range':2.,'nugget':50.}
+
+def test_localKriging(mapLocData):
+    # every grid point is kriged with the neighbours stations of its block: the same as pykrige with only those stations
+    grid = mFu.kriMap(mapLocData,region='Region3',variogramParameters=fixed,neighbours=8,gridsize=30,returnGrid=True)[2]
+    stationInfo = pd.read_csv(mFu._siPath).set_index('STN_Name').loc[mapLocData.index]
+    nona = mapLocData.PRECIP.notna().values
+    stationxy = stationInfo[['GEOGR1','GEOGR2']].values[nona]
+    z = mapLocData.PRECIP.values[nona]
+    x,y = np.meshgrid(grid['x'],grid['y'])
+    gridxy = np.column_stack([x[grid['mask']],y[grid['mask']]])
+    variogram = mFu._variogram(stationxy,z,'gaussian',fixed)
+    weights,variance = mFu._localKriging(gridxy,stationxy,OrdinaryKriging.variogram_dict['gaussian'],variogram,8)
+    np.testing.assert_allclose(grid['grids']['estimate'][grid['mask']],weights@z,rtol=1e-9)
+    np.testing.assert_allclose(grid['grids']['variance'][grid['mask']],variance,rtol=1e-9)
+    assert (np.diff(weights.indptr) == 8).all()
+    for point in range(0,len(gridxy),25):
+        used = weights.indices[weights.indptr[point]:weights.indptr[point+1]]
+        OK = OrdinaryKriging(stationxy[used,0],stationxy[used,1],z[used],variogram_model='gaussian',variogram_parameters=fixed)
+        estimate,sigma = OK.execute('points',gridxy[point,:1],gridxy[point,1:])
+        np.testing.assert_allclose(weights[point].toarray()[0]@z,estimate[0],rtol=1e-6)
+        np.testing.assert_allclose(variance[point],sigma[0],rtol=1e-6)
+    # with at least as many neighbours as stations, local kriging is global kriging
+    full = mFu.kriMap(mapLocData,region='Region3',variogramParameters=fixed,neighbours=40,gridsize=30,returnGrid=True)[2]
+    globalGrid = mFu.kriMap(mapLocData,region='Region3',variogramParameters=fixed,gridsize=30,returnGrid=True)[2]
+    np.testing.assert_array_equal(full['grids']['estimate'],globalGrid['grids']['estimate'])
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+locDataSeries and its slices against locData for every period, also for temperature-only data.
+"""
+import pandas as pd
+import pytest
+
+from pycamtET import dataFunctions as dFu
+from pycamtET.climatology import Climatology
+
+@pytest.mark.parametrize('elements',[None,['TMPMIN','TMPMAX']])
+@pytest.mark.parametrize('timeperiod',['year','season','month','dekadal'])
+def test_slices(emiData,elements,timeperiod):
+    df = emiData if elements is None else emiData[emiData.EG_EL.isin(elements)].reset_index(drop=True)
+    clim = Climatology(df)
+    for element in ['TMPMIN','TMPMAX']:
+        series = dFu.locDataSeries(df,element,timeperiod)
+        pd.testing.assert_frame_equal(series,dFu.locDataSeries(df,element,timeperiod,climatology=clim))
+        for key,dfLoc in dFu.locDataSlices(series):
+            if key[0] != 2016:
+                continue
+            kw = dict(zip({'year':[],'season':['season'],'month':['month'],'dekadal':['month','dekadal']}[timeperiod],key[1:]))
+            expected = dFu.locData(df,element,2016,**kw)
+            pd.testing.assert_frame_equal(expected,dfLoc,check_names=False)
+            pd.testing.assert_frame_equal(expected,dFu.locData(df,element,2016,climatology=clim,**kw))
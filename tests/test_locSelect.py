@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+locSelect() against a plain pivot of the long-format data, and locSelectAll() against locSelect() per station.
+"""
+import numpy as np
+import pandas as pd
+
+from pycamtET import dataFunctions as dFu
+
+def _data(emiData):
+    # Gondar without TMPMAX, and a second value on some days of Assela
+    df = emiData[(emiData.STN_Name!='Gondar')|(emiData.EG_EL!='TMPMAX')]
+    double = df[(df.STN_Name=='Assela')&(df.YEAR==2016)].assign(value=lambda d: d.value+1)
+    return pd.concat([df,double]).sort_values(by=['STN_Name','EG_EL','dateTime'],kind='stable',ignore_index=True)
+
+def test_locSelect(emiData):
+    df = _data(emiData)
+    for stationName in ['Assela','bahir dar','Gondar']:
+        dfDay = dFu.locSelect(df,stationName)
+        rows = df[df.STN_Name==stationName.title()]
+        pivot = rows.groupby(['date','EG_EL']).value.mean().unstack()
+        pivot = pivot.reindex(pd.date_range(rows.date.min(),rows.date.max(),freq='D'))
+        assert dfDay.stationName == stationName.title()
+        assert (dfDay.index == pivot.index).all()
+        for element in pivot.columns:
+            np.testing.assert_allclose(dfDay[element].values,pivot[element].values)
+        np.testing.assert_array_equal(dfDay.RD.values,np.where(pivot.PRECIP>1,1,np.where(pivot.PRECIP>-1,0,np.nan)))
+        assert 'TMPMAX' not in dfDay.columns if stationName=='Gondar' else 'TMPMAX' in dfDay.columns
+        assert (dfDay.dk.astype(int).values == np.minimum((dfDay.index.day-1)//10+1,3)).all()
+    assert dFu.locSelect(df,'Addis Ababa') is None
+
+def test_locSelectAll(emiData):
+    df = _data(emiData)
+    dfDict = dFu.locSelectAll(df)
+    dfPanel = dFu.locSelectAll(df,panel=True)
+    assert list(dfDict) == ['Assela','Bahir Dar','Gondar']
+    for stationName,dfAll in dfDict.items():
+        dfDay = dFu.locSelect(df,stationName)
+        pd.testing.assert_frame_equal(dfAll,dfDay)
+        assert dfAll.stationName == dfDay.stationName
+        pd.testing.assert_frame_equal(dfPanel.loc[stationName][dfDay.columns],dfDay,check_freq=False,check_names=False)
+    assert dfPanel.loc['Gondar'].TMPMAX.isna().all()
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+Memoization of dataFunctions results: repeated calls return the stored result, and any change of the data is a miss.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from pycamtET import dataFunctions as dFu
+from pycamtET import support
+
+@pytest.fixture
+def memo():
+    support.memoSettings(enabled=True)
+    yield
+    support.memoSettings(enabled=False)
+
+def test_hits(emiData,memo):
+    first = dFu.timeData(dFu.locSelect(emiData,'Gondar'),'PRECIP','month')
+    second = dFu.timeData(dFu.locSelect(emiData,'Gondar'),'PRECIP','month')
+    assert support.memoStats()['hits'] == 2
+    pd.testing.assert_frame_equal(first,second)
+    assert second.stationName == first.stationName == 'Gondar'
+
+@pytest.mark.parametrize('column,value',[('STN_Name','Assela'),('YEAR',2014),('value',1000.)])
+def test_changes(emiData,memo,column,value):
+    # a change in any row is a miss, also in a row between 1000 evenly spaced sample rows
+    original = emiData.copy()
+    dFu.locSelect(original,'Gondar')
+    df = original.copy()
+    sample = np.linspace(0,len(df)-1,1000).astype('int64')
+    rows = df.index[(df.STN_Name=='Gondar')&(df.EG_EL=='PRECIP')]
+    df.loc[rows[~rows.isin(sample)][0],column] = value
+    assert support.frameFingerprint(df) != support.frameFingerprint(original)
+    changed = dFu.locSelect(df,'Gondar')
+    assert support.memoStats()['misses'] == 2
+    support.memoSettings(enabled=False)
+    pd.testing.assert_frame_equal(changed,dFu.locSelect(df,'Gondar'))
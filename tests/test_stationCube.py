@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+StationCube against the long-format DataFrame it is created from.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from pycamtET import stationCube
+from pycamtET.stationCube import StationCube
+
+def _expected(df,cube,timeperiod):
+    # sum and count per station, element and period with a groupby on the rows of the DataFrame
+    start = cube.periods(timeperiod).start.values
+    df = df.dropna(subset=['value'])
+    periodNr = np.searchsorted(start,(df.date-cube.dates[0]).dt.days.values,side='right')-1
+    grouped = df.value.groupby([df.STN_Name.values,df.EG_EL.values,periodNr]).agg(['sum','count'])
+    index = pd.MultiIndex.from_product([cube.stations,cube.elements[:-1],range(len(start))])
+    return grouped.reindex(index).fillna(0)
+
+@pytest.mark.parametrize('timeperiod',['year','season','month','dekadal'])
+def test_reduce(emiData,timeperiod):
+    cube = StationCube.fromFrame(emiData)
+    assert cube.elements[-1] == 'RD'
+    expected = _expected(emiData,cube,timeperiod)
+    for how in ['sum','mean']:
+        values,counts,periods = cube.reduce(timeperiod,how=how)
+        result = expected['sum'] if how=='sum' else expected['sum']/expected['count']
+        np.testing.assert_allclose(values[:,:-1].ravel(),result.values,rtol=1e-5,equal_nan=True)
+        np.testing.assert_array_equal(counts[:,:-1].ravel(),expected['count'].values)
+
+@pytest.mark.parametrize('timeperiod',['day','dekadal','season','year'])
+def test_chunks(emiData,tmp_path,monkeypatch,timeperiod):
+    # a memory-mapped cube, read in chunks of a few periods, gives the same result as the cube in memory
+    cube = StationCube.fromFrame(emiData)
+    reference = cube.reduce(timeperiod)
+    cube.save(tmp_path/'cube')
+    mapped = StationCube.load(tmp_path/'cube')
+    assert isinstance(mapped.data,np.memmap)
+    monkeypatch.setattr(stationCube,'_chunkValues',cube.data.shape[0]*cube.data.shape[1]*40)
+    for result in [mapped.reduce(timeperiod),cube.reduce(timeperiod)]:
+        np.testing.assert_array_equal(result[0],reference[0])
+        np.testing.assert_array_equal(result[1],reference[1])
+        pd.testing.assert_frame_equal(result[2],reference[2])
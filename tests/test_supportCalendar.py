@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Calendar lookup tables against pandas datetime arithmetic.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from pycamtET import supportCalendar as cal
+
+@pytest.fixture(scope='module')
+def days():
+    # includes days before and after the tables (1800-2200) and the leap years 1900 and 2000
+    dates = pd.date_range('1795-01-01','2205-12-31',freq='D')
+    season = np.select([dates.month.isin([2,3,4,5]),dates.month.isin([6,7,8,9])],[1,2],0)
+    return pd.DataFrame({'YEAR':dates.year,'MONTH':dates.month,'day':dates.day,'dk':np.minimum((dates.day-1)//10+1,3),
+                         'seasonCode':season,'seasonyear':dates.year-(dates.month==1)},index=dates)
+
+def test_dayCalendar(days):
+    result = cal.dayCalendar(cal.dayNumbers(days.index))
+    for col in days.columns:
+        np.testing.assert_array_equal(result[col],days[col].values)
+    np.testing.assert_array_equal(result['dkYear'],(days.MONTH.values-1)*3+days.dk.values)
+    assert cal.dayCalendar(np.array([],dtype='int64'))['YEAR'].size == 0
+
+@pytest.mark.parametrize('timeperiod,groupList',[('dekadal',['YEAR','MONTH','dk']),('month',['YEAR','MONTH']),
+                                                 ('season',['seasonyear','seasonCode']),('year',['YEAR'])])
+def test_periodDays(days,timeperiod,groupList):
+    counts = days.groupby(groupList).size()
+    if timeperiod == 'season':
+        # Bega of the first and last seasonyear is not complete
+        counts = counts.loc[1795:2204]
+    keys = counts.index.to_frame(index=False)
+    if timeperiod == 'dekadal':
+        result = cal.periodDays(timeperiod,keys.YEAR,month=keys.MONTH,dk=keys.dk)
+    elif timeperiod == 'month':
+        result = cal.periodDays(timeperiod,keys.YEAR,month=keys.MONTH)
+    elif timeperiod == 'season':
+        result = cal.periodDays(timeperiod,keys.seasonyear,season=keys.seasonCode)
+        names = cal.periodDays(timeperiod,keys.seasonyear,season=np.array(cal._seasons)[keys.seasonCode])
+        np.testing.assert_array_equal(names,result)
+    else:
+        result = cal.periodDays(timeperiod,keys.YEAR)
+    np.testing.assert_array_equal(result,counts.values)
+    np.testing.assert_array_equal(cal.isLeap([1900,2000,2015,2016]),[0,1,0,1])
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Grids of supportMap.gridcalculate() against shapely point by point, and the cached admin layers of supportMap.admLayer().
+"""
+import os
+from importlib.util import find_spec
+
+import numpy as np
+import pandas as pd
+import pytest
+
+gpd = pytest.importorskip('geopandas')
+import shapely
+from pyproj import Transformer
+
+from pycamtET import supportMap
+
+@pytest.mark.parametrize('region,gridsize',[(None,40),('Region3',30),('Region3',57)])
+def test_gridcalculate(mapSettings,region,gridsize):
+    shape = supportMap.admLayer(0) if region is None else supportMap.admLayer(1).query('admin1Name==@region')
+    areaname = 'Ethiopia' if region is None else region
+    grid = supportMap.gridcalculate(shape,areaname,gridsize)
+    union = shapely.unary_union(shape.geometry.values)
+    xpoints = np.linspace(union.bounds[0],union.bounds[2],gridsize)
+    ypoints = np.linspace(union.bounds[1],union.bounds[3],gridsize)
+    x,y = np.meshgrid(xpoints,ypoints)
+    np.testing.assert_array_equal(grid.x_d.values,x.reshape(-1))
+    np.testing.assert_array_equal(grid.y_d.values,y.reshape(-1))
+    within = shapely.within(shapely.points(x.reshape(-1),y.reshape(-1)),union)
+    np.testing.assert_array_equal(grid.bool1d.values,within)
+    assert 0 < within.sum() < gridsize**2
+    x_m,y_m = Transformer.from_crs('EPSG:4326',supportMap._metercrs,always_xy=True).transform(x.reshape(-1),y.reshape(-1))
+    np.testing.assert_allclose(grid.x_m.values,x_m)
+    np.testing.assert_allclose(grid.y_m.values,y_m)
+    # saved per gridsize, and read back the same
+    assert os.path.isfile(supportMap._gridPath(areaname,gridsize))
+    pd.testing.assert_frame_equal(supportMap.gridcalculate(shape,areaname,gridsize),grid)
+
+def test_admLayer(mapSettings):
+    # the first read of a level is from the shape file and saved as GeoParquet; later reads come from memory or parquet
+    assert supportMap._admLayers == {}
+    layer = supportMap.admLayer(3)
+    assert list(supportMap._admLayers) == [(3,None)]
+    source = gpd.read_file(mapSettings['adm3Path'])
+    pd.testing.assert_frame_equal(pd.DataFrame(layer.drop(columns='geometry')),pd.DataFrame(source.drop(columns='geometry')))
+    assert shapely.equals(layer.geometry.values,source.geometry.values).all()
+    assert supportMap.admLayer(3) is layer
+    simplified = supportMap.admLayer(3,tolerance=0.1)
+    assert (shapely.get_num_coordinates(simplified.geometry.values) <= shapely.get_num_coordinates(layer.geometry.values)).all()
+    if find_spec('pyarrow') is not None:
+        files = sorted(os.listdir(mapSettings['pckgsdataPath']+'/admdata'))
+        assert (len(files) == 2) and files[0].startswith('adm3_'+str(os.stat(mapSettings['adm3Path']).st_size)) and files[1].startswith('adm3_s0.1_')
+        supportMap._admLayers.clear()
+        cached = supportMap.admLayer(3)
+        assert cached is not layer
+        assert shapely.equals(cached.geometry.values,layer.geometry.values).all()
+    supportMap.rmAdmData()
+    assert supportMap._admLayers == {}
+    assert os.path.isdir(mapSettings['pckgsdataPath']+'/admdata') == False
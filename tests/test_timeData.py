@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+timeDataAll() and timeDataPanel() against timeData() per station, element and timeperiod.
+"""
+import calendar
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pycamtET import dataFunctions as dFu
+from pycamtET.stationCube import StationCube
+
+timeperiods = ['day','dekadal','month','season','year']
+elements = ['PRECIP','TMPMIN','TMPMAX','RD']
+
+def _data(emiData):
+    # Gondar without TMPMAX, Bahir Dar only from March 2015
+    keep = ((emiData.STN_Name!='Gondar')|(emiData.EG_EL!='TMPMAX'))&((emiData.STN_Name!='Bahir Dar')|(emiData.date>='2015-03-01'))
+    return emiData[keep].reset_index(drop=True)
+
+def test_timeData(emiData):
+    dfDay = dFu.locSelect(emiData,'Assela')
+    month = dFu.timeData(dfDay,'PRECIP','month')
+    sums = dfDay.groupby(['YEAR','MONTH']).PRECIP.sum()
+    np.testing.assert_allclose(month.PRECIP.values,sums.values)
+    assert (month.periodDays.values == [calendar.monthrange(y,m)[1] for y,m in zip(month.YEAR,month.MONTH)]).all()
+    np.testing.assert_allclose(month.nonaFrac.values,dfDay.groupby(['YEAR','MONTH']).PRECIP.count().values/month.periodDays.values)
+    np.testing.assert_allclose(month.PRECIPavg.values,month.groupby('MONTH').PRECIP.transform('mean').values)
+
+@pytest.mark.parametrize('compact',[False,True])
+def test_timeDataAll(emiData,compact):
+    df = _data(emiData)
+    if compact:
+        df = dFu._compact(df)
+    for stationName in ['Assela','Bahir Dar','Gondar']:
+        dfDay = dFu.locSelect(df,stationName)
+        dfAll = dFu.timeDataAll(dfDay)
+        assert sorted(dfAll) == sorted(el for el in elements if el in dfDay.columns)
+        for element,tables in dfAll.items():
+            for timeperiod in timeperiods:
+                expected = dFu.timeData(dfDay,element,timeperiod)
+                pd.testing.assert_frame_equal(tables[timeperiod],expected,check_exact=False)
+                assert tables[timeperiod].stationName == stationName
+                assert tables[timeperiod].timeperiod == expected.timeperiod
+
+@pytest.mark.parametrize('timeperiod',timeperiods)
+def test_timeDataPanel(emiData,timeperiod):
+    df = _data(emiData)
+    cube = StationCube.fromFrame(df)
+    for element in elements:
+        panels = [dFu.timeDataPanel(df,element,timeperiod),dFu.timeDataPanel(cube,element,timeperiod)]
+        stations = ['Assela','Bahir Dar'] if element=='TMPMAX' else ['Assela','Bahir Dar','Gondar']
+        for panel in panels:
+            assert list(panel.index.get_level_values('STN_Name').unique()) == stations
+        for stationName in stations:
+            expected = dFu.timeData(dFu.locSelect(df,stationName),element,timeperiod)
+            expected = expected.set_index(list(panel.index.names[1:]))
+            for panel in panels:
+                pd.testing.assert_frame_equal(panel.loc[stationName],expected,check_exact=False,rtol=1e-5,atol=1e-4)
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+zonalStats() against a groupby of the grid values on the admin unit of every grid point.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('geopandas')
+import shapely
+
+from pycamtET import mapFunctions as mFu
+from pycamtET.supportMap import admLayer
+
+def _expected(grid,level,threshold):
+    # per grid point the first unit of level that contains it, then a plain groupby per period
+    x,y = np.meshgrid(grid['x'],grid['y'])
+    points = shapely.points(x[grid['mask']],y[grid['mask']])
+    layer = admLayer(level)
+    contains = shapely.intersects(np.asarray(layer.geometry.values)[:,None],points[None,:])
+    column = 'admin%dName' % level
+    units = np.where(contains.any(axis=0),layer[column].values[contains.argmax(axis=0)],None)
+    tables = []
+    for nr,values in enumerate(grid['grids']['estimate']):
+        df = pd.DataFrame({column:units,'value':values[grid['mask']]}).dropna(subset=[column])
+        grouped = df.groupby(column).value
+        table = pd.DataFrame({'mean':grouped.mean(),'min':grouped.min(),'max':grouped.max(),'nGrid':grouped.count(),
+                              'fracBelow':df.value.lt(threshold).groupby(df[column]).sum()/grouped.count()})
+        tables.append(table.assign(nr=nr).set_index('nr',append=True))
+    return pd.concat(tables)
+
+@pytest.mark.parametrize('level',[2,3])
+def test_zonalStats(mapSeries,level):
+    grid = mFu.idwMany(mapSeries,region='Region3',gridsize=30,returnGrid=True)
+    stats = mFu.zonalStats(grid['grids']['estimate'],level=level,region='Region3',gridsize=30,threshold=50,periods=grid['periods'])
+    expected = _expected(grid,level,50)
+    column = 'admin%dName' % level
+    assert list(stats.index.names) == ['YEAR','MONTH','dk',column]
+    for nr,period in enumerate(grid['periods'].itertuples(index=False)):
+        result = stats.loc[tuple(period)]
+        pd.testing.assert_frame_equal(result,expected.xs(nr,level='nr'),check_dtype=False,check_names=False)
+    # one grid
+    single = mFu.zonalStats(grid['grids']['estimate'][5],level=level,region='Region3',gridsize=30)
+    pd.testing.assert_frame_equal(single,expected.xs(5,level='nr').drop(columns='fracBelow'),check_dtype=False,check_names=False)
+    assert single.index.name == column